@@ -0,0 +1,153 @@
+import json
+from collections import deque, namedtuple
+
+import numpy as np
+
+
+# A rule fires once its metric has been above threshold (below it, with
+# below=True) for duration seconds, and resolves once the metric is back
+# past threshold by hysteresis, so a value hovering at the threshold does
+# not flap.
+AlertRule = namedtuple('AlertRule', ['name', 'metric', 'threshold', 'duration', 'hysteresis', 'below'],
+                       defaults=(0.0, 0.0, False))
+
+AlertEvent = namedtuple('AlertEvent', ['timestamp', 'rule', 'state', 'value'])
+
+FIRING = 'firing'
+RESOLVED = 'resolved'
+
+ALERT_RULES_FILE = 'system_monitor_alerts.json'
+
+DEFAULT_RESOURCES = (
+    ('CPU', 'cpu'),
+    ('RAM', 'ram'),
+    ('Disk', 'disk'),
+    ('Disk I/O', 'disk_busy'),
+)
+
+# Share of time some task was stalled; busy-but-healthy and saturated
+# look the same on the utilization gauges above.
+DEFAULT_PRESSURE_RESOURCES = (
+    ('CPU pressure', 'psi_cpu_some'),
+    ('Memory pressure', 'psi_memory_some'),
+    ('I/O pressure', 'psi_io_some'),
+)
+
+
+def default_rules(threshold, duration=0.0, hysteresis=0.0, pressure_threshold=None):
+    """One rule per percentage gauge, all sharing the warning threshold.
+
+    With a pressure_threshold, one rule per stall rate is added as well.
+    """
+    rules = [AlertRule(name, metric, threshold, duration, hysteresis) for name, metric in DEFAULT_RESOURCES]
+    if pressure_threshold is not None:
+        rules += [AlertRule(name, metric, pressure_threshold, duration, hysteresis)
+                  for name, metric in DEFAULT_PRESSURE_RESOURCES]
+    return rules
+
+
+def load_rules(path):
+    """Rules from a JSON list of objects with the AlertRule fields."""
+    with open(path, encoding='utf-8') as file:
+        items = json.load(file)
+    if not isinstance(items, list):
+        raise ValueError(f'{path}: expected a list of rules')
+    rules = []
+    for item in items:
+        try:
+            rules.append(AlertRule(**item))
+        except TypeError as exc:
+            raise ValueError(f'{path}: invalid rule {item!r}: {exc}') from None
+    return rules
+
+
+class AlertEngine:
+    """Evaluates every rule against each new sample.
+
+    Rule parameters and state live in NumPy arrays indexed by rule, so a
+    sample costs a fixed handful of vectorized comparisons whatever the
+    number of rules, and nothing is re-read from the sample history.
+    Every transition goes to the alert log; notify_interval rate-limits
+    how often one rule may notify again after it last did.
+    """
+
+    def __init__(self, rules, columns, notify_interval=60.0, log_size=1000):
+        self.columns = tuple(columns)
+        self.notify_interval = notify_interval
+        self.log = deque(maxlen=log_size)
+        self.transitions = 0
+        self.notifications = 0
+        self.suppressed = 0
+        self.rules = []
+        self.set_rules(rules)
+
+    def set_rules(self, rules):
+        """Replace the rule set; rules that are unchanged keep their state."""
+        previous = {rule: index for index, rule in enumerate(self.rules)}
+        for rule in rules:
+            if rule.metric not in self.columns:
+                raise ValueError(f'alert rule {rule.name!r}: unknown metric {rule.metric!r}')
+        count = len(rules)
+        sign = np.array([-1.0 if rule.below else 1.0 for rule in rules])
+        self.metric_index = np.array([self.columns.index(rule.metric) for rule in rules], dtype=np.intp)
+        self.sign = sign
+        # Compared as sign * value, so below-rules use the same tests.
+        self.fire_level = sign * np.array([rule.threshold for rule in rules], dtype=np.float64)
+        self.clear_level = self.fire_level - np.array([rule.hysteresis for rule in rules], dtype=np.float64)
+        self.duration_ms = np.array([rule.duration * 1000 for rule in rules], dtype=np.float64)
+        firing = np.zeros(count, dtype=bool)
+        since = np.full(count, -1, dtype=np.int64)
+        fired_at = np.zeros(count, dtype=np.int64)
+        notified = np.full(count, -np.inf)
+        values = np.full(count, np.nan)
+        for index, rule in enumerate(rules):
+            old = previous.get(rule)
+            if old is not None:
+                firing[index] = self.firing[old]
+                since[index] = self.since[old]
+                fired_at[index] = self.fired_at[old]
+                notified[index] = self.notified[old]
+                values[index] = self.values[old]
+        self.rules = list(rules)
+        self.firing = firing
+        self.since = since
+        self.fired_at = fired_at
+        self.notified = notified
+        self.values = values
+
+    def evaluate(self, timestamp, metrics):
+        """Feed one sample (epoch ms, {column: value}); returns the events that may notify."""
+        sample = np.array([metrics.get(column, np.nan) for column in self.columns], dtype=np.float64)
+        values = sample[self.metric_index]
+        self.values = values
+        level = self.sign * values
+        # NaN compares false both ways: a missing reading neither starts,
+        # fires nor resolves an alert.
+        breach = level > self.fire_level
+        self.since = np.where(breach, np.where(self.since < 0, timestamp, self.since), -1)
+        fire = breach & ~self.firing & (timestamp - self.since >= self.duration_ms)
+        resolve = self.firing & (level <= self.clear_level)
+        if not (fire.any() or resolve.any()):
+            return []
+        self.firing = (self.firing | fire) & ~resolve
+        self.fired_at[fire] = timestamp
+        events = []
+        for index in np.flatnonzero(fire | resolve).tolist():
+            event = AlertEvent(timestamp, self.rules[index], FIRING if fire[index] else RESOLVED,
+                               float(values[index]))
+            self.log.append(event)
+            self.transitions += 1
+            if event.state != FIRING:
+                continue
+            if timestamp - self.notified[index] < self.notify_interval * 1000:
+                self.suppressed += 1
+                continue
+            self.notified[index] = timestamp
+            self.notifications += 1
+            events.append(event)
+        return events
+
+    def active(self):
+        """(rule, current value, fired-at ms) of every firing rule."""
+        return [(self.rules[index], float(self.values[index]), int(self.fired_at[index]))
+                for index in np.flatnonzero(self.firing).tolist()]
@@ -0,0 +1,222 @@
+import os
+import time
+from collections import namedtuple
+
+import psutil
+
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+# cpu_percent is relative to the cgroup's CPU limit (cpu_limit cores) and
+# memory_percent to memory_limit, so 100% means the cgroup is throttled or
+# about to be OOM-killed whatever the size of the host. Limits fall back to
+# the host's CPUs and RAM where the cgroup has none. IO rates are MB/s and
+# operations/s. Any value the kernel does not expose is None.
+CgroupUsage = namedtuple('CgroupUsage', ['name', 'cpu_percent', 'cpu_limit', 'memory_used', 'memory_limit',
+                                         'memory_percent', 'io_read', 'io_write', 'io_ops'])
+
+
+def cgroup2_mount():
+    """Mount point of the cgroup v2 hierarchy, or None on v1-only hosts."""
+    mounts = []
+    try:
+        with open('/proc/self/mounts', encoding='utf-8') as file:
+            for line in file:
+                fields = line.split()
+                if len(fields) > 2 and fields[2] == 'cgroup2':
+                    mounts.append(fields[1])
+    except OSError:
+        return None
+    if CGROUP_ROOT in mounts:
+        return CGROUP_ROOT
+    return mounts[0] if mounts else None
+
+
+def own_cgroup():
+    """Path of this process's cgroup, relative to the v2 mount."""
+    try:
+        with open('/proc/self/cgroup', encoding='utf-8') as file:
+            for line in file:
+                if line.startswith('0::'):
+                    return line[3:].strip()
+    except OSError:
+        pass
+    return '/'
+
+
+def parse_flat_keyed(text):
+    """'key value' lines, as in cpu.stat and memory.stat."""
+    values = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(' ')
+        if value.isdigit():
+            values[key] = int(value)
+    return values
+
+
+def parse_io_stat(text):
+    """Bytes read and written and operations, summed over every device in io.stat."""
+    totals = {'rbytes': 0, 'wbytes': 0, 'rios': 0, 'wios': 0}
+    for line in text.splitlines():
+        for field in line.split()[1:]:
+            key, _, value = field.partition('=')
+            if key in totals and value.isdigit():
+                totals[key] += int(value)
+    return totals
+
+
+class CgroupFile:
+    """One kernel interface file, opened once and re-read with pread.
+
+    Cgroup and /proc/pressure files are regenerated on every read from
+    offset 0, so the same descriptor serves every poll without a seek or
+    another open.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            self.fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        except OSError:
+            # Missing controller, or a file the root cgroup does not have.
+            self.fd = None
+
+    def read(self):
+        if self.fd is None:
+            return None
+        try:
+            return os.pread(self.fd, 65536, 0).decode('ascii', 'replace')
+        except OSError:
+            # The cgroup was removed while open.
+            return None
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class CgroupReader:
+    """Usage of one cgroup against its own limits, from successive readings.
+
+    CPU and IO are cumulative counters turned into rates between polls;
+    the first poll only records the baseline. Limits are re-read each
+    poll, since they can be changed on a running container.
+    """
+
+    def __init__(self, path, name, host_cpus, host_memory):
+        self.path = path
+        self.name = name
+        self.host_cpus = host_cpus
+        self.host_memory = host_memory
+        self.files = {filename: CgroupFile(os.path.join(path, filename))
+                      for filename in ('cpu.stat', 'cpu.max', 'memory.current', 'memory.max', 'io.stat')}
+        self.last_counters = None
+        self.last_poll = None
+
+    def cpu_limit(self):
+        text = self.files['cpu.max'].read()
+        if text:
+            quota, _, period = text.partition(' ')
+            if quota != 'max' and quota.isdigit() and period.strip().isdigit():
+                return int(quota) / int(period)
+        return self.host_cpus
+
+    def memory_limit(self):
+        text = self.files['memory.max'].read()
+        if text and text.strip().isdigit():
+            return min(int(text), self.host_memory)
+        return self.host_memory
+
+    def poll(self):
+        now = time.monotonic()
+        elapsed = now - self.last_poll if self.last_poll is not None else None
+        self.last_poll = now
+
+        text = self.files['cpu.stat'].read()
+        cpu_usec = parse_flat_keyed(text).get('usage_usec') if text else None
+        text = self.files['io.stat'].read()
+        io = parse_io_stat(text) if text is not None else None
+        counters = (cpu_usec, io)
+        previous, self.last_counters = self.last_counters, counters
+
+        cpu_limit = self.cpu_limit()
+        cpu_percent = io_read = io_write = io_ops = None
+        if previous is not None and elapsed:
+            old_usec, old_io = previous
+            # Counters only go back when the cgroup was re-created.
+            if cpu_usec is not None and old_usec is not None and cpu_usec >= old_usec:
+                cpu_percent = (cpu_usec - old_usec) / (elapsed * 1e6) / cpu_limit * 100
+            if io is not None and old_io is not None and all(io[key] >= old_io[key] for key in io):
+                io_read = (io['rbytes'] - old_io['rbytes']) / (1024**2) / elapsed
+                io_write = (io['wbytes'] - old_io['wbytes']) / (1024**2) / elapsed
+                io_ops = (io['rios'] + io['wios'] - old_io['rios'] - old_io['wios']) / elapsed
+
+        text = self.files['memory.current'].read()
+        memory_used = int(text) if text and text.strip().isdigit() else None
+        memory_limit = self.memory_limit()
+        memory_percent = memory_used / memory_limit * 100 if memory_used is not None else None
+        return CgroupUsage(self.name, cpu_percent, cpu_limit, memory_used, memory_limit, memory_percent,
+                           io_read, io_write, io_ops)
+
+    def close(self):
+        for file in self.files.values():
+            file.close()
+
+
+class CgroupMonitor:
+    """This process's cgroup plus a breakdown of the top-level cgroups.
+
+    Only the unified (v2) hierarchy is read; on hosts without one the
+    monitor is unavailable and poll() reports nothing. The list of child
+    cgroups is re-enumerated every refresh_interval seconds; readers of
+    cgroups that went away are closed, so their descriptors are released.
+    """
+
+    def __init__(self, root=None, refresh_interval=30.0):
+        self.root = root or cgroup2_mount()
+        self.refresh_interval = refresh_interval
+        self.available = self.root is not None and os.path.exists(os.path.join(self.root, 'cgroup.controllers'))
+        self.host_cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') \
+            else psutil.cpu_count() or 1
+        self.host_memory = psutil.virtual_memory().total
+        self.own = None
+        self.readers = {}
+        self.refreshed_at = None
+        if self.available:
+            relative = own_cgroup()
+            path = os.path.normpath(os.path.join(self.root, relative.lstrip('/')))
+            # Inside a cgroup namespace the mount is already our own cgroup.
+            if not os.path.isdir(path):
+                path, relative = self.root, '/'
+            self.own = CgroupReader(path, relative, self.host_cpus, self.host_memory)
+
+    def refresh_children(self):
+        try:
+            names = sorted(entry.name for entry in os.scandir(self.root) if entry.is_dir(follow_symlinks=False))
+        except OSError:
+            names = []
+        readers = {}
+        for name in names:
+            reader = self.readers.pop(name, None)
+            readers[name] = reader or CgroupReader(os.path.join(self.root, name), '/' + name,
+                                                   self.host_cpus, self.host_memory)
+        for reader in self.readers.values():
+            reader.close()
+        self.readers = readers
+        self.refreshed_at = time.monotonic()
+
+    def poll(self):
+        """(usage of this process's cgroup, usage of each top-level cgroup)."""
+        if not self.available:
+            return None, ()
+        if self.refreshed_at is None or time.monotonic() - self.refreshed_at > self.refresh_interval:
+            self.refresh_children()
+        return self.own.poll(), tuple(reader.poll() for reader in self.readers.values())
+
+    def close(self):
+        if self.own is not None:
+            self.own.close()
+        for reader in self.readers.values():
+            reader.close()
+        self.readers = {}
@@ -0,0 +1,121 @@
+"""Headless collector: samples the system and appends to the history file.
+
+Runs on display-less servers; neither PyQt6 nor matplotlib is imported.
+A GUI started with --attach reads the same file as a read-only viewer.
+"""
+import argparse
+import signal
+import sys
+import threading
+import time
+
+from fleet import FleetServer
+from history_store import HISTORY_FILE, HistoryStore, HistoryWriter
+from metrics_server import MetricsServer
+from rollups import Rollups
+from sampler import METRIC_COLUMNS, AdaptiveInterval, Sampler, SamplerThread, snapshot_metrics
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='System Monitor headless collector')
+    parser.add_argument('--headless', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--history', default=HISTORY_FILE,
+                        help=f'history file to append to (default: {HISTORY_FILE})')
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='seconds between samples, at least 0.1 (default: 1.0)')
+    parser.add_argument('--max-interval', type=float, default=None,
+                        help='sample adaptively: every --interval seconds while metrics move or are near '
+                             '--warning-threshold, backing off to this many seconds while steady')
+    parser.add_argument('--warning-threshold', type=float, default=80,
+                        help='percentage that adaptive sampling treats as high load (default: 80)')
+    parser.add_argument('--flush-count', type=int, default=60,
+                        help='samples buffered before a history write (default: 60)')
+    parser.add_argument('--flush-interval', type=float, default=10.0,
+                        help='longest time in seconds a sample stays buffered (default: 10.0)')
+    parser.add_argument('--fsync', action='store_true', help='fsync the history file after every write')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='stop after this many seconds instead of running until interrupted')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='serve Prometheus metrics on this port (default: disabled)')
+    parser.add_argument('--metrics-host', default='127.0.0.1',
+                        help='address for the metrics endpoint (default: 127.0.0.1)')
+    parser.add_argument('--fleet-port', type=int, default=None,
+                        help='stream samples to GUIs started with --fleet on this port (default: disabled)')
+    parser.add_argument('--fleet-host', default='127.0.0.1',
+                        help='address for the fleet stream (default: 127.0.0.1)')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    metrics_server = None
+    if args.metrics_port is not None:
+        try:
+            metrics_server = MetricsServer(args.metrics_host, args.metrics_port)
+        except OSError as error:
+            parser.error(f'cannot serve metrics on {args.metrics_host}:{args.metrics_port}: {error}')
+    fleet_server = None
+    if args.fleet_port is not None:
+        fleet_server = FleetServer()
+        try:
+            fleet_source = fleet_server.listen(args.fleet_host, args.fleet_port)
+        except OSError as error:
+            parser.error(f'cannot stream to the fleet on {args.fleet_host}:{args.fleet_port}: {error}')
+    store = HistoryStore(args.history, METRIC_COLUMNS)
+    rollups = Rollups(args.history, METRIC_COLUMNS)
+    writer = HistoryWriter(store, max(1, args.flush_count), max(0.1, args.flush_interval), args.fsync, rollups)
+    samples = 0
+
+    def record(snapshot):
+        nonlocal samples
+        samples += 1
+        if metrics_server is not None:
+            metrics_server.publish(snapshot)
+        timestamp = int(snapshot.timestamp * 1000)
+        metrics = snapshot_metrics(snapshot)
+        writer.append(timestamp, metrics)
+        if fleet_server is not None:
+            fleet_source.publish(timestamp, metrics)
+
+    sampler = Sampler()
+    interval = max(0.1, args.interval)
+    schedule = None
+    if args.max_interval is not None:
+        schedule = AdaptiveInterval(interval, args.max_interval, args.warning_threshold)
+    sampler_thread = SamplerThread(sampler, record, interval=interval, schedule=schedule)
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+
+    start_wall, start_cpu = time.monotonic(), time.process_time()
+    writer.start()
+    sampler_thread.start()
+    if metrics_server is not None:
+        metrics_server.start()
+    if fleet_server is not None:
+        fleet_server.start()
+    try:
+        stopped.wait(args.duration)
+    except KeyboardInterrupt:
+        pass
+    sampler_thread.stop()
+    if metrics_server is not None:
+        metrics_server.stop()
+    if fleet_server is not None:
+        fleet_server.stop()
+    sampler.disk_monitor.close()
+    sampler.cgroup_monitor.close()
+    sampler.pressure_monitor.close()
+    writer.stop()
+    store.close()
+    rollups.close()
+
+    elapsed = time.monotonic() - start_wall
+    cpu = (time.process_time() - start_cpu) / elapsed * 100 if elapsed else 0.0
+    print(f"collector: {samples} samples in {elapsed:.1f} s, {writer.bytes_written / 1024:.1f} KB "
+          f"in {writer.flushes} flushes, {cpu:.2f}% CPU", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
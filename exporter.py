@@ -0,0 +1,188 @@
+import importlib.util
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+
+CHUNK_RECORDS = 65536
+
+# File extension -> format. Parquet and Arrow need pyarrow.
+EXPORT_FORMATS = {
+    '.csv': 'csv',
+    '.json': 'json',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+}
+ARROW_FORMATS = ('parquet', 'arrow')
+
+
+def pyarrow_available():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def export_format(path):
+    return EXPORT_FORMATS.get(os.path.splitext(path)[1].lower(), 'csv')
+
+
+def format_times(timestamps):
+    """Local "%Y-%m-%d %H:%M:%S" strings for epoch-ms timestamps."""
+    seconds = timestamps // 1000
+    offset = time.localtime(int(seconds[0])).tm_gmtoff
+    if time.localtime(int(seconds[-1])).tm_gmtoff != offset:
+        # The chunk spans a DST change: format record by record.
+        return [datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S") for second in seconds.tolist()]
+    text = np.datetime_as_string((seconds + offset).astype('datetime64[s]'))
+    return np.char.replace(text, 'T', ' ').tolist()
+
+
+class CsvWriter:
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.columns = columns
+        self.row = '%s,%d' + ',%.2f' * len(columns) + '\n'
+        self.file.write(','.join(('time', 'timestamp_ms') + columns) + '\n')
+
+    def write(self, records):
+        if not len(records):
+            return
+        values = [records[column].tolist() for column in self.columns]
+        rows = zip(format_times(records['timestamp']), records['timestamp'].tolist(), *values)
+        # Records from before a column existed hold NaN, written as an empty field.
+        self.file.write(''.join(self.row % row for row in rows).replace(',nan', ','))
+
+    def close(self):
+        self.file.close()
+
+
+class JsonWriter:
+    """A list of records laid out as json.dump(records, indent=4) would, written one chunk at a time.
+
+    Each record has the time and every column of the exported store,
+    rounded to two decimals from the stored float32 values; NaN and
+    infinities, which JSON has no literal for, become null.
+    """
+
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.columns = columns
+        self.item = '    {\n        "time": "%s"' + ''.join(f',\n        "{column}": %r' for column in columns) + '\n    }'
+        self.count = 0
+        self.file.write('[')
+
+    def write(self, records):
+        if not len(records):
+            return
+        values = []
+        for column in self.columns:
+            column = records[column].astype(np.float64)
+            values.append(np.round(np.where(np.isfinite(column), column, np.nan), 2).tolist())
+        items = (self.item % row for row in zip(format_times(records['timestamp']), *values))
+        text = ',\n'.join(items).replace(': nan\n', ': null\n').replace(': nan,', ': null,')
+        self.file.write((',\n' if self.count else '\n') + text)
+        self.count += len(records)
+
+    def close(self):
+        self.file.write('\n]' if self.count else ']')
+        self.file.close()
+
+
+class ArrowWriter:
+    """Columnar Parquet or Arrow IPC output; every chunk becomes one row group / record batch."""
+
+    def __init__(self, path, columns, fmt):
+        import pyarrow as pa
+
+        self.pa = pa
+        self.columns = columns
+        self.schema = pa.schema([('time', pa.timestamp('ms', tz='UTC'))] + [(column, pa.float32()) for column in columns])
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self.sink = pa.OSFile(path, 'wb')
+            self.writer = pa.ipc.new_file(self.sink, self.schema)
+
+    def write(self, records):
+        pa = self.pa
+        arrays = [pa.array(np.ascontiguousarray(records['timestamp']), type=pa.timestamp('ms', tz='UTC'))]
+        arrays += [pa.array(np.ascontiguousarray(records[column]), type=pa.float32(), from_pandas=True)
+                   for column in self.columns]
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+        if hasattr(self, 'sink'):
+            self.sink.close()
+
+
+def open_writer(path, columns):
+    fmt = export_format(path)
+    if fmt == 'json':
+        return JsonWriter(path, columns)
+    if fmt in ARROW_FORMATS:
+        return ArrowWriter(path, columns, fmt)
+    return CsvWriter(path, columns)
+
+
+class HistoryExport(threading.Thread):
+    """Streams the records of a HistoryStore with start_ms <= timestamp <= end_ms to a file.
+
+    Each chunk is mapped, written and unmapped before the next one, so
+    memory use does not grow with the size of the export. Chunks are
+    located by timestamp rather than index, which keeps the export
+    correct while the writer appends to or compacts the file.
+    progress(done, total) is called after every chunk and finished(error)
+    once at the end, both on the export thread; error is None on success.
+    A cancelled export removes its partial file and reports 'cancelled'.
+    """
+
+    def __init__(self, store, start_ms, end_ms, path, progress=None, finished=None, chunk_records=CHUNK_RECORDS):
+        super().__init__(name='HistoryExport', daemon=True)
+        self.store = store
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.path = path
+        self.progress = progress
+        self.finished = finished
+        self.chunk_records = chunk_records
+        self.records_written = 0
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        error = None
+        try:
+            start, end = self.store.bounds(self.start_ms, self.end_ms)
+            total = end - start
+            next_ms = self.start_ms
+            writer = open_writer(self.path, self.store.columns)
+            try:
+                while not self._cancelled.is_set():
+                    start, end = self.store.bounds(next_ms, self.end_ms)
+                    if end <= start:
+                        break
+                    records = self.store.read(start, min(end, start + self.chunk_records))
+                    writer.write(records)
+                    self.records_written += len(records)
+                    next_ms = int(records['timestamp'][-1]) + 1
+                    del records
+                    if self.progress is not None:
+                        self.progress(min(self.records_written, total), total)
+            finally:
+                writer.close()
+        except (OSError, ValueError, ImportError) as exc:
+            error = str(exc)
+        if self._cancelled.is_set() and error is None:
+            error = 'cancelled'
+        if error is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        if self.finished is not None:
+            self.finished(error)
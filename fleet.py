@@ -0,0 +1,543 @@
+import argparse
+import errno
+import os
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+FLEET_PORT = 9102
+FLEET_COLUMNS = ('cpu', 'ram', 'disk')
+
+# Every frame is a kind byte and a payload length. HELLO carries the
+# reporting host's name and its column names, one per line. BATCH holds n
+# samples: the first timestamp (epoch ms), n uint32 ms offsets from it,
+# then n rows of int16 differences from the previous row sent on the
+# connection, in hundredths of a percent.
+HELLO = 1
+BATCH = 2
+HEADER = struct.Struct('!BI')
+BATCH_HEADER = struct.Struct('!qH')
+SCALE = 100
+MISSING = -1
+MAX_BATCH = 0xFFFF
+MAX_FRAME = 1 << 20
+
+# Samples a collector keeps per viewer, and a viewer per host, while the
+# other side is not keeping up. Beyond that the oldest are dropped.
+MAX_PENDING = 600
+
+RETRY_MIN = 1.0
+RETRY_MAX = 30.0
+
+
+def encode_hello(name, columns):
+    payload = '\n'.join((name,) + tuple(columns)).encode('utf-8')
+    return HEADER.pack(HELLO, len(payload)) + payload
+
+
+class BatchEncoder:
+    """Delta-encodes the samples sent on one connection."""
+
+    def __init__(self, width):
+        self.previous = np.zeros(width, dtype=np.int32)
+
+    def encode(self, timestamps, rows):
+        # Offsets are unsigned: a clock step back inside the batch is held
+        # at the latest time sent instead of wrapping around.
+        timestamps = np.maximum.accumulate(np.asarray(timestamps, dtype=np.int64))
+        rows = np.asarray(rows, dtype=np.float64)
+        with np.errstate(invalid='ignore'):
+            quantized = np.where(np.isnan(rows), MISSING, np.rint(np.clip(rows, 0, 100) * SCALE)).astype(np.int32)
+        deltas = np.diff(quantized, axis=0, prepend=self.previous[np.newaxis])
+        self.previous = quantized[-1]
+        payload = (BATCH_HEADER.pack(int(timestamps[0]), len(timestamps))
+                   + (timestamps - timestamps[0]).astype('>u4').tobytes()
+                   + deltas.astype('>i2').tobytes())
+        return HEADER.pack(BATCH, len(payload)) + payload
+
+
+class FrameDecoder:
+    """Splits a viewer's byte stream into frames and undoes the delta encoding."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.name = None
+        self.columns = None
+        self.previous = None
+
+    def feed(self, data):
+        """Returns the (timestamps, values) of every batch completed by data."""
+        self.buffer += data
+        batches = []
+        while len(self.buffer) >= HEADER.size:
+            kind, length = HEADER.unpack_from(self.buffer)
+            if length > MAX_FRAME:
+                raise ValueError(f'frame of {length} bytes')
+            end = HEADER.size + length
+            if len(self.buffer) < end:
+                break
+            payload = bytes(self.buffer[HEADER.size:end])
+            del self.buffer[:end]
+            if kind == HELLO:
+                self.name, *columns = payload.decode('utf-8').split('\n')
+                self.columns = tuple(columns)
+                self.previous = np.zeros(len(columns), dtype=np.int32)
+            elif kind == BATCH:
+                if self.columns is None:
+                    raise ValueError('batch before hello')
+                batches.append(self.decode_batch(payload))
+            # Unknown kinds are skipped, so newer collectors can add frames.
+        return batches
+
+    def decode_batch(self, payload):
+        first, count = BATCH_HEADER.unpack_from(payload)
+        width = len(self.columns)
+        if len(payload) != BATCH_HEADER.size + count * (4 + 2 * width):
+            raise ValueError('truncated batch')
+        offsets = np.frombuffer(payload, '>u4', count, BATCH_HEADER.size)
+        deltas = np.frombuffer(payload, '>i2', count * width, BATCH_HEADER.size + 4 * count).reshape(count, width)
+        quantized = self.previous + np.cumsum(deltas, axis=0, dtype=np.int32)
+        self.previous = quantized[-1]
+        values = np.where(quantized < 0, np.nan, quantized / SCALE).astype(np.float32)
+        return first + offsets.astype(np.int64), values
+
+
+def parse_addresses(items, default_port=FLEET_PORT):
+    """(host, port) pairs from "host", "host:port", "host:first-last" and "@file" items.
+
+    IPv6 addresses go in brackets, as in "[::1]:9102" or "[::1]".
+    """
+    addresses = []
+    for item in items:
+        if item.startswith('@'):
+            with open(item[1:], encoding='utf-8') as file:
+                lines = [line.split('#', 1)[0].strip() for line in file]
+            addresses += parse_addresses([line for line in lines if line], default_port)
+            continue
+        if item.startswith('['):
+            host, bracket, ports = item[1:].partition(']')
+            if not bracket or ports and not ports.startswith(':'):
+                raise ValueError(f'invalid fleet address: {item}')
+            ports = ports[1:] or str(default_port)
+        else:
+            host, _, ports = item.rpartition(':')
+            if ':' in host:
+                raise ValueError(f'IPv6 fleet address needs brackets: {item} (e.g. [{item}]:{default_port})')
+            if not host:
+                host, ports = ports, str(default_port)
+        first, _, last = ports.partition('-')
+        try:
+            first = int(first)
+            last = int(last) if last else first
+        except ValueError:
+            raise ValueError(f'invalid fleet address: {item}') from None
+        addresses += [(host, port) for port in range(first, last + 1)]
+    return addresses
+
+
+class Viewer:
+    def __init__(self, sock, source, max_pending):
+        self.sock = sock
+        self.source = source
+        self.encoder = BatchEncoder(len(source.server.columns))
+        self.pending = deque(maxlen=max_pending)
+        self.outgoing = bytearray(encode_hello(source.name, source.server.columns))
+        self.dropped = 0
+
+
+class FleetSource:
+    """One reporting host: a listening socket and the viewers connected to it."""
+
+    def __init__(self, server, name, listener):
+        self.server = server
+        self.name = name
+        self.listener = listener
+        self.viewers = []
+
+    def publish(self, timestamp, metrics):
+        row = [metrics.get(column, np.nan) for column in self.server.columns]
+        with self.server.lock:
+            for viewer in self.viewers:
+                if len(viewer.pending) == viewer.pending.maxlen:
+                    viewer.dropped += 1
+                viewer.pending.append((timestamp, row))
+        self.server.wake()
+
+
+class FleetServer:
+    """Streams samples to fleet viewers from one selector thread.
+
+    publish() only queues the sample for every viewer. A viewer's queue
+    is encoded into a single batch once its previous batch has been fully
+    written, so a slow viewer gets fewer, larger batches; a viewer that
+    stops reading makes its queue drop the oldest samples rather than
+    grow. Viewers send nothing; reads only detect that they went away.
+    """
+
+    def __init__(self, columns=FLEET_COLUMNS, max_pending=MAX_PENDING):
+        self.columns = tuple(columns)
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.selector = selectors.DefaultSelector()
+        self.sources = []
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+        self.selector.register(self._wake_recv, selectors.EVENT_READ)
+        self._stopped = False
+        self.thread = threading.Thread(target=self.run, name='FleetServer', daemon=True)
+
+    def listen(self, host='127.0.0.1', port=FLEET_PORT, name=None):
+        listener = socket.create_server((host, port))
+        listener.setblocking(False)
+        source = FleetSource(self, name or socket.gethostname(), listener)
+        self.sources.append(source)
+        self.selector.register(listener, selectors.EVENT_READ, source)
+        return source
+
+    def start(self):
+        self.thread.start()
+
+    def wake(self):
+        try:
+            self._wake_send.send(b'\0')
+        except (BlockingIOError, OSError):
+            # A wake-up is already pending.
+            pass
+
+    def run(self):
+        while not self._stopped:
+            for key, mask in self.selector.select(1.0):
+                data = key.data
+                if data is None:
+                    try:
+                        while self._wake_recv.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                elif isinstance(data, FleetSource):
+                    self.accept(data)
+                else:
+                    if mask & selectors.EVENT_READ:
+                        self.check_closed(data)
+                    if mask & selectors.EVENT_WRITE and data.sock.fileno() >= 0:
+                        self.send(data)
+            with self.lock:
+                ready = [viewer for source in self.sources for viewer in source.viewers
+                         if viewer.pending and not viewer.outgoing]
+                for viewer in ready:
+                    items = [viewer.pending.popleft() for _ in range(min(len(viewer.pending), MAX_BATCH))]
+                    timestamps, rows = zip(*items)
+                    viewer.outgoing += viewer.encoder.encode(timestamps, rows)
+            for viewer in ready:
+                self.send(viewer)
+
+    def accept(self, source):
+        try:
+            sock, _ = source.listener.accept()
+        except (BlockingIOError, OSError):
+            return
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        viewer = Viewer(sock, source, self.max_pending)
+        with self.lock:
+            source.viewers.append(viewer)
+        self.selector.register(sock, selectors.EVENT_READ, viewer)
+        self.send(viewer)
+
+    def check_closed(self, viewer):
+        try:
+            data = viewer.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self.close(viewer)
+
+    def send(self, viewer):
+        try:
+            sent = viewer.sock.send(viewer.outgoing)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self.close(viewer)
+            return
+        del viewer.outgoing[:sent]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if viewer.outgoing else 0)
+        self.selector.modify(viewer.sock, events, viewer)
+
+    def close(self, viewer):
+        with self.lock:
+            if viewer not in viewer.source.viewers:
+                return
+            viewer.source.viewers.remove(viewer)
+        self.selector.unregister(viewer.sock)
+        viewer.sock.close()
+
+    def stop(self):
+        self._stopped = True
+        self.wake()
+        if self.thread.is_alive():
+            self.thread.join(5.0)
+        for source in self.sources:
+            for viewer in list(source.viewers):
+                self.close(viewer)
+            source.listener.close()
+        self.selector.close()
+        self._wake_recv.close()
+        self._wake_send.close()
+
+
+class FleetHost:
+    """Connection state of one followed collector; read by the GUI, written by FleetClient."""
+
+    def __init__(self, address):
+        self.address = address
+        self.name = f'{address[0]}:{address[1]}'
+        self.columns = ()
+        self.sock = None
+        # (family, type, proto, sockaddr) from getaddrinfo, and the lookup
+        # in progress while there is none.
+        self.resolved = None
+        self.resolving = None
+        self.decoder = None
+        self.connected = False
+        self.error = None
+        self.retry_delay = RETRY_MIN
+        self.next_attempt = 0.0
+        self.pending = []
+        self.pending_samples = 0
+        self.paused = False
+        self.samples = 0
+        self.bytes_received = 0
+
+
+class FleetClient(threading.Thread):
+    """Follows many fleet collectors from one thread.
+
+    Every connection is non-blocking and multiplexed on one selector, and
+    lost or refused connections are retried with exponential backoff.
+    Decoded batches wait per host until drain() collects them. A host
+    with max_pending samples not yet drained is not read from, so TCP
+    pushes back on its collector, which then drops its oldest samples;
+    neither side buffers without bound when the GUI falls behind. Names
+    are resolved on a small worker pool, so a slow DNS server delays only
+    its own hosts; the selector thread only connects to numeric addresses.
+    """
+
+    def __init__(self, addresses, max_pending=MAX_PENDING):
+        super().__init__(name='FleetClient', daemon=True)
+        self.hosts = [FleetHost(address) for address in addresses]
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.selector = selectors.DefaultSelector()
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+        self.selector.register(self._wake_recv, selectors.EVENT_READ)
+        self.resolver = ThreadPoolExecutor(max_workers=4, thread_name_prefix='FleetResolve')
+        self._stopped = False
+
+    def drain(self):
+        """[(host, timestamps, {column: values})] of the samples received since the last call."""
+        updates = []
+        resume = False
+        with self.lock:
+            for host in self.hosts:
+                if not host.pending:
+                    continue
+                batches, host.pending, host.pending_samples = host.pending, [], 0
+                timestamps = np.concatenate([batch[0] for batch in batches])
+                values = np.concatenate([batch[1] for batch in batches])
+                updates.append((host, timestamps, dict(zip(host.columns, values.T))))
+                resume = resume or host.paused
+        if resume:
+            self.wake()
+        return updates
+
+    def wake(self):
+        try:
+            self._wake_send.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def run(self):
+        while not self._stopped:
+            now = time.monotonic()
+            timeout = 1.0
+            for host in self.hosts:
+                if host.sock is None:
+                    if now >= host.next_attempt:
+                        self.connect(host, now)
+                    else:
+                        timeout = min(timeout, host.next_attempt - now)
+            for key, mask in self.selector.select(timeout):
+                host = key.data
+                if host is None:
+                    self.resume_paused()
+                elif not host.connected:
+                    self.finish_connect(host)
+                else:
+                    self.receive(host)
+
+    def connect(self, host, now):
+        if host.resolved is None:
+            if host.resolving is None:
+                host.resolving = self.resolver.submit(socket.getaddrinfo, *host.address, type=socket.SOCK_STREAM)
+                host.resolving.add_done_callback(lambda future: self.wake())
+            if not host.resolving.done():
+                return
+            future, host.resolving = host.resolving, None
+            try:
+                family, kind, proto, _, address = future.result()[0]
+            except OSError as exc:
+                self.fail(host, exc.strerror or str(exc), now)
+                return
+            host.resolved = (family, kind, proto, address)
+        family, kind, proto, address = host.resolved
+        sock = socket.socket(family, kind, proto)
+        sock.setblocking(False)
+        error = sock.connect_ex(address)
+        if error not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            sock.close()
+            self.fail(host, os.strerror(error), now)
+            return
+        host.sock = sock
+        self.selector.register(sock, selectors.EVENT_WRITE, host)
+
+    def finish_connect(self, host):
+        error = host.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if error:
+            self.fail(host, os.strerror(error))
+            return
+        host.connected = True
+        host.error = None
+        host.retry_delay = RETRY_MIN
+        host.decoder = FrameDecoder()
+        self.selector.modify(host.sock, selectors.EVENT_READ, host)
+
+    def receive(self, host):
+        try:
+            data = host.sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError as exc:
+            self.fail(host, exc.strerror or str(exc))
+            return
+        if not data:
+            self.fail(host, 'connection closed')
+            return
+        host.bytes_received += len(data)
+        try:
+            batches = host.decoder.feed(data)
+        except ValueError as exc:
+            self.fail(host, str(exc))
+            return
+        with self.lock:
+            if host.decoder.name:
+                host.name = host.decoder.name
+            if host.decoder.columns is not None and host.decoder.columns != host.columns:
+                # Batches of a differently built collector do not line up.
+                host.columns = host.decoder.columns
+                host.pending, host.pending_samples = [], 0
+            for timestamps, values in batches:
+                host.pending.append((timestamps, values))
+                host.pending_samples += len(timestamps)
+                host.samples += len(timestamps)
+            while host.pending and host.pending_samples - len(host.pending[0][0]) >= self.max_pending:
+                # One read can overshoot; keep the newest batches.
+                host.pending_samples -= len(host.pending.pop(0)[0])
+            if host.pending_samples >= self.max_pending:
+                host.paused = True
+                self.selector.unregister(host.sock)
+
+    def resume_paused(self):
+        try:
+            while self._wake_recv.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        with self.lock:
+            for host in self.hosts:
+                if host.paused and host.pending_samples < self.max_pending:
+                    host.paused = False
+                    if host.sock is not None:
+                        self.selector.register(host.sock, selectors.EVENT_READ, host)
+
+    def fail(self, host, error, now=None):
+        if host.sock is not None:
+            if not host.paused:
+                self.selector.unregister(host.sock)
+            host.sock.close()
+        host.sock = None
+        # Looked up again before the next attempt, in case the host moved.
+        host.resolved = None
+        host.decoder = None
+        host.connected = False
+        host.paused = False
+        host.error = error
+        host.next_attempt = (time.monotonic() if now is None else now) + host.retry_delay
+        host.retry_delay = min(host.retry_delay * 2, RETRY_MAX)
+
+    def stop(self):
+        self._stopped = True
+        self.wake()
+        if self.is_alive():
+            self.join(5.0)
+        self.resolver.shutdown(wait=False, cancel_futures=True)
+        for host in self.hosts:
+            if host.sock is not None:
+                host.sock.close()
+        self.selector.close()
+        self._wake_recv.close()
+        self._wake_send.close()
+
+
+def simulate(argv=None):
+    """Stand-in for a fleet of collectors: --hosts synthetic hosts on consecutive ports of this machine."""
+    parser = argparse.ArgumentParser(description='Serve synthetic fleet collectors for testing the fleet view.')
+    parser.add_argument('--hosts', type=int, default=50, help='number of simulated hosts (default: 50)')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=9200, help='port of the first host (default: 9200)')
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds between samples (default: 1.0)')
+    parser.add_argument('--duration', type=float, default=None, help='stop after this many seconds')
+    args = parser.parse_args(argv)
+
+    server = FleetServer()
+    try:
+        sources = [server.listen(args.host, args.port + index, f'sim-{index:03d}') for index in range(args.hosts)]
+    except OSError as error:
+        parser.error(f'cannot listen on {args.host}: {error}')
+    server.start()
+    print(f"fleet: {args.hosts} simulated hosts on {args.host}:{args.port}-{args.port + args.hosts - 1}",
+          file=sys.stderr)
+    rng = np.random.default_rng()
+    values = rng.uniform(5, 60, (args.hosts, len(FLEET_COLUMNS)))
+    deadline = None if args.duration is None else time.monotonic() + args.duration
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            # A random walk per host and metric, with the occasional spike.
+            values = np.clip(values + rng.normal(0, 3, values.shape), 0, 100)
+            spikes = rng.random(values.shape) < 0.002
+            values[spikes] = 95
+            timestamp = int(time.time() * 1000)
+            for source, row in zip(sources, values.tolist()):
+                source.publish(timestamp, dict(zip(FLEET_COLUMNS, row)))
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(simulate())
@@ -0,0 +1,435 @@
+import time
+
+import numpy as np
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QPainter, QPen, QColor, QFont, QPolygonF, QImage
+
+
+LINE_COLOR = '#005A9E'
+
+
+def nice_ceiling(value):
+    """Smallest 1, 2 or 5 times a power of ten that is >= value."""
+    if not value > 0:
+        return 1.0
+    base = 10 ** np.floor(np.log10(value))
+    for step in (1, 2, 5, 10):
+        if step * base >= value:
+            return float(step * base)
+    return float(10 * base)
+
+
+def time_series(store, column, max_points, span):
+    """(x, values, width) of a store column: x in seconds from the left edge of a width-second time axis.
+
+    The axis covers the last span seconds, or exactly the samples drawn
+    with span=None.
+    """
+    values = store.view(column, max_points)
+    timestamps = store.timestamp_view(max_points)
+    if not len(values):
+        return np.empty(0), values, float(span or 1)
+    end = int(timestamps[-1])
+    if span is None:
+        start = int(timestamps[0])
+    else:
+        start = end - int(span * 1000)
+        first = int(np.searchsorted(timestamps, start))
+        timestamps, values = timestamps[first:], values[first:]
+    width = max(end - start, 1) / 1000
+    return (timestamps - start) / 1000, values, width
+
+
+class FrameCounter:
+    def __init__(self, window=1.0):
+        self.window = window
+        self.frames = 0
+        self.busy = 0.0
+        self.window_start = time.perf_counter()
+        self.fps = 0.0
+        self.ms_per_frame = 0.0
+
+    def add(self, seconds):
+        self.frames += 1
+        self.busy += seconds
+        now = time.perf_counter()
+        elapsed = now - self.window_start
+        if elapsed < self.window:
+            return False
+        self.fps = self.frames / elapsed
+        self.ms_per_frame = self.busy * 1000 / self.frames
+        self.frames = 0
+        self.busy = 0.0
+        self.window_start = now
+        return True
+
+
+class GraphWidget(QWidget):
+    """Common interface of the graph backends.
+
+    Graphs keep no data of their own: they are bound to a column of the
+    shared RingBuffer and draw at most its max_points most recent values.
+    Samples are placed by their timestamps on a time axis covering the
+    last span seconds, so a varying sampling rate does not distort it;
+    with span=None the axis covers exactly the samples drawn. With
+    y_max=None the vertical axis follows the data instead of 0-100.
+    """
+
+    def __init__(self, store, column, parent=None, max_points=600, y_max=100, span=60):
+        super().__init__(parent)
+        self.store = store
+        self.column = column
+        self.max_points = max_points
+        self.y_max = y_max
+        self.span = span
+        self.label = None
+        self.frame_counter = FrameCounter()
+        self.stats_label = QLabel()
+        self.stats_label.setStyleSheet("font-size: 10px; color: gray;")
+
+    def bind(self, store, column):
+        self.store = store
+        self.column = column
+
+    def values(self):
+        return self.store.view(self.column, self.max_points)
+
+    def series(self):
+        return time_series(self.store, self.column, self.max_points, self.span)
+
+    def scale(self, values):
+        if self.y_max is not None:
+            return self.y_max
+        finite = values[np.isfinite(values)]
+        return nice_ceiling(float(finite.max())) if len(finite) else 1.0
+
+    def draw_graph(self, label):
+        """Redraw from the bound column; backends override it, the default leaves the widget as it is."""
+
+    def count_frame(self, seconds):
+        if self.frame_counter.add(seconds):
+            self.stats_label.setText(
+                f"{self.frame_counter.ms_per_frame:.2f} ms/frame, {self.frame_counter.fps:.1f} fps")
+
+
+class MatplotlibGraph(GraphWidget):
+    def __init__(self, store, column, parent=None, max_points=600, y_max=100, span=60, blit=True):
+        super().__init__(store, column, parent, max_points, y_max, span)
+        # Imported here so the app never loads matplotlib unless this
+        # backend is actually selected.
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
+        self.figure = Figure(figsize=(4, 3))
+        self.ax = self.figure.add_subplot()
+        self.canvas = FigureCanvas(self.figure)
+        layout = QVBoxLayout()
+        layout.addWidget(self.canvas)
+        layout.addWidget(self.stats_label)
+        self.setLayout(layout)
+        self.blit = blit
+        self.background = None
+        self.top = y_max or 1.0
+        self.x_max = float(span or 1)
+
+        # Axes decorations are created once; each frame only moves the line.
+        self.ax.set_xlim(0, self.x_max)
+        self.ax.set_ylim(0, self.top)
+        self.ax.set_xlabel('Time (s)', fontsize=10, color='#000000')
+        if y_max is not None:
+            self.ax.set_ylabel('Usage (%)', fontsize=10, color='#000000')
+        self.ax.grid(True, linestyle='--', alpha=0.7)
+        self.line, = self.ax.plot([], [], color=LINE_COLOR, linewidth=2, animated=blit)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def on_draw(self, event):
+        # A full draw (first show, resize, title change) refreshes the cached
+        # background that blitted frames are painted on top of.
+        if self.blit:
+            self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+            self.ax.draw_artist(self.line)
+
+    def draw_graph(self, label):
+        start = time.perf_counter()
+        if label != self.label:
+            self.label = label
+            self.ax.set_title(label, fontsize=12, color='#000000')
+            self.background = None
+        xs, values, width = self.series()
+        top = self.scale(values)
+        if top != self.top:
+            # The axis changed, so the cached background is out of date.
+            self.top = top
+            self.ax.set_ylim(0, top)
+            self.background = None
+        if width != self.x_max:
+            self.x_max = width
+            self.ax.set_xlim(0, self.x_max)
+            self.background = None
+        self.line.set_data(xs, values)
+        if not self.blit or self.background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self.ax.draw_artist(self.line)
+            self.canvas.blit(self.ax.bbox)
+        self.count_frame(time.perf_counter() - start)
+
+
+class SparklineCanvas(QWidget):
+    def __init__(self, graph):
+        super().__init__(graph)
+        self.graph = graph
+        self.setMinimumHeight(120)
+
+    def paintEvent(self, event):
+        self.graph.paint_canvas(self)
+
+
+class SparklineGraph(GraphWidget):
+    def __init__(self, store, column, parent=None, max_points=600, y_max=100, span=60):
+        super().__init__(store, column, parent, max_points, y_max, span)
+        self.canvas = SparklineCanvas(self)
+        layout = QVBoxLayout()
+        layout.addWidget(self.canvas)
+        layout.addWidget(self.stats_label)
+        self.setLayout(layout)
+        self.line_pen = QPen(QColor(LINE_COLOR), 2)
+        self.grid_pen = QPen(QColor(0, 0, 0, 60), 1, Qt.PenStyle.DashLine)
+        self.title_font = QFont("Segoe UI", 10)
+        self.scale_font = QFont("Segoe UI", 8)
+
+    def draw_graph(self, label):
+        self.label = label
+        self.canvas.update()
+
+    def paint_canvas(self, canvas):
+        start = time.perf_counter()
+        painter = QPainter(canvas)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        text_color = self.palette().color(self.foregroundRole())
+
+        rect = QRectF(canvas.rect()).adjusted(4, 4, -4, -4)
+        title_height = 0
+        if self.label:
+            painter.setFont(self.title_font)
+            painter.setPen(text_color)
+            title_height = painter.fontMetrics().height() + 4
+            painter.drawText(rect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, self.label)
+        plot = rect.adjusted(0, title_height, 0, 0)
+
+        painter.setPen(self.grid_pen)
+        for fraction in (0.25, 0.5, 0.75):
+            y = plot.bottom() - fraction * plot.height()
+            painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+        painter.setPen(QPen(text_color, 1))
+        painter.drawRect(plot)
+
+        xs, values, width = self.series()
+        top = self.scale(values)
+        if self.y_max is None:
+            painter.setFont(self.scale_font)
+            painter.drawText(plot.adjusted(3, 1, 0, 0), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                             f"{top:g}")
+        if len(values) > 1:
+            xs = plot.left() + xs * (plot.width() / width)
+            ys = plot.bottom() - np.clip(np.nan_to_num(values), 0, top) * (plot.height() / top)
+            polygon = QPolygonF(list(map(QPointF, xs.tolist(), ys.tolist())))
+            painter.setPen(self.line_pen)
+            painter.drawPolyline(polygon)
+        painter.end()
+        self.count_frame(time.perf_counter() - start)
+
+
+def heatmap_lut():
+    """256-entry blue -> yellow -> red color table as ARGB32 pixels."""
+    stops = np.array([0, 128, 255])
+    index = np.arange(256)
+    red = np.interp(index, stops, [40, 250, 220])
+    green = np.interp(index, stops, [90, 220, 30])
+    blue = np.interp(index, stops, [180, 60, 30])
+    return ((0xFF << 24) | (red.astype(np.uint32) << 16)
+            | (green.astype(np.uint32) << 8) | blue.astype(np.uint32)).astype(np.uint32)
+
+
+class HeatmapWidget(QWidget):
+    """Time-by-core heatmap drawn as one image per frame.
+
+    The whole (time, core) window is mapped through a color table with
+    NumPy and handed to QPainter as a single QImage, so the cost does not
+    grow with one draw call per core. The last span seconds are split into
+    columns equal time slots, each showing the latest sample taken by the
+    end of its slot, so a varying sampling rate does not distort the time
+    axis.
+    """
+
+    def __init__(self, store, parent=None, max_points=600, span=60, columns=120):
+        super().__init__(parent)
+        self.store = store
+        self.max_points = max_points
+        self.span = span
+        self.columns = columns
+        self.label = None
+        self.lut = heatmap_lut()
+        self.title_font = QFont("Segoe UI", 10)
+        self.pixels = None
+        self.frame_counter = FrameCounter()
+        self.setMinimumHeight(min(40 + 4 * store.width, 220))
+
+    def draw_graph(self, label):
+        self.label = label
+        self.update()
+
+    def render_image(self):
+        values = self.store.view(self.max_points)
+        if not len(values):
+            return None
+        timestamps = self.store.timestamp_view(self.max_points)
+        slot_ms = self.span * 1000 / self.columns
+        slot_ends = timestamps[-1] - (self.columns - 1 - np.arange(self.columns)) * slot_ms
+        samples = np.searchsorted(timestamps, slot_ends, 'right') - 1
+        # Slots before the first sample stay empty.
+        samples = samples[samples >= 0]
+        levels = np.clip(values[samples], 0, 100) * 2.55
+        # Rows are cores and columns are time slots, oldest on the left.
+        pixels = np.ascontiguousarray(self.lut[levels.astype(np.uint8)].T)
+        height, width = pixels.shape
+        # QImage does not copy the buffer; keep it alive until the next frame.
+        self.pixels = pixels
+        return QImage(pixels.data, width, height, width * 4, QImage.Format.Format_RGB32)
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        painter = QPainter(self)
+        rect = QRectF(self.rect()).adjusted(4, 4, -4, -4)
+        if self.label:
+            painter.setFont(self.title_font)
+            painter.setPen(self.palette().color(self.foregroundRole()))
+            title_height = painter.fontMetrics().height() + 4
+            painter.drawText(rect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, self.label)
+            rect.adjust(0, title_height, 0, 0)
+        image = self.render_image()
+        if image is not None:
+            filled = rect.width() * image.width() / self.columns
+            target = QRectF(rect.right() - filled, rect.top(), filled, rect.height())
+            painter.drawImage(target, image)
+        painter.setPen(QPen(self.palette().color(self.foregroundRole()), 1))
+        painter.drawRect(rect)
+        painter.end()
+        self.frame_counter.add(time.perf_counter() - start)
+
+
+FLEET_TILE_WIDTH = 260
+FLEET_TILE_HEIGHT = 110
+
+
+class FleetGrid(QWidget):
+    """One tile per host with a sparkline per metric, all drawn by this widget.
+
+    Meant to sit in a QScrollArea: only tiles inside the exposed rectangle
+    are painted, so a frame costs the same for ten hosts or five hundred.
+    entries are (host, store) pairs; the host gives the name and
+    connection state of the tile and the store its samples.
+    """
+
+    def __init__(self, columns, parent=None, max_points=120, span=60):
+        super().__init__(parent)
+        self.columns = columns
+        self.max_points = max_points
+        self.span = span
+        self.entries = []
+        self.labels = dict(zip(columns, columns))
+        self.offline_text = '{error}'
+        self.warning_threshold = 80
+        self.name_font = QFont("Segoe UI", 9, QFont.Weight.Bold)
+        self.value_font = QFont("Segoe UI", 8)
+        self.line_pen = QPen(QColor(LINE_COLOR), 1.5)
+        self.warning_pen = QPen(QColor('#D13438'), 2)
+        self.frame_counter = FrameCounter()
+
+    def set_entries(self, entries):
+        self.entries = entries
+        self.update_height()
+        self.update()
+
+    def tiles_per_row(self):
+        return max(1, self.width() // FLEET_TILE_WIDTH)
+
+    def update_height(self):
+        rows = -(-len(self.entries) // self.tiles_per_row())
+        self.setMinimumHeight(rows * FLEET_TILE_HEIGHT)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_height()
+
+    def draw_graph(self, label=None):
+        self.update()
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        per_row = self.tiles_per_row()
+        exposed = event.rect()
+        first_row = max(0, exposed.top() // FLEET_TILE_HEIGHT)
+        last_row = exposed.bottom() // FLEET_TILE_HEIGHT
+        for index in range(first_row * per_row, min(len(self.entries), (last_row + 1) * per_row)):
+            row, column = divmod(index, per_row)
+            tile = QRectF(column * FLEET_TILE_WIDTH, row * FLEET_TILE_HEIGHT, FLEET_TILE_WIDTH, FLEET_TILE_HEIGHT)
+            self.paint_tile(painter, tile.adjusted(3, 3, -3, -3), *self.entries[index])
+        painter.end()
+        self.frame_counter.add(time.perf_counter() - start)
+
+    def paint_tile(self, painter, rect, host, store):
+        text_color = self.palette().color(self.foregroundRole())
+        values = {column: store.last(column) for column in self.columns}
+        warning = any(value > self.warning_threshold for value in values.values())
+        painter.setPen(self.warning_pen if warning else QPen(text_color, 1))
+        painter.drawRect(rect)
+        rect = rect.adjusted(6, 4, -6, -4)
+
+        painter.setFont(self.name_font)
+        painter.setPen(text_color)
+        name_height = painter.fontMetrics().height()
+        painter.drawText(QRectF(rect.left(), rect.top(), rect.width() - 14, name_height),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, host.name)
+        state = '#107C10' if host.connected else ('#D13438' if host.error else '#8A8A8A')
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(state))
+        painter.drawEllipse(QPointF(rect.right() - 5, rect.top() + name_height / 2), 4, 4)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        body = rect.adjusted(0, name_height + 2, 0, 0)
+
+        painter.setFont(self.value_font)
+        if not host.connected and not len(store):
+            painter.setPen(text_color)
+            painter.drawText(body, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap,
+                             self.offline_text.format(error=host.error or '...'))
+            return
+        line_height = body.height() / len(self.columns)
+        for position, column in enumerate(self.columns):
+            line = QRectF(body.left(), body.top() + position * line_height, body.width(), line_height)
+            value = values[column]
+            painter.setPen(text_color)
+            painter.drawText(QRectF(line.left(), line.top(), 80, line.height()),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                             f"{self.labels[column]} {'-' if np.isnan(value) else f'{value:.0f}%'}")
+            plot = line.adjusted(84, 2, 0, -2)
+            xs, series, width = time_series(store, column, self.max_points, self.span)
+            if len(series) > 1:
+                xs = plot.left() + xs * (plot.width() / width)
+                ys = plot.bottom() - np.clip(np.nan_to_num(series), 0, 100) * (plot.height() / 100)
+                painter.setPen(self.warning_pen if value > self.warning_threshold else self.line_pen)
+                painter.drawPolyline(QPolygonF(list(map(QPointF, xs.tolist(), ys.tolist()))))
+
+
+GRAPH_BACKENDS = {
+    'QPainter': SparklineGraph,
+    'Matplotlib': MatplotlibGraph,
+}
+
+
+def create_graph(backend, store, column, parent=None, y_max=100, span=60):
+    return GRAPH_BACKENDS.get(backend, SparklineGraph)(store, column, parent, y_max=y_max, span=span)
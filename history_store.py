@@ -0,0 +1,349 @@
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+
+HISTORY_FILE = 'system_monitor_history.bin'
+
+MAGIC = b'SMHIST01'
+HEADER_PREFIX = struct.Struct('<8sII')
+HEADER_ALIGN = 64
+RECOVERY_WINDOW = 4096
+
+
+def record_dtype(columns):
+    return np.dtype([('timestamp', '<i8')] + [(name, '<f4') for name in columns])
+
+
+def _encode_header(columns):
+    names = '\0'.join(columns).encode('utf-8')
+    size = HEADER_PREFIX.size + len(names)
+    size += -size % HEADER_ALIGN
+    header = HEADER_PREFIX.pack(MAGIC, size, len(columns)) + names
+    return header.ljust(size, b'\0')
+
+
+def _read_header(f):
+    prefix = f.read(HEADER_PREFIX.size)
+    if len(prefix) < HEADER_PREFIX.size:
+        raise ValueError('truncated history header')
+    magic, size, count = HEADER_PREFIX.unpack(prefix)
+    if magic != MAGIC:
+        raise ValueError('not a system monitor history file')
+    names = f.read(size - HEADER_PREFIX.size).rstrip(b'\0').decode('utf-8')
+    columns = tuple(names.split('\0')) if names else ()
+    if len(columns) != count:
+        raise ValueError('corrupt history header')
+    return size, columns
+
+
+class HistoryStore:
+    """Append-only file of fixed-size history records.
+
+    The file is a small header naming the float32 columns followed by
+    packed (int64 timestamp, float32...) records, so appending is a single
+    write and reading is a memory map with no parsing. A record torn by a
+    crash is dropped when the file is opened.
+    """
+
+    def __init__(self, path, columns, readonly=False, max_records=1_000_000):
+        self.path = path
+        self.readonly = readonly
+        self.max_records = max_records
+        self.lock = threading.RLock()
+        if readonly:
+            with open(path, 'rb') as f:
+                self.header_size, self.columns = _read_header(f)
+            self.file = None
+        else:
+            self.columns = tuple(columns)
+            self._open_for_append()
+        self.dtype = record_dtype(self.columns)
+        self.record_size = self.dtype.itemsize
+        if not readonly:
+            self._recover_tail()
+
+    def _open_for_append(self):
+        try:
+            with open(self.path, 'rb') as f:
+                header_size, columns = _read_header(f)
+        except FileNotFoundError:
+            self._create(self.path, self.columns)
+            header_size, columns = len(_encode_header(self.columns)), self.columns
+        except ValueError:
+            # Unreadable header: keep the damaged file aside and start over.
+            os.replace(self.path, self.path + '.corrupt')
+            self._create(self.path, self.columns)
+            header_size, columns = len(_encode_header(self.columns)), self.columns
+        if columns != self.columns:
+            self._migrate(columns, header_size)
+            header_size = len(_encode_header(self.columns))
+        self.header_size = header_size
+        self.file = open(self.path, 'r+b')
+        self.file.seek(0, os.SEEK_END)
+
+    @staticmethod
+    def _create(path, columns):
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(_encode_header(columns))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def _rewrite(self, records):
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(_encode_header(self.columns))
+            f.write(records.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def _migrate(self, old_columns, old_header_size):
+        # The schema grew or changed: carry every common column over and
+        # leave the new ones NaN for the old records.
+        old_dtype = record_dtype(old_columns)
+        count = (os.path.getsize(self.path) - old_header_size) // old_dtype.itemsize
+        new_dtype = record_dtype(self.columns)
+        records = np.empty(count, dtype=new_dtype)
+        if count:
+            old = np.memmap(self.path, dtype=old_dtype, mode='r', offset=old_header_size, shape=(count,))
+            records['timestamp'] = old['timestamp']
+            for name in self.columns:
+                records[name] = old[name] if name in old_columns else np.nan
+            del old
+        self._rewrite(records)
+
+    def _recover_tail(self):
+        data_size = os.path.getsize(self.path) - self.header_size
+        count = data_size // self.record_size
+        valid = count
+        if count:
+            # A crash can leave zero-filled or out-of-order records behind
+            # the last complete write; drop them from the end.
+            start = max(0, count - RECOVERY_WINDOW)
+            # One record before the window, so its first record is checked too.
+            timestamps = np.array(self._map(max(0, start - 1), count)['timestamp'])
+            if start:
+                timestamps, previous = timestamps[1:], timestamps[0]
+            else:
+                previous = 0
+            bad = np.flatnonzero((timestamps <= 0) | (np.diff(timestamps, prepend=previous) <= 0))
+            if len(bad):
+                valid = start + int(bad[0])
+        if valid * self.record_size != data_size:
+            self.file.truncate(self.header_size + valid * self.record_size)
+            self.file.seek(0, os.SEEK_END)
+
+    def __len__(self):
+        with self.lock:
+            if self.file is not None:
+                return (self.file.tell() - self.header_size) // self.record_size
+        return (os.path.getsize(self.path) - self.header_size) // self.record_size
+
+    def _map(self, start, end):
+        if end <= start:
+            return np.empty(0, dtype=self.dtype)
+        return np.memmap(self.path, dtype=self.dtype, mode='r',
+                         offset=self.header_size + start * self.record_size, shape=(end - start,))
+
+    def read(self, start=0, end=None):
+        """Memory-map records [start, end) as a structured array."""
+        count = len(self)
+        end = count if end is None else min(end, count)
+        return self._map(max(0, start), end)
+
+    def tail(self, count):
+        total = len(self)
+        return self._map(max(0, total - count), total)
+
+    def bounds(self, start_ms=None, end_ms=None):
+        """Index range [start, end) of the records with start_ms <= timestamp <= end_ms."""
+        timestamps = self.read()['timestamp']
+        start = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, 'left'))
+        end = len(timestamps) if end_ms is None else int(np.searchsorted(timestamps, end_ms, 'right'))
+        return start, max(start, end)
+
+    def range(self, start_ms=None, end_ms=None):
+        return self.read(*self.bounds(start_ms, end_ms))
+
+    def first_timestamp(self):
+        records = self.read(0, 1)
+        return int(records['timestamp'][0]) if len(records) else None
+
+    def last_timestamp(self):
+        records = self.tail(1)
+        return int(records['timestamp'][0]) if len(records) else None
+
+    def pack(self, rows):
+        """Pack (timestamp, values) pairs into record bytes.
+
+        Timestamps are forced to increase strictly, even across a clock
+        step back, so that the file stays sorted for binary search.
+        """
+        records = np.empty(len(rows), dtype=self.dtype)
+        for i, (timestamp, values) in enumerate(rows):
+            record = records[i]
+            record['timestamp'] = timestamp
+            for name in self.columns:
+                record[name] = values.get(name, np.nan)
+        if len(records):
+            last = self.last_timestamp()
+            offsets = np.arange(len(records))
+            floor = records['timestamp'] - offsets
+            if last is not None:
+                np.maximum(floor, last + 1, out=floor)
+            records['timestamp'] = np.maximum.accumulate(floor) + offsets
+        return records.tobytes()
+
+    def append(self, timestamp, values):
+        self.write(self.pack([(timestamp, values)]))
+
+    def write(self, data):
+        with self.lock:
+            self.file.write(data)
+            self.file.flush()
+            if len(self) > self.max_records * 5 // 4:
+                self.compact()
+
+    def compact(self):
+        with self.lock:
+            records = np.array(self.tail(self.max_records))
+            self.file.close()
+            self._rewrite(records)
+            self.file = open(self.path, 'r+b')
+            self.file.seek(0, os.SEEK_END)
+
+    def clear(self):
+        # A new, empty file replaces the old one rather than truncating it,
+        # since a reader (an export) may still have the old one mapped.
+        with self.lock:
+            self.file.close()
+            self._rewrite(np.empty(0, dtype=self.dtype))
+            self.file = open(self.path, 'r+b')
+            self.file.seek(0, os.SEEK_END)
+
+    def sync(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.sync()
+                self.file.close()
+                self.file = None
+
+
+class HistoryWriter(threading.Thread):
+    """Write-behind stage in front of a HistoryStore.
+
+    Records are buffered in memory and written in one batch when
+    flush_count records are pending, when flush_interval seconds have
+    passed, or when the writer is stopped. Written batches are also fed
+    to the rollup tiers, if any, off the caller's thread.
+    """
+
+    def __init__(self, store, flush_count=60, flush_interval=10.0, fsync=False, rollups=None):
+        super().__init__(name='HistoryWriter', daemon=True)
+        self.store = store
+        self.rollups = rollups
+        self.flush_count = flush_count
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.bytes_written = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flushed = threading.Condition()
+        self._requested = 0
+        self._completed = 0
+        self._wake = threading.Event()
+        self._stopped = False
+
+    def append(self, timestamp, values):
+        with self._lock:
+            self._pending.append((timestamp, values))
+            full = len(self._pending) >= self.flush_count
+        if full:
+            self._wake.set()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def set_policy(self, flush_count, flush_interval):
+        self.flush_count = flush_count
+        self.flush_interval = flush_interval
+        self._wake.set()
+
+    def discard(self):
+        with self._lock:
+            self._pending = []
+
+    def request_flush(self, timeout=0.5):
+        """Have the writer thread flush now and wait up to timeout seconds for it.
+
+        For the GUI thread, which must not run a flush itself: writing may
+        compact the store and feeds the rollups. Returns False if the
+        flush did not finish in time.
+        """
+        if not self.is_alive():
+            return False
+        with self._flushed:
+            self._requested += 1
+            target = self._requested
+        self._wake.set()
+        with self._flushed:
+            return self._flushed.wait_for(lambda: self._completed >= target, timeout)
+
+    def flush(self):
+        # Serialized so two flushes can never write their batches out of order.
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return
+            start = time.perf_counter()
+            data = self.store.pack(rows)
+            self.store.write(data)
+            if self.rollups is not None:
+                self.rollups.add(np.frombuffer(data, dtype=self.store.dtype))
+            if self.fsync:
+                self.store.sync()
+            elapsed = (time.perf_counter() - start) * 1000
+            self.bytes_written += len(data)
+            self.flushes += 1
+            self.last_flush_ms = elapsed
+            self.max_flush_ms = max(self.max_flush_ms, elapsed)
+
+    def run(self):
+        if self.rollups is not None:
+            self.rollups.prime(self.store)
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            with self._flushed:
+                requested = self._requested
+            self.flush()
+            with self._flushed:
+                self._completed = requested
+                self._flushed.notify_all()
+        self.flush()
+
+    def stop(self, timeout=5.0):
+        self._stopped = True
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+        else:
+            self.flush()
@@ -0,0 +1,166 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsWriter:
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name, help_text, kind='gauge'):
+        self.lines.append(f'# HELP {name} {help_text}')
+        self.lines.append(f'# TYPE {name} {kind}')
+
+    def sample(self, name, value, **labels):
+        if value is None:
+            return
+        if labels:
+            label_text = ','.join(f'{key}="{escape_label(label)}"' for key, label in labels.items())
+            name = f'{name}{{{label_text}}}'
+        self.lines.append(f'{name} {float(value)!r}')
+
+    def render(self):
+        return ('\n'.join(self.lines) + '\n').encode('utf-8')
+
+
+def render_snapshot(snapshot):
+    """Serialize a Snapshot in the Prometheus text exposition format."""
+    out = MetricsWriter()
+    out.family('system_sample_timestamp_seconds', 'Unix time the sample was taken.')
+    out.sample('system_sample_timestamp_seconds', snapshot.timestamp)
+
+    out.family('system_cpu_percent', 'CPU utilization across all cores.')
+    out.sample('system_cpu_percent', snapshot.cpu_percent)
+    out.family('system_cpu_core_percent', 'CPU utilization per logical core.')
+    for core, value in enumerate(snapshot.per_cpu):
+        out.sample('system_cpu_core_percent', value, core=core)
+
+    ram = snapshot.ram
+    out.family('system_memory_percent', 'Memory in use.')
+    out.sample('system_memory_percent', ram.percent)
+    out.family('system_memory_total_bytes', 'Physical memory.')
+    out.sample('system_memory_total_bytes', ram.total)
+    out.family('system_memory_used_bytes', 'Memory in use.')
+    out.sample('system_memory_used_bytes', ram.used)
+    out.family('system_memory_available_bytes', 'Memory available without swapping.')
+    out.sample('system_memory_available_bytes', ram.available)
+
+    out.family('system_disk_percent', 'Usage of the primary disk.')
+    out.sample('system_disk_percent', snapshot.disk.percent)
+    out.family('system_filesystem_size_bytes', 'Size of each mounted filesystem.')
+    for mount in snapshot.mounts:
+        if mount.usage is not None:
+            out.sample('system_filesystem_size_bytes', mount.usage.total, mountpoint=mount.mountpoint,
+                       device=mount.device, fstype=mount.fstype)
+    out.family('system_filesystem_used_bytes', 'Used space of each mounted filesystem.')
+    for mount in snapshot.mounts:
+        if mount.usage is not None:
+            out.sample('system_filesystem_used_bytes', mount.usage.used, mountpoint=mount.mountpoint,
+                       device=mount.device, fstype=mount.fstype)
+    out.family('system_filesystem_stale', '1 if the filesystem did not answer the last poll in time.')
+    for mount in snapshot.mounts:
+        out.sample('system_filesystem_stale', int(mount.stale), mountpoint=mount.mountpoint)
+
+    out.family('system_network_transmit_bytes_per_second', 'Bytes sent per second per interface.')
+    for nic in snapshot.net:
+        out.sample('system_network_transmit_bytes_per_second', nic.sent * 1024, interface=nic.name)
+    out.family('system_network_receive_bytes_per_second', 'Bytes received per second per interface.')
+    for nic in snapshot.net:
+        out.sample('system_network_receive_bytes_per_second', nic.recv * 1024, interface=nic.name)
+    out.family('system_network_errors_per_second', 'Receive and transmit errors per second per interface.')
+    for nic in snapshot.net:
+        out.sample('system_network_errors_per_second', nic.errors, interface=nic.name)
+
+    out.family('system_disk_read_bytes_per_second', 'Bytes read per second per block device.')
+    for rate in snapshot.disk_io:
+        out.sample('system_disk_read_bytes_per_second', rate.read * 1024**2, device=rate.name)
+    out.family('system_disk_write_bytes_per_second', 'Bytes written per second per block device.')
+    for rate in snapshot.disk_io:
+        out.sample('system_disk_write_bytes_per_second', rate.write * 1024**2, device=rate.name)
+    out.family('system_disk_operations_per_second', 'Completed reads and writes per second per block device.')
+    for rate in snapshot.disk_io:
+        out.sample('system_disk_operations_per_second', rate.read_iops + rate.write_iops, device=rate.name)
+    out.family('system_disk_await_seconds', 'Average time per completed operation per block device.')
+    for rate in snapshot.disk_io:
+        out.sample('system_disk_await_seconds', None if rate.await_ms is None else rate.await_ms / 1000,
+                   device=rate.name)
+    out.family('system_disk_busy_percent', 'Time the block device was busy.')
+    for rate in snapshot.disk_io:
+        out.sample('system_disk_busy_percent', rate.busy, device=rate.name)
+
+    cgroups = {usage.name: usage for usage in snapshot.cgroups}
+    if snapshot.cgroup is not None:
+        cgroups[snapshot.cgroup.name] = snapshot.cgroup
+    out.family('system_cgroup_cpu_percent', 'CPU used by the cgroup, relative to its CPU limit.')
+    for name, usage in cgroups.items():
+        out.sample('system_cgroup_cpu_percent', usage.cpu_percent, cgroup=name)
+    out.family('system_cgroup_cpu_limit_cores', 'CPU limit of the cgroup, or the host CPUs without one.')
+    for name, usage in cgroups.items():
+        out.sample('system_cgroup_cpu_limit_cores', usage.cpu_limit, cgroup=name)
+    out.family('system_cgroup_memory_used_bytes', 'Memory charged to the cgroup.')
+    for name, usage in cgroups.items():
+        out.sample('system_cgroup_memory_used_bytes', usage.memory_used, cgroup=name)
+    out.family('system_cgroup_memory_limit_bytes', 'Memory limit of the cgroup, or the host RAM without one.')
+    for name, usage in cgroups.items():
+        out.sample('system_cgroup_memory_limit_bytes', usage.memory_limit, cgroup=name)
+
+    out.family('system_pressure_stall_percent', 'Share of time tasks were stalled since the previous sample.')
+    for stall in snapshot.pressure:
+        out.sample('system_pressure_stall_percent', stall.stall, resource=stall.resource, kind=stall.kind)
+    out.family('system_pressure_avg10_percent', 'Kernel 10 second average of the stall share.')
+    for stall in snapshot.pressure:
+        out.sample('system_pressure_avg10_percent', stall.avg10, resource=stall.resource, kind=stall.kind)
+    return out.render()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        # A single attribute read: the payload is replaced, never mutated.
+        payload = self.server.metrics.payload
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer:
+    """Prometheus scrape endpoint served from its own threads.
+
+    publish() renders a Snapshot to bytes once and swaps the reference;
+    scrapes only send the current bytes, so they never touch the sampler
+    or take a lock, however often they arrive.
+    """
+
+    def __init__(self, host='127.0.0.1', port=9101):
+        self.payload = b''
+        self.httpd = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.metrics = self
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='MetricsServer', daemon=True)
+
+    @property
+    def address(self):
+        return self.httpd.server_address
+
+    def start(self):
+        self.thread.start()
+
+    def publish(self, snapshot):
+        self.payload = render_snapshot(snapshot)
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
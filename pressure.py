@@ -0,0 +1,75 @@
+import os
+import time
+from collections import namedtuple
+
+from cgroups import CgroupFile
+
+
+PRESSURE_ROOT = '/proc/pressure'
+PRESSURE_RESOURCES = ('cpu', 'memory', 'io')
+PRESSURE_KINDS = ('some', 'full')
+
+# avg10/avg60/avg300 are the kernel's running averages; stall is the share
+# of wall time (percent) tasks spent stalled since the previous poll,
+# computed from the total counter. 'some' counts time at least one task
+# waited on the resource, 'full' time every non-idle task did.
+PressureStall = namedtuple('PressureStall', ['resource', 'kind', 'avg10', 'avg60', 'avg300', 'stall'])
+
+
+def parse_pressure(text):
+    """{kind: (avg10, avg60, avg300, total microseconds)} from one pressure file."""
+    values = {}
+    for line in text.splitlines():
+        kind, *fields = line.split()
+        try:
+            fields = dict(field.split('=', 1) for field in fields)
+            values[kind] = (float(fields['avg10']), float(fields['avg60']), float(fields['avg300']),
+                            int(fields['total']))
+        except (KeyError, ValueError):
+            continue
+    return values
+
+
+class PressureMonitor:
+    """Pressure stall information for CPU, memory and I/O.
+
+    The three files are opened once and re-read with pread, so a poll is
+    three syscalls. Stall percentages come from the growth of the total
+    counters between polls, so they follow the sampling rate instead of
+    the kernel's fixed 10 s window; the first poll only records the
+    baseline. Kernels without PSI (before 4.20, or booted with psi=0)
+    leave the monitor unavailable.
+    """
+
+    def __init__(self, root=PRESSURE_ROOT):
+        self.files = {resource: CgroupFile(os.path.join(root, resource)) for resource in PRESSURE_RESOURCES}
+        self.available = any(file.fd is not None for file in self.files.values())
+        self.last_totals = {}
+        self.last_poll = None
+
+    def poll(self):
+        if not self.available:
+            return ()
+        now = time.monotonic()
+        elapsed = now - self.last_poll if self.last_poll is not None else None
+        self.last_poll = now
+
+        stalls = []
+        totals = {}
+        for resource, file in self.files.items():
+            text = file.read()
+            if text is None:
+                continue
+            for kind, (avg10, avg60, avg300, total) in parse_pressure(text).items():
+                totals[resource, kind] = total
+                previous = self.last_totals.get((resource, kind))
+                stall = None
+                if previous is not None and elapsed and total >= previous:
+                    stall = min(100.0, (total - previous) / (elapsed * 1e6) * 100)
+                stalls.append(PressureStall(resource, kind, avg10, avg60, avg300, stall))
+        self.last_totals = totals
+        return tuple(stalls)
+
+    def close(self):
+        for file in self.files.values():
+            file.close()
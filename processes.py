@@ -0,0 +1,112 @@
+import heapq
+import time
+from collections import namedtuple
+from operator import attrgetter
+
+import psutil
+
+
+ProcessInfo = namedtuple('ProcessInfo', ['pid', 'name', 'cpu_percent', 'rss', 'io_rate'])
+ProcessTable = namedtuple('ProcessTable', ['timestamp', 'count', 'scan_ms', 'top'])
+
+SORT_KEYS = ('cpu_percent', 'rss', 'io_rate')
+
+
+class ProcessScanner:
+    """Incremental process scan that ranks the top-N processes.
+
+    psutil.Process handles are cached per PID, so a scan only creates
+    handles for new PIDs and drops the ones that exited; everything else
+    is read through the cached handle inside oneshot(), which batches the
+    /proc reads of each process. A PID that exits and is reused between
+    two scans keeps its handle, so cumulative CPU time or I/O going
+    backwards is taken as a new process, which is then tracked afresh.
+    """
+
+    def __init__(self, top_n=15):
+        self.top_n = top_n
+        self.handles = {}
+        self.names = {}
+        self.last_cpu = {}
+        self.last_io = {}
+        self.io_denied = set()
+        self.last_scan = None
+
+    def _track(self, pid):
+        try:
+            proc = psutil.Process(pid)
+            self.names[pid] = proc.name()
+            # Establishes the baseline for the delta-based cpu_percent().
+            proc.cpu_percent(interval=None)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return
+        self.handles[pid] = proc
+
+    def _forget(self, pid):
+        self.handles.pop(pid, None)
+        self.names.pop(pid, None)
+        self.last_cpu.pop(pid, None)
+        self.last_io.pop(pid, None)
+        self.io_denied.discard(pid)
+
+    def scan(self):
+        pids = set(psutil.pids())
+        known = self.handles.keys()
+        for pid in known - pids:
+            self._forget(pid)
+        for pid in pids - known:
+            self._track(pid)
+
+        now = time.monotonic()
+        elapsed = now - self.last_scan if self.last_scan is not None else None
+        self.last_scan = now
+        rows = []
+        reused = []
+        for pid, proc in list(self.handles.items()):
+            try:
+                with proc.oneshot():
+                    # Served from the stat read oneshot() caches anyway.
+                    times = proc.cpu_times()
+                    cpu_total = times.user + times.system
+                    if cpu_total < self.last_cpu.get(pid, 0.0):
+                        reused.append(pid)
+                        continue
+                    self.last_cpu[pid] = cpu_total
+                    cpu = proc.cpu_percent(interval=None)
+                    rss = proc.memory_info().rss
+                    io_total = None
+                    if pid not in self.io_denied:
+                        # Denials are remembered so unreadable processes don't
+                        # pay for a raised exception on every scan.
+                        try:
+                            io = proc.io_counters()
+                            io_total = io.read_bytes + io.write_bytes
+                        except (psutil.AccessDenied, AttributeError):
+                            self.io_denied.add(pid)
+            except psutil.NoSuchProcess:
+                self._forget(pid)
+                continue
+            except psutil.AccessDenied:
+                continue
+            io_rate = 0.0
+            if io_total is not None:
+                previous = self.last_io.get(pid)
+                if previous is not None and io_total < previous:
+                    reused.append(pid)
+                    continue
+                if previous is not None and elapsed:
+                    io_rate = (io_total - previous) / elapsed
+                self.last_io[pid] = io_total
+            rows.append(ProcessInfo(pid, self.names.get(pid, ''), cpu, rss, io_rate))
+        # The new process is listed from the next scan, once its CPU
+        # baseline is set.
+        for pid in reused:
+            self._forget(pid)
+            self._track(pid)
+        return rows
+
+    def sample(self):
+        start = time.perf_counter()
+        rows = self.scan()
+        top = {key: heapq.nlargest(self.top_n, rows, key=attrgetter(key)) for key in SORT_KEYS}
+        return ProcessTable(time.time(), len(rows), (time.perf_counter() - start) * 1000, top)
@@ -0,0 +1,243 @@
+import os
+import threading
+import warnings
+from collections import namedtuple
+
+import numpy as np
+
+from history_store import HistoryStore
+
+
+STATS = ('min', 'max', 'mean', 'p95')
+
+# (name, bucket length in ms, retention in buckets). The raw history file
+# is the finest tier: one record per sample, about 1 s at the default rate.
+TIERS = (
+    ('1m', 60_000, 60 * 24 * 90),
+    ('1h', 3_600_000, 24 * 730),
+)
+
+MAX_POINTS = 5000
+
+QueryResult = namedtuple('QueryResult', ['tier', 'timestamps', 'values'])
+
+
+def rollup_columns(columns):
+    return tuple(f'{column}_{stat}' for column in columns for stat in STATS)
+
+
+def tier_path(history_path, name):
+    base, ext = os.path.splitext(history_path)
+    return f'{base}.{name}{ext}'
+
+
+class RollupTier:
+    """Fixed-length buckets of one metric set, summarized as each bucket closes."""
+
+    def __init__(self, name, bucket_ms, store, columns):
+        self.name = name
+        self.bucket_ms = bucket_ms
+        self.store = store
+        self.columns = columns
+        self.bucket = None
+        self.pending = []
+
+    def next_timestamp(self):
+        """First raw timestamp not yet folded into a written bucket."""
+        last = self.store.last_timestamp()
+        return 0 if last is None else last + self.bucket_ms
+
+    def add(self, records):
+        if not len(records):
+            return
+        records = np.concatenate(self.pending + [np.asarray(records)])
+        # A clock that steps back must not reopen an older bucket: such
+        # samples are folded into the bucket that is already open.
+        buckets = np.maximum.accumulate(records['timestamp'] // self.bucket_ms)
+        if self.bucket is not None:
+            buckets = np.maximum(buckets, self.bucket)
+        starts = np.flatnonzero(np.r_[True, np.diff(buckets) != 0])
+        # Everything but the last bucket is complete.
+        self.bucket = int(buckets[-1])
+        # Copied so the open bucket does not pin the whole concatenation.
+        self.pending = [records[starts[-1]:].copy()]
+        if len(starts) > 1:
+            closed = records[:starts[-1]]
+            summary = self.summarize(closed, buckets[starts[:-1]], starts[:-1])
+            self.store.write(summary.tobytes())
+
+    def summarize(self, records, buckets, starts):
+        """min/max/mean/p95 of every bucket at once; starts index the first record of each bucket."""
+        summary = np.empty(len(starts), dtype=self.store.dtype)
+        summary['timestamp'] = buckets * self.bucket_ms
+        groups = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(records)]))
+        with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+            # Buckets without data for a column summarize to NaN.
+            warnings.simplefilter('ignore', RuntimeWarning)
+            for column in self.columns:
+                values = records[column].astype(np.float64)
+                valid = ~np.isnan(values)
+                counts = np.add.reduceat(valid, starts)
+                summary[f'{column}_min'] = np.fmin.reduceat(values, starts)
+                summary[f'{column}_max'] = np.fmax.reduceat(values, starts)
+                summary[f'{column}_mean'] = np.add.reduceat(np.where(valid, values, 0.0), starts) / counts
+                # Sorting by (bucket, value) puts NaNs last in each bucket, so
+                # the valid values of bucket i are ordered[starts[i]:starts[i] + counts[i]].
+                ordered = values[np.lexsort((values, groups))]
+                position = 0.95 * np.maximum(counts - 1, 0)
+                low = np.floor(position).astype(np.int64)
+                high = np.minimum(low + 1, np.maximum(counts - 1, 0))
+                fraction = position - low
+                p95 = ordered[starts + low] * (1 - fraction) + ordered[starts + high] * fraction
+                summary[f'{column}_p95'] = np.where(counts > 0, p95, np.nan)
+        return summary
+
+    def clear(self):
+        self.bucket = None
+        self.pending = []
+        self.store.clear()
+
+
+class Rollups:
+    """Downsampled tiers next to a history file, fed with the raw records as they are written.
+
+    Each tier is its own HistoryStore with its own retention, holding
+    min/max/mean/p95 per metric and bucket. A bucket is written once the
+    first sample of the next bucket arrives.
+    """
+
+    def __init__(self, history_path, columns, readonly=False):
+        self.columns = tuple(columns)
+        self.lock = threading.Lock()
+        self.tiers = []
+        for name, bucket_ms, retention in TIERS:
+            path = tier_path(history_path, name)
+            try:
+                store = HistoryStore(path, rollup_columns(self.columns), readonly=readonly, max_records=retention)
+            except FileNotFoundError:
+                # Read-only and the collector has not written this tier yet.
+                continue
+            self.tiers.append(RollupTier(name, bucket_ms, store, self.columns))
+
+    def prime(self, raw_store):
+        """Catch up with raw records written while no rollups were being computed."""
+        with self.lock:
+            for tier in self.tiers:
+                tier.add(raw_store.range(tier.next_timestamp()))
+
+    def add(self, records):
+        with self.lock:
+            for tier in self.tiers:
+                tier.add(records)
+
+    def clear(self):
+        with self.lock:
+            for tier in self.tiers:
+                tier.clear()
+
+    def close(self):
+        with self.lock:
+            for tier in self.tiers:
+                tier.store.close()
+
+
+def reaches_back(store, bucket_ms, start_ms):
+    """Whether store holds data from start_ms on.
+
+    Rollup timestamps are bucket starts, so a bucket only counts once it
+    has ended by start_ms; otherwise a floored bucket would seem to reach
+    further back than the raw samples it was built from.
+    """
+    first = store.first_timestamp()
+    return first is not None and (start_ms is None or first + bucket_ms <= start_ms)
+
+
+def pick_tier(sources, start_ms, end_ms, max_points=MAX_POINTS):
+    """Pick the finest (name, store) that covers [start_ms, end_ms] in at most max_points records.
+
+    sources are (name, bucket_ms, store), finest first, with bucket_ms 0
+    for the raw file. When no store reaches back to start_ms, the one
+    with the most records in the range is used. max_points=None accepts
+    any size.
+    """
+    best = None
+    for name, bucket_ms, store in sources:
+        start, end = store.bounds(start_ms, end_ms)
+        count = end - start
+        if max_points is not None and count > max_points:
+            continue
+        if count and reaches_back(store, bucket_ms, start_ms):
+            return name, store
+        if best is None or count > best[0]:
+            best = (count, name, store)
+    return best[1:] if best else (sources[-1][0], sources[-1][2])
+
+
+def series(store, records, columns):
+    """Per-metric values of raw or rollup records; rollups contribute their bucket means."""
+    values = {}
+    for column in columns:
+        if f'{column}_mean' in store.columns:
+            values[column] = records[f'{column}_mean']
+        elif column in store.columns:
+            values[column] = records[column]
+    return values
+
+
+def resample(timestamps, values, step):
+    """NaN-aware mean of the values in each step-ms bucket."""
+    if not len(timestamps):
+        return timestamps, values
+    buckets = timestamps // step
+    starts = np.flatnonzero(np.r_[True, np.diff(buckets) != 0])
+    resampled = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for name, column in values.items():
+            column = column.astype(np.float64)
+            valid = ~np.isnan(column)
+            totals = np.add.reduceat(np.where(valid, column, 0.0), starts)
+            resampled[name] = totals / np.add.reduceat(valid, starts)
+    return buckets[starts] * step, resampled
+
+
+class HistoryQuery:
+    """Time-range reads over the raw history file and its rollup tiers.
+
+    Every tier is sorted by its int64 timestamps, so locating a range is
+    a binary search on the memory-mapped file and costs the same however
+    long the history is; only the records in the range are read.
+    """
+
+    def __init__(self, raw_store, rollups=None):
+        self.sources = [('raw', 0, raw_store)]
+        if rollups is not None:
+            self.sources += [(tier.name, tier.bucket_ms, tier.store) for tier in rollups.tiers]
+
+    def query(self, start_ms=None, end_ms=None, metrics=None, step=None, max_points=MAX_POINTS):
+        """Timestamps and per-metric arrays for start_ms <= t <= end_ms (epoch ms, None for open ends).
+
+        Without step, the finest tier that fits in max_points is read.
+        With step (ms), the coarsest tier no coarser than step is read and
+        averaged into step-ms buckets.
+        """
+        if metrics is None:
+            metrics = self.sources[0][2].columns
+        if step is None:
+            name, store = pick_tier(self.sources, start_ms, end_ms, max_points)
+        else:
+            # Coarsest first: the first tier reaching back to start_ms wins,
+            # otherwise the raw file.
+            candidates = [(name, bucket_ms, store) for name, bucket_ms, store in reversed(self.sources)
+                          if bucket_ms <= step]
+            for name, bucket_ms, store in candidates:
+                start, end = store.bounds(start_ms, end_ms)
+                if end > start and reaches_back(store, bucket_ms, start_ms):
+                    break
+            else:
+                name, _, store = candidates[-1]
+        records = store.range(start_ms, end_ms)
+        timestamps = np.array(records['timestamp'])
+        values = {column: np.array(data) for column, data in series(store, records, metrics).items()}
+        if step is not None:
+            timestamps, values = resample(timestamps, values, step)
+        return QueryResult(name, timestamps, values)
@@ -0,0 +1,455 @@
+import abc
+import fnmatch
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import psutil
+
+from cgroups import CgroupMonitor
+from pressure import PRESSURE_KINDS, PRESSURE_RESOURCES, PressureMonitor
+
+
+# cgroup is the CgroupUsage of this process's cgroup (None without cgroup
+# v2), cgroups the usage of every top-level cgroup, pressure the
+# PressureStall readings (empty without PSI).
+Snapshot = namedtuple('Snapshot', ['timestamp', 'cpu_percent', 'per_cpu', 'ram', 'disk', 'mounts', 'net', 'disk_io',
+                                   'cgroup', 'cgroups', 'pressure'], defaults=(None, (), ()))
+MountUsage = namedtuple('MountUsage', ['mountpoint', 'device', 'fstype', 'usage', 'stale'])
+# Per-interface rates: KB/s for sent/recv, per second for packets and errors.
+NicRate = namedtuple('NicRate', ['name', 'sent', 'recv', 'packets_sent', 'packets_recv', 'errors'])
+# Per-device rates: MB/s, operations/s, average ms per operation and busy
+# percent. await_ms is None without completed operations, busy None where
+# the platform has no busy_time.
+DiskIORate = namedtuple('DiskIORate', ['name', 'read', 'write', 'read_iops', 'write_iops', 'await_ms', 'busy'])
+
+# Kernel and virtual filesystems that never hold user data.
+PSEUDO_FSTYPES = frozenset({
+    'autofs', 'binfmt_misc', 'bpf', 'cgroup', 'cgroup2', 'configfs', 'debugfs', 'devpts',
+    'devtmpfs', 'efivarfs', 'fusectl', 'hugetlbfs', 'mqueue', 'nsfs', 'proc', 'pstore',
+    'rpc_pipefs', 'securityfs', 'squashfs', 'sysfs', 'tracefs', 'tmpfs', 'overlay',
+})
+
+PERCENT_COLUMNS = ('cpu', 'ram', 'disk', 'disk_busy')
+# Usage of this process's cgroup against its own limits; NaN without cgroup v2.
+CGROUP_COLUMNS = ('cgroup_cpu', 'cgroup_ram')
+# Percent of time stalled on each resource between samples; NaN without PSI.
+PRESSURE_COLUMNS = tuple(f'psi_{resource}_{kind}' for resource in PRESSURE_RESOURCES for kind in PRESSURE_KINDS)
+METRIC_COLUMNS = PERCENT_COLUMNS + ('net_sent', 'net_recv', 'disk_read', 'disk_write', 'disk_iops', 'disk_await') \
+    + CGROUP_COLUMNS + PRESSURE_COLUMNS
+
+COUNTER_WRAP = 2 ** 32
+
+
+def snapshot_metrics(snapshot):
+    """Flatten a Snapshot into the metric columns recorded in history."""
+    return {
+        'cpu': snapshot.cpu_percent,
+        'ram': snapshot.ram.percent,
+        'disk': snapshot.disk.percent,
+        'net_sent': sum(nic.sent for nic in snapshot.net),
+        'net_recv': sum(nic.recv for nic in snapshot.net),
+        **disk_io_metrics(snapshot.disk_io),
+        **cgroup_metrics(snapshot.cgroup),
+        **pressure_metrics(snapshot.pressure),
+    }
+
+
+def cgroup_metrics(usage):
+    nan = float('nan')
+    if usage is None:
+        return {'cgroup_cpu': nan, 'cgroup_ram': nan}
+    return {
+        'cgroup_cpu': nan if usage.cpu_percent is None else usage.cpu_percent,
+        'cgroup_ram': nan if usage.memory_percent is None else usage.memory_percent,
+    }
+
+
+def pressure_metrics(stalls):
+    metrics = dict.fromkeys(PRESSURE_COLUMNS, float('nan'))
+    for stall in stalls:
+        if stall.stall is not None:
+            metrics[f'psi_{stall.resource}_{stall.kind}'] = stall.stall
+    return metrics
+
+
+def disk_io_metrics(rates):
+    """Host-wide disk I/O: summed throughput, the busiest device, mean await per operation."""
+    operations = sum(rate.read_iops + rate.write_iops for rate in rates)
+    waited = sum((rate.read_iops + rate.write_iops) * rate.await_ms for rate in rates if rate.await_ms is not None)
+    busy = [rate.busy for rate in rates if rate.busy is not None]
+    return {
+        'disk_busy': max(busy) if busy else float('nan'),
+        'disk_read': sum(rate.read for rate in rates),
+        'disk_write': sum(rate.write for rate in rates),
+        'disk_iops': operations,
+        'disk_await': waited / operations if operations else 0.0,
+    }
+
+
+def counter_delta(new, old):
+    """Increase of a cumulative counter, or None if the counter was reset."""
+    if new >= old:
+        return new - old
+    # A 32-bit counter that wrapped lands just past zero; anything else
+    # going backwards is a reset (driver reload, interface re-created).
+    wrapped = new + COUNTER_WRAP - old
+    if old < COUNTER_WRAP and wrapped < COUNTER_WRAP // 2:
+        return wrapped
+    return None
+
+
+def parse_patterns(text):
+    return tuple(pattern.strip() for pattern in text.split(',') if pattern.strip())
+
+
+class DiskMonitor:
+    """Usage of every mounted partition, sampled without letting one mount stall the rest.
+
+    The partition list is cached and re-enumerated every refresh_interval
+    seconds. Usage is read on a worker pool and each poll waits at most
+    timeout seconds; a mount that does not answer in time keeps its last
+    known usage, is reported stale and gets no new request until its
+    pending one completes.
+    """
+
+    def __init__(self, include=(), exclude=(), refresh_interval=30.0, timeout=0.5, workers=8):
+        self.include = include
+        self.exclude = exclude
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='DiskUsage')
+        self.partitions = []
+        self.refreshed_at = None
+        self.pending = {}
+        self.last_usage = {}
+
+    def set_filters(self, include, exclude):
+        self.include = include
+        self.exclude = exclude
+        self.refreshed_at = None
+
+    def selected(self, mountpoint):
+        if self.include and not any(fnmatch.fnmatch(mountpoint, pattern) for pattern in self.include):
+            return False
+        return not any(fnmatch.fnmatch(mountpoint, pattern) for pattern in self.exclude)
+
+    def refresh_partitions(self):
+        partitions = []
+        seen = set()
+        for part in psutil.disk_partitions(all=True):
+            if part.fstype in PSEUDO_FSTYPES or part.mountpoint in seen:
+                continue
+            if self.selected(part.mountpoint):
+                seen.add(part.mountpoint)
+                partitions.append(part)
+        self.partitions = partitions
+        self.refreshed_at = time.monotonic()
+
+    def poll(self):
+        if self.refreshed_at is None or time.monotonic() - self.refreshed_at > self.refresh_interval:
+            self.refresh_partitions()
+        futures = {}
+        submitted = []
+        for part in self.partitions:
+            future = self.pending.get(part.mountpoint)
+            if future is None:
+                future = self.executor.submit(psutil.disk_usage, part.mountpoint)
+                submitted.append(future)
+            futures[part.mountpoint] = future
+        # Only this poll's requests are waited for: a mount still hung on
+        # an earlier request is reported stale at once, so it does not
+        # add the timeout to every sample.
+        if submitted:
+            wait(submitted, timeout=self.timeout)
+
+        mounts = []
+        for part in self.partitions:
+            future = futures[part.mountpoint]
+            stale = True
+            if future.done():
+                self.pending.pop(part.mountpoint, None)
+                try:
+                    self.last_usage[part.mountpoint] = future.result()
+                    stale = False
+                except OSError:
+                    pass
+            else:
+                self.pending[part.mountpoint] = future
+            mounts.append(MountUsage(part.mountpoint, part.device, part.fstype,
+                                     self.last_usage.get(part.mountpoint), stale))
+        return tuple(mounts)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class CounterRateMonitor(abc.ABC):
+    """Per-device rates computed from successive readings of cumulative counters.
+
+    Devices that appear get a baseline on their first poll and a rate
+    from the second; devices that disappear are forgotten. Counter wraps
+    and resets are told apart per device. Include and exclude patterns
+    are matched once per device name and memoized, so hosts with hundreds
+    of veths only pay for the devices selected. Subclasses read the
+    counters and turn their deltas into a rate tuple.
+    """
+
+    def __init__(self, include=(), exclude=()):
+        self.include = include
+        self.exclude = exclude
+        self.selection = {}
+        self.last_counters = {}
+        self.last_poll = None
+
+    def set_filters(self, include, exclude):
+        self.include = include
+        self.exclude = exclude
+        self.selection = {}
+
+    def eligible(self, name):
+        return True
+
+    def selected(self, name):
+        selected = self.selection.get(name)
+        if selected is None:
+            selected = self.eligible(name) \
+                and (not self.include or any(fnmatch.fnmatch(name, pattern) for pattern in self.include)) \
+                and not any(fnmatch.fnmatch(name, pattern) for pattern in self.exclude)
+            self.selection[name] = selected
+        return selected
+
+    @abc.abstractmethod
+    def read_counters(self):
+        """{name: counters} of every device."""
+
+    @abc.abstractmethod
+    def counter_values(self, counters):
+        """The cumulative values of one device, as a tuple."""
+
+    @abc.abstractmethod
+    def rate(self, name, deltas, elapsed, counters):
+        """The rate record of one device from the deltas of its counter_values over elapsed seconds."""
+
+    def poll(self):
+        counters = self.read_counters()
+        now = time.monotonic()
+        elapsed = now - self.last_poll if self.last_poll is not None else None
+        self.last_poll = now
+        if len(self.selection) > 2 * len(counters) + 64:
+            # Short-lived devices (containers) would otherwise grow the cache forever.
+            self.selection = {}
+
+        rates = []
+        current = {}
+        for name, device in counters.items():
+            if not self.selected(name):
+                continue
+            values = self.counter_values(device)
+            current[name] = values
+            previous = self.last_counters.get(name)
+            if previous is None or not elapsed:
+                continue
+            deltas = [counter_delta(new, old) for new, old in zip(values, previous)]
+            if None in deltas:
+                continue
+            rates.append(self.rate(name, deltas, elapsed, device))
+        self.last_counters = current
+        return tuple(rates)
+
+
+class NetworkMonitor(CounterRateMonitor):
+    """Per-interface throughput computed from successive counter readings."""
+
+    def __init__(self, include=(), exclude=('lo',)):
+        super().__init__(include, exclude)
+
+    def read_counters(self):
+        # nowrap=False: wraps and resets are told apart here, per interface,
+        # instead of psutil folding every decrease into a wrap.
+        return psutil.net_io_counters(pernic=True, nowrap=False)
+
+    def counter_values(self, nic):
+        return (nic.bytes_sent, nic.bytes_recv, nic.packets_sent, nic.packets_recv, nic.errin + nic.errout)
+
+    def rate(self, name, deltas, elapsed, nic):
+        sent, recv, packets_sent, packets_recv, errors = deltas
+        return NicRate(name, sent / 1024 / elapsed, recv / 1024 / elapsed,
+                       packets_sent / elapsed, packets_recv / elapsed, errors / elapsed)
+
+
+class DiskIOMonitor(CounterRateMonitor):
+    """Per-device throughput, IOPS and latency from successive disk_io_counters readings.
+
+    Only whole block devices are reported: on Linux, partitions are
+    skipped so their I/O is not counted twice.
+    """
+
+    def __init__(self, include=(), exclude=('loop*', 'ram*')):
+        super().__init__(include, exclude)
+
+    def eligible(self, name):
+        return not os.path.isdir('/sys/block') or os.path.exists(os.path.join('/sys/block', name))
+
+    def read_counters(self):
+        return psutil.disk_io_counters(perdisk=True, nowrap=False) or {}
+
+    def counter_values(self, disk):
+        return (disk.read_bytes, disk.write_bytes, disk.read_count, disk.write_count,
+                disk.read_time, disk.write_time, getattr(disk, 'busy_time', 0))
+
+    def rate(self, name, deltas, elapsed, disk):
+        read, write, reads, writes, read_time, write_time, busy_time = deltas
+        operations = reads + writes
+        return DiskIORate(
+            name, read / (1024**2) / elapsed, write / (1024**2) / elapsed,
+            reads / elapsed, writes / elapsed,
+            (read_time + write_time) / operations if operations else None,
+            # busy_time is in milliseconds.
+            min(100.0, busy_time / (elapsed * 10)) if hasattr(disk, 'busy_time') else None,
+        )
+
+
+class Sampler:
+    """Takes non-blocking, delta-based readings of system resources."""
+
+    def __init__(self, disk_path='/', disk_monitor=None, network_monitor=None, disk_io_monitor=None,
+                 cgroup_monitor=None, pressure_monitor=None):
+        self.disk_path = disk_path
+        self.disk_monitor = disk_monitor or DiskMonitor()
+        self.network_monitor = network_monitor or NetworkMonitor()
+        self.disk_io_monitor = disk_io_monitor or DiskIOMonitor()
+        self.cgroup_monitor = cgroup_monitor or CgroupMonitor()
+        self.pressure_monitor = pressure_monitor or PressureMonitor()
+        # Static facts are read once instead of on every sample.
+        self.logical_cpus = psutil.cpu_count(logical=True) or 1
+        self.physical_cpus = psutil.cpu_count(logical=False)
+        # cpu_percent(interval=None) reports usage since the previous call,
+        # so the first call only establishes the baseline.
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+        self.network_monitor.poll()
+        self.disk_io_monitor.poll()
+        self.cgroup_monitor.poll()
+        self.pressure_monitor.poll()
+
+    def sample(self):
+        cgroup, cgroups = self.cgroup_monitor.poll()
+        return Snapshot(
+            timestamp=time.time(),
+            cpu_percent=psutil.cpu_percent(interval=None),
+            per_cpu=tuple(psutil.cpu_percent(interval=None, percpu=True)),
+            ram=psutil.virtual_memory(),
+            disk=psutil.disk_usage(self.disk_path),
+            mounts=self.disk_monitor.poll(),
+            net=self.network_monitor.poll(),
+            disk_io=self.disk_io_monitor.poll(),
+            cgroup=cgroup,
+            cgroups=cgroups,
+            pressure=self.pressure_monitor.poll(),
+        )
+
+
+class AdaptiveInterval:
+    """Picks the next sampling interval from the latest Snapshot.
+
+    A sample near the warning threshold, or one where CPU, RAM or disk
+    busy moved by at least volatility percentage points since the
+    previous sample, drops the interval to min_interval at once. While
+    the system stays steady the interval grows by backoff per sample, up
+    to max_interval, so short spikes are caught without sampling quickly
+    all day.
+    """
+
+    def __init__(self, min_interval=0.1, max_interval=5.0, threshold=80, margin=10, volatility=10.0, backoff=1.5):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.threshold = threshold
+        self.margin = margin
+        self.volatility = volatility
+        self.backoff = backoff
+        self.interval = self.min_interval
+        self.previous = None
+
+    def __call__(self, snapshot):
+        busy = [rate.busy for rate in snapshot.disk_io if rate.busy is not None]
+        levels = (snapshot.cpu_percent, snapshot.ram.percent, max(busy, default=0.0))
+        previous, self.previous = self.previous, levels
+        hot = max(levels) >= self.threshold - self.margin
+        moved = previous is not None and max(abs(a - b) for a, b in zip(levels, previous)) >= self.volatility
+        if hot or moved:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        return self.interval
+
+
+class SamplerThread(threading.Thread):
+    """Runs a Sampler and hands every Snapshot to callback.
+
+    Samples are taken every interval seconds, or, with a schedule, after
+    whatever interval schedule(snapshot) returns for the latest sample.
+    The callback is invoked on the sampler thread; GUI code must forward it
+    through a queued signal instead of touching widgets directly.
+    """
+
+    def __init__(self, sampler, callback, interval=1.0, name='SamplerThread', schedule=None):
+        super().__init__(name=name, daemon=True)
+        self.sampler = sampler
+        self.callback = callback
+        self.interval = interval
+        self.schedule = schedule
+        self._wake = threading.Event()
+        self._stopped = False
+        self._paused = False
+
+    def set_interval(self, interval, schedule=None):
+        self.interval = interval
+        self.schedule = schedule
+        self._wake.set()
+
+    def pause(self):
+        """Stop sampling until resume(); the thread sleeps instead of polling."""
+        self._paused = True
+
+    def resume(self):
+        # Samples right away rather than at the end of the interval.
+        if self._paused:
+            self._paused = False
+            self._wake.set()
+
+    def stop(self, timeout=2.0):
+        self._stopped = True
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        deadline = time.monotonic()
+        while not self._stopped:
+            if self._paused:
+                self._wake.wait()
+                self._wake.clear()
+                deadline = time.monotonic()
+                continue
+            try:
+                snapshot = self.sampler.sample()
+            except (OSError, psutil.Error):
+                snapshot = None
+            if snapshot is not None and not self._stopped:
+                self.callback(snapshot)
+                schedule = self.schedule
+                if schedule is not None:
+                    self.interval = schedule(snapshot)
+
+            deadline += self.interval
+            now = time.monotonic()
+            if deadline < now:
+                # Fell behind (suspend, slow callback): skip the missed ticks
+                # instead of sampling in a burst.
+                deadline = now
+            if self._wake.wait(deadline - now):
+                self._wake.clear()
+                deadline = time.monotonic()
@@ -1,60 +1,311 @@
+import os
 import sys
-import psutil
 import time
+
+# perf_counter() readings taken while the module loads, reported with
+# --startup-profile.
+IMPORT_MARKS = [('start', time.perf_counter())]
+
+if __name__ == '__main__' and '--headless' in sys.argv[1:]:
+    # Display-less servers: hand over to the collector before Qt is imported.
+    from collector import main
+    sys.exit(main(sys.argv[1:]))
+
+import threading
+import argparse
+from contextlib import contextmanager
 from datetime import datetime
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QComboBox,
-    QPushButton, QTextEdit, QLabel, QStyleFactory, QTabWidget, QGridLayout,
-    QScrollArea, QMenuBar, QMenu, QFileDialog, QMessageBox, QLineEdit, QProgressBar
+    QPushButton, QTextEdit, QLabel, QStyleFactory, QTabWidget,
+    QScrollArea, QMenuBar, QMenu, QFileDialog, QMessageBox, QLineEdit, QProgressBar,
+    QTableView, QHeaderView, QStyledItemDelegate, QAbstractItemView, QTableWidget, QTableWidgetItem,
+    QDateTimeEdit
 )
-from PyQt6.QtCore import Qt, QTimer, QRectF
+from PyQt6.QtCore import (Qt, QTimer, QRectF, QObject, pyqtSignal, QAbstractTableModel, QModelIndex, QDateTime,
+                          QEvent)
 from PyQt6.QtGui import QIcon, QPalette, QColor, QFont, QPainter, QPen, QBrush
+IMPORT_MARKS.append(('PyQt6', time.perf_counter()))
 import json
-from pathlib import Path
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import numpy as np
+IMPORT_MARKS.append(('numpy', time.perf_counter()))
+from sampler import (CGROUP_COLUMNS, METRIC_COLUMNS, PERCENT_COLUMNS, AdaptiveInterval, DiskIOMonitor, DiskMonitor,
+                     NetworkMonitor, Sampler, SamplerThread, parse_patterns, snapshot_metrics)
+from graphs import GRAPH_BACKENDS, FleetGrid, HeatmapWidget, create_graph
+from timeseries import RingBuffer, RingBuffer2D
+from history_store import HISTORY_FILE, HistoryStore, HistoryWriter
+from rollups import MAX_POINTS, HistoryQuery, Rollups, pick_tier
+from processes import SORT_KEYS, ProcessScanner
+from alerts import ALERT_RULES_FILE, FIRING, AlertEngine, default_rules, load_rules
+IMPORT_MARKS.append(('app modules', time.perf_counter()))
+
+# The history view is virtualized, so the in-memory window can hold a full
+# day at the default refresh rate.
+HISTORY_CAPACITY = 86400
+# Per-interface rates and per-core loads are only kept for the live
+# graphs: a minute at the fastest sampling rate.
+NIC_CAPACITY = 600
+# Samples kept per fleet host: two minutes at the collectors' default rate.
+FLEET_CAPACITY = 120
+# Store columns behind the CPU and RAM gauges in each resource view.
+HOST_VIEW = {'cpu': 'cpu', 'ram': 'ram'}
+CGROUP_VIEW = {'cpu': 'cgroup_cpu', 'ram': 'cgroup_ram'}
+LEGACY_HISTORY_FILE = 'system_monitor_history.json'
+# Seconds covered by each History tab range; None follows the live samples
+# and 'custom' reads the dates picked in the tab.
+HISTORY_RANGES = (None, 3600, 86400, 7 * 86400, 30 * 86400, 'custom')
+LIVE_GRAPH_POINTS = 3600
+LIVE_GRAPH_SPAN = 3600
+
+class SampleBridge(QObject):
+    samples_ready = pyqtSignal()
 
-class GraphWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.figure, self.ax = plt.subplots(figsize=(4, 3))
-        self.canvas = FigureCanvas(self.figure)
-        layout = QVBoxLayout()
-        layout.addWidget(self.canvas)
-        self.setLayout(layout)
-        self.data = []
-        self.max_points = 60
-
-    def update_graph(self, value, label):
-        self.data.append(value)
-        if len(self.data) > self.max_points:
-            self.data.pop(0)
-        self.ax.clear()
-        self.ax.plot(self.data, color='#005A9E', linewidth=2)
-        self.ax.set_ylim(0, 100)
-        self.ax.set_title(label, fontsize=12, color='#000000')
-        self.ax.set_xlabel('Time (s)', fontsize=10, color='#000000')
-        self.ax.set_ylabel('Usage (%)', fontsize=10, color='#000000')
-        self.ax.grid(True, linestyle='--', alpha=0.7)
-        self.canvas.draw()
+        self._lock = threading.Lock()
+        self._pending = []
+
+    def push(self, snapshot):
+        # Called on the sampler thread. Only the first snapshot of a batch
+        # posts an event, so a busy GUI drains several samples in one go
+        # instead of falling behind an ever-growing signal queue.
+        with self._lock:
+            self._pending.append(snapshot)
+            notify = len(self._pending) == 1
+        if notify:
+            self.samples_ready.emit()
+
+    def drain(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+class ExportBridge(QObject):
+    """Carries HistoryExport progress from its thread to the GUI thread."""
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(str)
+
+    def report_progress(self, done, total):
+        self.progress.emit(done, total)
+
+    def report_finished(self, error):
+        self.finished.emit(error or '')
+
+class TickProfiler:
+    """Accumulates per-section GUI tick timings and optionally reports them."""
+
+    def __init__(self, report_every=0, stream=sys.stderr):
+        self.report_every = report_every
+        self.stream = stream
+        self.totals = {}
+        self.ticks = 0
+        self.style_applications = 0
+
+    @contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[name] = self.totals.get(name, 0.0) + time.perf_counter() - start
+
+    def end_tick(self):
+        self.ticks += 1
+        if self.report_every and self.ticks % self.report_every == 0:
+            self.report()
+
+    def report(self):
+        parts = [f"{name} {total * 1000 / self.ticks:.3f} ms" for name, total in self.totals.items()]
+        print(f"tick profile, average over {self.ticks} ticks: " + ", ".join(parts)
+              + f"; {self.style_applications} stylesheet applications", file=self.stream)
+
+
+class StartupProfile:
+    """Cold start timings, printed to stderr with --startup-profile.
+
+    phase(name) ends the phase that began at the previous call, starting
+    from the module's import marks; section(name) times work done later
+    on first use, such as building a tab, without the idle time before it.
+    """
+
+    def __init__(self, enabled=False, stream=sys.stderr):
+        self.enabled = enabled
+        self.stream = stream
+        self.started = IMPORT_MARKS[0][1]
+        self.last = self.started
+        self.phases = []
+        for name, mark in IMPORT_MARKS[1:]:
+            self.phases.append((f"import {name}", mark - self.last))
+            self.last = mark
+
+    def phase(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    @contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.note(name, time.perf_counter() - start)
+
+    def note(self, name, seconds):
+        if self.enabled:
+            print(f"startup: {name} {seconds * 1000:.1f} ms", file=self.stream)
+
+    def report(self):
+        if not self.enabled:
+            return
+        for name, seconds in self.phases:
+            print(f"startup: {name} {seconds * 1000:.1f} ms", file=self.stream)
+        print(f"startup: total {(self.last - self.started) * 1000:.1f} ms", file=self.stream)
+
+
+class HistoryTableModel(QAbstractTableModel):
+    """Read-only view of the RingBuffer; cells are formatted only when painted."""
+
+    def __init__(self, store, columns, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.columns = columns
+        self.headers = [''] * (len(columns) + 1)
+        self.row_count = len(store)
+        self.seen_total = store.total
+        self.refresh_views()
+
+    def refresh_views(self):
+        self.timestamps = self.store.timestamp_view()
+        self.values = [self.store.view(column) for column in self.columns]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns) + 1
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return datetime.fromtimestamp(int(self.timestamps[row]) / 1000).strftime("%Y-%m-%d %H:%M:%S")
+            value = self.values[column - 1][row]
+            # Rows recorded before a column existed hold NaN.
+            return '-' if np.isnan(value) else f"{value:.1f}%"
+        if role == Qt.ItemDataRole.UserRole and column > 0:
+            return float(self.values[column - 1][row])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def set_store(self, store):
+        self.beginResetModel()
+        self.store = store
+        self.row_count = len(store)
+        self.seen_total = store.total
+        self.refresh_views()
+        self.endResetModel()
+
+    def set_headers(self, headers):
+        self.headers = headers
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, len(headers) - 1)
+
+    def sync(self):
+        """Catch up with rows appended to (and evicted from) the store since the last call."""
+        added = self.store.total - self.seen_total
+        self.seen_total = self.store.total
+        size = len(self.store)
+        if added == 0 and size == self.row_count:
+            return
+        if added < 0 or size != min(self.row_count + added, self.store.capacity):
+            # Cleared or reloaded: nothing to diff against.
+            self.beginResetModel()
+            self.row_count = size
+            self.refresh_views()
+            self.endResetModel()
+            return
+        evicted = min(self.row_count + added - size, self.row_count)
+        if evicted:
+            self.beginRemoveRows(QModelIndex(), 0, evicted - 1)
+            self.row_count -= evicted
+            self.refresh_views()
+            self.endRemoveRows()
+        inserted = size - self.row_count
+        if inserted:
+            self.beginInsertRows(QModelIndex(), self.row_count, size - 1)
+            self.row_count = size
+            self.refresh_views()
+            self.endInsertRows()
+
+
+class HistoryDelegate(QStyledItemDelegate):
+    """Single place where history cells get their alignment, font and warning color."""
+
+    def __init__(self, app, parent=None):
+        super().__init__(parent)
+        self.app = app
+        self.font = QFont("Segoe UI", 9)
+        self.border_color = QColor(0, 0, 0, 25)
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        option.font = self.font
+        horizontal = Qt.AlignmentFlag.AlignRight if self.app.current_lang == 'fa' else Qt.AlignmentFlag.AlignLeft
+        option.displayAlignment = horizontal | Qt.AlignmentFlag.AlignVCenter
+        value = index.data(Qt.ItemDataRole.UserRole)
+        if value is not None and value > self.app.warning_threshold:
+            option.backgroundBrush = QBrush(self.app.themes[self.app.current_theme]['warning'])
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        rect = option.rect
+        painter.fillRect(rect.left(), rect.bottom(), rect.width(), 1, self.border_color)
+
 
 class SystemMonitorApp(QMainWindow):
-    def __init__(self):
+    def __init__(self, profile=False, attach=None, metrics_server=None, startup=None, fleet_client=None):
         super().__init__()
+        self.startup = startup or StartupProfile()
         self.setWindowTitle("System Monitor")
         self.setGeometry(100, 100, 1200, 800)
         self.setWindowIcon(QIcon('icon.ico'))
 
         self.current_lang = 'en'
         self.current_theme = 'Windows11'
-        self.history = []
-        self.cpu_data = []
-        self.ram_data = []
-        self.disk_data = []
-        self.max_data_points = 60
+        self.graph_backend = 'QPainter'
+        self.store = RingBuffer(HISTORY_CAPACITY, METRIC_COLUMNS)
+        # Attached to a collector's history file, the window only reads it:
+        # no local sampling and no history writes.
+        self.attach = attach
+        if attach:
+            self.history_store = HistoryStore(attach, METRIC_COLUMNS, readonly=True)
+            self.rollups = None
+            self.history_writer = None
+        else:
+            self.history_store = HistoryStore(HISTORY_FILE, METRIC_COLUMNS)
+            self.rollups = Rollups(HISTORY_FILE, METRIC_COLUMNS)
+            self.history_writer = HistoryWriter(self.history_store, rollups=self.rollups)
+        self.followed_records = 0
+        self.metrics_server = metrics_server
+        # Followed remote collectors; each gets a small store for its tile.
+        self.fleet_client = fleet_client
+        self.fleet_stores = {}
         self.warning_threshold = 80
-        self.load_history()
+        self.alert_duration = 5.0
+        self.alert_hysteresis = 5.0
+        self.pressure_threshold = 20.0
+        # In the cgroup view the CPU and RAM gauges, graphs and default
+        # alerts follow this process's cgroup instead of the whole host.
+        self.view_columns = dict(HOST_VIEW)
+        self.alerts, self.custom_alert_rules = self.create_alert_engine()
+        self.last_snapshot = None
+        self.profiler = TickProfiler(report_every=50 if profile else 0)
 
         self.texts = {
             'en': {
@@ -89,7 +340,122 @@ class SystemMonitorApp(QMainWindow):
                 'used': 'Used:',
                 'free': 'Free:',
                 'percent': 'Percent:',
-                'warning_threshold': 'Warning Threshold (%):'
+                'warning_threshold': 'Warning Threshold (%):',
+                'graph_backend': 'Graph Backend:',
+                'flush_count': 'History Flush Batch (samples):',
+                'flush_interval': 'History Flush Interval (s):',
+                'persistence_stats': 'History written: {kb:.1f} KB in {flushes} flushes, last {last:.2f} ms, max {max:.2f} ms, {pending} pending',
+                'disks_tab': 'Disks',
+                'mount_point': 'Mount',
+                'device': 'Device',
+                'fstype': 'Type',
+                'column_total': 'Total (GB)',
+                'column_used': 'Used (GB)',
+                'column_free': 'Free (GB)',
+                'column_percent': 'Usage (%)',
+                'stale': 'not responding',
+                'disk_include': 'Disk Include Patterns (comma-separated):',
+                'disk_exclude': 'Disk Exclude Patterns (comma-separated):',
+                'per_core_title': 'Per-core CPU Usage (%)',
+                'processes_tab': 'Processes',
+                'sort_by': 'Sort by:',
+                'sort_cpu': 'CPU',
+                'sort_memory': 'Memory',
+                'sort_io': 'I/O',
+                'pid': 'PID',
+                'process_name': 'Name',
+                'column_cpu': 'CPU (%)',
+                'column_memory': 'Memory (MB)',
+                'column_io': 'I/O (KB/s)',
+                'process_summary': '{count} processes, scan took {ms:.1f} ms',
+                'network_tab': 'Network',
+                'interface': 'Interface',
+                'column_sent': 'Sent (KB/s)',
+                'column_recv': 'Received (KB/s)',
+                'column_packets_sent': 'Packets Sent/s',
+                'column_packets_recv': 'Packets Received/s',
+                'column_errors': 'Errors/s',
+                'net_sent_title': 'Sent (KB/s)',
+                'net_recv_title': 'Received (KB/s)',
+                'net_include': 'Network Interface Include Patterns (comma-separated):',
+                'net_exclude': 'Network Interface Exclude Patterns (comma-separated):',
+                'disk_io_label': 'Disk I/O:',
+                'disk_busy_title': 'Busiest Disk Utilization (%)',
+                'column_read': 'Read (MB/s)',
+                'column_write': 'Write (MB/s)',
+                'column_read_iops': 'Read IOPS',
+                'column_write_iops': 'Write IOPS',
+                'column_await': 'Await (ms)',
+                'column_busy': 'Busy (%)',
+                'history_disk_busy': 'Disk Busy (%)',
+                'read_only_title': '{title} (read-only: {path})',
+                'range_label': 'Range:',
+                'range_live': 'Live',
+                'range_hour': 'Last hour',
+                'range_day': 'Last day',
+                'range_week': 'Last 7 days',
+                'range_month': 'Last 30 days',
+                'range_summary': '{points} points from the {tier} tier',
+                'range_custom': 'Custom',
+                'range_show': 'Show',
+                'export_progress': 'Exporting %v of %m records (%p%)',
+                'export_cancel': 'Cancel',
+                'export_cancelled': 'Export cancelled',
+                'export_failed': 'Export failed: {error}',
+                'sampling_label': 'Sampling:',
+                'sampling_fixed': 'Fixed (refresh rate)',
+                'sampling_adaptive': 'Adaptive (load and volatility)',
+                'sampling_min': 'Fastest adaptive refresh (ms):',
+                'sampling_max': 'Slowest adaptive refresh (ms):',
+                'alerts_tab': 'Alerts',
+                'alert_time': 'Time',
+                'alert_rule': 'Alert',
+                'alert_state': 'State',
+                'alert_value': 'Value',
+                'alert_firing': 'Firing',
+                'alert_resolved': 'Resolved',
+                'alerts_summary': '{active} active, {notified} notifications, {suppressed} suppressed by the rate limit',
+                'status_alert': '{resource} alert: {value} since {time}',
+                'alert_duration': 'Alert After (seconds over threshold):',
+                'alert_hysteresis': 'Alert Hysteresis (%):',
+                'alert_notify': 'Repeat Notifications After (seconds):',
+                'fleet_tab': 'Fleet',
+                'fleet_cpu': 'CPU',
+                'fleet_ram': 'RAM',
+                'fleet_disk': 'Disk',
+                'fleet_offline': 'Offline: {error}',
+                'fleet_summary': '{connected} of {total} hosts connected, {samples} samples received',
+                'cgroups_tab': 'Cgroups',
+                'cgroup_name': 'Cgroup',
+                'column_cpu_of_limit': 'CPU (% of limit)',
+                'column_cpu_limit': 'CPU Limit (cores)',
+                'column_memory_limit': 'Memory Limit (MB)',
+                'column_memory_of_limit': 'Memory (% of limit)',
+                'cgroups_summary': 'This process runs in {path}',
+                'cgroups_unavailable': 'cgroup v2 is not available on this system',
+                'resource_view': 'Resource View:',
+                'view_host': 'Host',
+                'view_cgroup': 'Own cgroup',
+                'cgroup_label': 'Cgroup:',
+                'limit': 'Limit:',
+                'cores': 'cores',
+                'pressure_tab': 'Pressure',
+                'pressure_cpu_title': 'CPU Stalled (% of time)',
+                'pressure_memory_title': 'Memory Stalled (% of time)',
+                'pressure_io_title': 'I/O Stalled (% of time)',
+                'pressure_resource': 'Resource',
+                'pressure_kind': 'Stalled Tasks',
+                'pressure_some': 'Some',
+                'pressure_full': 'All',
+                'pressure_cpu': 'CPU',
+                'pressure_memory': 'Memory',
+                'pressure_io': 'I/O',
+                'column_avg10': 'Avg 10 s (%)',
+                'column_avg60': 'Avg 60 s (%)',
+                'column_avg300': 'Avg 300 s (%)',
+                'column_stall': 'Current (%)',
+                'pressure_unavailable': 'Pressure stall information is not available on this system',
+                'pressure_threshold': 'Pressure Threshold (% stalled):'
             },
             'fa': {
                 'title': 'مانیتور سیستم',
@@ -123,7 +489,122 @@ class SystemMonitorApp(QMainWindow):
                 'used': 'استفاده‌شده:',
                 'free': 'آزاد:',
                 'percent': 'درصد:',
-                'warning_threshold': 'آستانه هشدار (%):'
+                'warning_threshold': 'آستانه هشدار (%):',
+                'graph_backend': 'موتور نمودار:',
+                'flush_count': 'اندازه دسته ذخیره تاریخچه (نمونه):',
+                'flush_interval': 'فاصله ذخیره تاریخچه (ثانیه):',
+                'persistence_stats': 'تاریخچه نوشته\u200cشده: {kb:.1f} کیلوبایت در {flushes} بار ذخیره، آخرین {last:.2f} میلی\u200cثانیه، بیشینه {max:.2f} میلی\u200cثانیه، {pending} در انتظار',
+                'disks_tab': 'دیسک\u200cها',
+                'mount_point': 'نقطه اتصال',
+                'device': 'دستگاه',
+                'fstype': 'نوع',
+                'column_total': 'کل (GB)',
+                'column_used': 'استفاده\u200cشده (GB)',
+                'column_free': 'آزاد (GB)',
+                'column_percent': 'استفاده (%)',
+                'stale': 'پاسخ نمی\u200cدهد',
+                'disk_include': 'الگوهای شامل دیسک (جداشده با کاما):',
+                'disk_exclude': 'الگوهای حذف دیسک (جداشده با کاما):',
+                'per_core_title': 'استفاده از CPU به تفکیک هسته (%)',
+                'processes_tab': 'فرایندها',
+                'sort_by': 'مرتب\u200cسازی بر اساس:',
+                'sort_cpu': 'CPU',
+                'sort_memory': 'حافظه',
+                'sort_io': 'ورودی/خروجی',
+                'pid': 'شناسه',
+                'process_name': 'نام',
+                'column_cpu': 'CPU (%)',
+                'column_memory': 'حافظه (MB)',
+                'column_io': 'ورودی/خروجی (KB/s)',
+                'process_summary': '{count} فرایند، پویش {ms:.1f} میلی\u200cثانیه طول کشید',
+                'network_tab': 'شبکه',
+                'interface': 'رابط',
+                'column_sent': 'ارسال (KB/s)',
+                'column_recv': 'دریافت (KB/s)',
+                'column_packets_sent': 'بسته\u200cهای ارسالی/ثانیه',
+                'column_packets_recv': 'بسته\u200cهای دریافتی/ثانیه',
+                'column_errors': 'خطا/ثانیه',
+                'net_sent_title': 'ارسال (KB/s)',
+                'net_recv_title': 'دریافت (KB/s)',
+                'net_include': 'الگوهای شمول رابط شبکه (جداشده با کاما):',
+                'net_exclude': 'الگوهای حذف رابط شبکه (جداشده با کاما):',
+                'disk_io_label': 'ورودی/خروجی دیسک:',
+                'disk_busy_title': 'بیشترین بهره\u200cوری دیسک (%)',
+                'column_read': 'خواندن (MB/s)',
+                'column_write': 'نوشتن (MB/s)',
+                'column_read_iops': 'IOPS خواندن',
+                'column_write_iops': 'IOPS نوشتن',
+                'column_await': 'انتظار (ms)',
+                'column_busy': 'مشغول (%)',
+                'history_disk_busy': 'مشغولی دیسک (%)',
+                'read_only_title': '{title} (فقط خواندنی: {path})',
+                'range_label': 'بازه:',
+                'range_live': 'زنده',
+                'range_hour': 'ساعت گذشته',
+                'range_day': 'روز گذشته',
+                'range_week': '۷ روز گذشته',
+                'range_month': '۳۰ روز گذشته',
+                'range_summary': '{points} نقطه از سطح {tier}',
+                'range_custom': 'سفارشی',
+                'range_show': 'نمایش',
+                'export_progress': 'در حال خروجی گرفتن %v از %m رکورد (%p%)',
+                'export_cancel': 'لغو',
+                'export_cancelled': 'خروجی گرفتن لغو شد',
+                'export_failed': 'خروجی گرفتن ناموفق بود: {error}',
+                'sampling_label': 'نمونه\u200cبرداری:',
+                'sampling_fixed': 'ثابت (نرخ به\u200cروزرسانی)',
+                'sampling_adaptive': 'تطبیقی (بار و نوسان)',
+                'sampling_min': 'سریع\u200cترین به\u200cروزرسانی تطبیقی (میلی\u200cثانیه):',
+                'sampling_max': 'کندترین به\u200cروزرسانی تطبیقی (میلی\u200cثانیه):',
+                'alerts_tab': 'هشدارها',
+                'alert_time': 'زمان',
+                'alert_rule': 'هشدار',
+                'alert_state': 'وضعیت',
+                'alert_value': 'مقدار',
+                'alert_firing': 'فعال',
+                'alert_resolved': 'برطرف شده',
+                'alerts_summary': '{active} فعال، {notified} اعلان، {suppressed} اعلان محدودشده',
+                'status_alert': 'هشدار {resource}: {value} از {time}',
+                'alert_duration': 'هشدار پس از (ثانیه بالای آستانه):',
+                'alert_hysteresis': 'هیسترزیس هشدار (%):',
+                'alert_notify': 'تکرار اعلان پس از (ثانیه):',
+                'fleet_tab': 'ناوگان',
+                'fleet_cpu': 'CPU',
+                'fleet_ram': 'RAM',
+                'fleet_disk': 'دیسک',
+                'fleet_offline': 'آفلاین: {error}',
+                'fleet_summary': '{connected} از {total} میزبان متصل، {samples} نمونه دریافت شده',
+                'cgroups_tab': 'Cgroupها',
+                'cgroup_name': 'Cgroup',
+                'column_cpu_of_limit': 'CPU (% از سقف)',
+                'column_cpu_limit': 'سقف CPU (هسته)',
+                'column_memory_limit': 'سقف حافظه (MB)',
+                'column_memory_of_limit': 'حافظه (% از سقف)',
+                'cgroups_summary': 'این برنامه در {path} اجرا می\u200cشود',
+                'cgroups_unavailable': 'cgroup v2 در این سیستم در دسترس نیست',
+                'resource_view': 'نمای منابع:',
+                'view_host': 'میزبان',
+                'view_cgroup': 'cgroup خود برنامه',
+                'cgroup_label': 'Cgroup:',
+                'limit': 'سقف:',
+                'cores': 'هسته',
+                'pressure_tab': 'فشار',
+                'pressure_cpu_title': 'توقف CPU (% زمان)',
+                'pressure_memory_title': 'توقف حافظه (% زمان)',
+                'pressure_io_title': 'توقف I/O (% زمان)',
+                'pressure_resource': 'منبع',
+                'pressure_kind': 'وظایف متوقف',
+                'pressure_some': 'برخی',
+                'pressure_full': 'همه',
+                'pressure_cpu': 'CPU',
+                'pressure_memory': 'حافظه',
+                'pressure_io': 'I/O',
+                'column_avg10': 'میانگین ۱۰ ث (%)',
+                'column_avg60': 'میانگین ۶۰ ث (%)',
+                'column_avg300': 'میانگین ۳۰۰ ث (%)',
+                'column_stall': 'فعلی (%)',
+                'pressure_unavailable': 'اطلاعات توقف فشار در این سیستم در دسترس نیست',
+                'pressure_threshold': 'آستانه فشار (% توقف):'
             },
             'zh': {
                 'title': '系统监控器',
@@ -157,7 +638,122 @@ class SystemMonitorApp(QMainWindow):
                 'used': '已使用：',
                 'free': '可用：',
                 'percent': '百分比：',
-                'warning_threshold': '警告阈值 (%):'
+                'warning_threshold': '警告阈值 (%):',
+                'graph_backend': '图表后端：',
+                'flush_count': '历史写入批量（样本数）：',
+                'flush_interval': '历史写入间隔（秒）：',
+                'persistence_stats': '历史已写入：{kb:.1f} KB，共 {flushes} 次写入，最近 {last:.2f} 毫秒，最长 {max:.2f} 毫秒，{pending} 条待写入',
+                'disks_tab': '磁盘',
+                'mount_point': '挂载点',
+                'device': '设备',
+                'fstype': '类型',
+                'column_total': '总量 (GB)',
+                'column_used': '已使用 (GB)',
+                'column_free': '可用 (GB)',
+                'column_percent': '使用率 (%)',
+                'stale': '无响应',
+                'disk_include': '磁盘包含模式（逗号分隔）：',
+                'disk_exclude': '磁盘排除模式（逗号分隔）：',
+                'per_core_title': '每核CPU使用率 (%)',
+                'processes_tab': '进程',
+                'sort_by': '排序方式：',
+                'sort_cpu': 'CPU',
+                'sort_memory': '内存',
+                'sort_io': 'I/O',
+                'pid': 'PID',
+                'process_name': '名称',
+                'column_cpu': 'CPU (%)',
+                'column_memory': '内存 (MB)',
+                'column_io': 'I/O (KB/s)',
+                'process_summary': '{count} 个进程，扫描耗时 {ms:.1f} 毫秒',
+                'network_tab': '网络',
+                'interface': '接口',
+                'column_sent': '发送 (KB/s)',
+                'column_recv': '接收 (KB/s)',
+                'column_packets_sent': '发送包/秒',
+                'column_packets_recv': '接收包/秒',
+                'column_errors': '错误/秒',
+                'net_sent_title': '发送 (KB/s)',
+                'net_recv_title': '接收 (KB/s)',
+                'net_include': '网络接口包含模式（逗号分隔）：',
+                'net_exclude': '网络接口排除模式（逗号分隔）：',
+                'disk_io_label': '磁盘I/O：',
+                'disk_busy_title': '最繁忙磁盘利用率 (%)',
+                'column_read': '读取 (MB/s)',
+                'column_write': '写入 (MB/s)',
+                'column_read_iops': '读取IOPS',
+                'column_write_iops': '写入IOPS',
+                'column_await': '平均等待 (ms)',
+                'column_busy': '繁忙 (%)',
+                'history_disk_busy': '磁盘繁忙 (%)',
+                'read_only_title': '{title}（只读：{path}）',
+                'range_label': '范围：',
+                'range_live': '实时',
+                'range_hour': '最近一小时',
+                'range_day': '最近一天',
+                'range_week': '最近7天',
+                'range_month': '最近30天',
+                'range_summary': '来自 {tier} 层的 {points} 个点',
+                'range_custom': '自定义',
+                'range_show': '显示',
+                'export_progress': '正在导出 %v / %m 条记录 (%p%)',
+                'export_cancel': '取消',
+                'export_cancelled': '导出已取消',
+                'export_failed': '导出失败：{error}',
+                'sampling_label': '采样：',
+                'sampling_fixed': '固定（刷新率）',
+                'sampling_adaptive': '自适应（负载与波动）',
+                'sampling_min': '最快自适应刷新（毫秒）：',
+                'sampling_max': '最慢自适应刷新（毫秒）：',
+                'alerts_tab': '警报',
+                'alert_time': '时间',
+                'alert_rule': '警报',
+                'alert_state': '状态',
+                'alert_value': '数值',
+                'alert_firing': '触发中',
+                'alert_resolved': '已解除',
+                'alerts_summary': '{active} 个活动警报，{notified} 条通知，{suppressed} 条因频率限制被抑制',
+                'status_alert': '{resource}警报：{value}，自 {time}',
+                'alert_duration': '超过阈值多少秒后警报:',
+                'alert_hysteresis': '警报滞后 (%):',
+                'alert_notify': '重复通知间隔 (秒):',
+                'fleet_tab': '集群',
+                'fleet_cpu': 'CPU',
+                'fleet_ram': '内存',
+                'fleet_disk': '磁盘',
+                'fleet_offline': '离线：{error}',
+                'fleet_summary': '{total} 台主机中 {connected} 台已连接，已接收 {samples} 个样本',
+                'cgroups_tab': 'Cgroup',
+                'cgroup_name': 'Cgroup',
+                'column_cpu_of_limit': 'CPU (占限额 %)',
+                'column_cpu_limit': 'CPU 限额 (核)',
+                'column_memory_limit': '内存限额 (MB)',
+                'column_memory_of_limit': '内存 (占限额 %)',
+                'cgroups_summary': '本进程运行于 {path}',
+                'cgroups_unavailable': '此系统不支持 cgroup v2',
+                'resource_view': '资源视图:',
+                'view_host': '主机',
+                'view_cgroup': '本进程 cgroup',
+                'cgroup_label': 'Cgroup:',
+                'limit': '限额:',
+                'cores': '核',
+                'pressure_tab': '压力',
+                'pressure_cpu_title': 'CPU 停滞 (时间 %)',
+                'pressure_memory_title': '内存停滞 (时间 %)',
+                'pressure_io_title': 'I/O 停滞 (时间 %)',
+                'pressure_resource': '资源',
+                'pressure_kind': '停滞任务',
+                'pressure_some': '部分',
+                'pressure_full': '全部',
+                'pressure_cpu': 'CPU',
+                'pressure_memory': '内存',
+                'pressure_io': 'I/O',
+                'column_avg10': '10秒平均 (%)',
+                'column_avg60': '60秒平均 (%)',
+                'column_avg300': '300秒平均 (%)',
+                'column_stall': '当前 (%)',
+                'pressure_unavailable': '此系统不支持压力停滞信息 (PSI)',
+                'pressure_threshold': '压力阈值 (停滞 %):'
             },
             'ru': {
                 'title': 'Системный монитор',
@@ -191,7 +787,122 @@ class SystemMonitorApp(QMainWindow):
                 'used': 'Использовано:',
                 'free': 'Свободно:',
                 'percent': 'Процент:',
-                'warning_threshold': 'Порог предупреждения (%):'
+                'warning_threshold': 'Порог предупреждения (%):',
+                'graph_backend': 'Движок графиков:',
+                'flush_count': 'Пакет записи истории (выборки):',
+                'flush_interval': 'Интервал записи истории (с):',
+                'persistence_stats': 'Записано истории: {kb:.1f} КБ за {flushes} сбросов, последний {last:.2f} мс, макс. {max:.2f} мс, в очереди {pending}',
+                'disks_tab': 'Диски',
+                'mount_point': 'Точка монтирования',
+                'device': 'Устройство',
+                'fstype': 'Тип',
+                'column_total': 'Всего (ГБ)',
+                'column_used': 'Использовано (ГБ)',
+                'column_free': 'Свободно (ГБ)',
+                'column_percent': 'Использование (%)',
+                'stale': 'не отвечает',
+                'disk_include': 'Шаблоны включения дисков (через запятую):',
+                'disk_exclude': 'Шаблоны исключения дисков (через запятую):',
+                'per_core_title': 'Загрузка ЦП по ядрам (%)',
+                'processes_tab': 'Процессы',
+                'sort_by': 'Сортировка:',
+                'sort_cpu': 'ЦП',
+                'sort_memory': 'Память',
+                'sort_io': 'Ввод-вывод',
+                'pid': 'PID',
+                'process_name': 'Имя',
+                'column_cpu': 'ЦП (%)',
+                'column_memory': 'Память (МБ)',
+                'column_io': 'Ввод-вывод (КБ/с)',
+                'process_summary': '{count} процессов, сканирование заняло {ms:.1f} мс',
+                'network_tab': 'Сеть',
+                'interface': 'Интерфейс',
+                'column_sent': 'Отправлено (КБ/с)',
+                'column_recv': 'Получено (КБ/с)',
+                'column_packets_sent': 'Пакетов отправлено/с',
+                'column_packets_recv': 'Пакетов получено/с',
+                'column_errors': 'Ошибок/с',
+                'net_sent_title': 'Отправлено (КБ/с)',
+                'net_recv_title': 'Получено (КБ/с)',
+                'net_include': 'Шаблоны включения сетевых интерфейсов (через запятую):',
+                'net_exclude': 'Шаблоны исключения сетевых интерфейсов (через запятую):',
+                'disk_io_label': 'Дисковый ввод-вывод:',
+                'disk_busy_title': 'Загрузка самого занятого диска (%)',
+                'column_read': 'Чтение (МБ/с)',
+                'column_write': 'Запись (МБ/с)',
+                'column_read_iops': 'IOPS чтения',
+                'column_write_iops': 'IOPS записи',
+                'column_await': 'Ожидание (мс)',
+                'column_busy': 'Занятость (%)',
+                'history_disk_busy': 'Занятость диска (%)',
+                'read_only_title': '{title} (только чтение: {path})',
+                'range_label': 'Диапазон:',
+                'range_live': 'В реальном времени',
+                'range_hour': 'Последний час',
+                'range_day': 'Последние сутки',
+                'range_week': 'Последние 7 дней',
+                'range_month': 'Последние 30 дней',
+                'range_summary': '{points} точек из уровня {tier}',
+                'range_custom': 'Произвольный',
+                'range_show': 'Показать',
+                'export_progress': 'Экспорт %v из %m записей (%p%)',
+                'export_cancel': 'Отмена',
+                'export_cancelled': 'Экспорт отменён',
+                'export_failed': 'Ошибка экспорта: {error}',
+                'sampling_label': 'Опрос:',
+                'sampling_fixed': 'Фиксированный (частота обновления)',
+                'sampling_adaptive': 'Адаптивный (нагрузка и изменчивость)',
+                'sampling_min': 'Самое частое адаптивное обновление (мс):',
+                'sampling_max': 'Самое редкое адаптивное обновление (мс):',
+                'alerts_tab': 'Оповещения',
+                'alert_time': 'Время',
+                'alert_rule': 'Оповещение',
+                'alert_state': 'Состояние',
+                'alert_value': 'Значение',
+                'alert_firing': 'Активно',
+                'alert_resolved': 'Снято',
+                'alerts_summary': 'Активных: {active}, уведомлений: {notified}, подавлено ограничением частоты: {suppressed}',
+                'status_alert': 'Оповещение {resource}: {value} с {time}',
+                'alert_duration': 'Оповещать через (секунд выше порога):',
+                'alert_hysteresis': 'Гистерезис оповещения (%):',
+                'alert_notify': 'Повторять уведомления через (секунд):',
+                'fleet_tab': 'Парк',
+                'fleet_cpu': 'ЦП',
+                'fleet_ram': 'ОЗУ',
+                'fleet_disk': 'Диск',
+                'fleet_offline': 'Не в сети: {error}',
+                'fleet_summary': 'Подключено {connected} из {total} хостов, получено образцов: {samples}',
+                'cgroups_tab': 'Cgroups',
+                'cgroup_name': 'Cgroup',
+                'column_cpu_of_limit': 'ЦП (% от лимита)',
+                'column_cpu_limit': 'Лимит ЦП (ядра)',
+                'column_memory_limit': 'Лимит памяти (МБ)',
+                'column_memory_of_limit': 'Память (% от лимита)',
+                'cgroups_summary': 'Процесс работает в {path}',
+                'cgroups_unavailable': 'cgroup v2 недоступна в этой системе',
+                'resource_view': 'Представление ресурсов:',
+                'view_host': 'Хост',
+                'view_cgroup': 'Своя cgroup',
+                'cgroup_label': 'Cgroup:',
+                'limit': 'Лимит:',
+                'cores': 'ядер',
+                'pressure_tab': 'Нагрузка',
+                'pressure_cpu_title': 'Простой из-за ЦП (% времени)',
+                'pressure_memory_title': 'Простой из-за памяти (% времени)',
+                'pressure_io_title': 'Простой из-за ввода-вывода (% времени)',
+                'pressure_resource': 'Ресурс',
+                'pressure_kind': 'Ожидающие задачи',
+                'pressure_some': 'Некоторые',
+                'pressure_full': 'Все',
+                'pressure_cpu': 'ЦП',
+                'pressure_memory': 'Память',
+                'pressure_io': 'Ввод-вывод',
+                'column_avg10': 'Среднее 10 с (%)',
+                'column_avg60': 'Среднее 60 с (%)',
+                'column_avg300': 'Среднее 300 с (%)',
+                'column_stall': 'Сейчас (%)',
+                'pressure_unavailable': 'Информация о простоях (PSI) недоступна в этой системе',
+                'pressure_threshold': 'Порог нагрузки (% простоя):'
             }
         }
 
@@ -258,13 +969,69 @@ class SystemMonitorApp(QMainWindow):
             }
         }
 
+        self.disk_monitor = DiskMonitor()
+        self.network_monitor = NetworkMonitor()
+        self.disk_io_monitor = DiskIOMonitor()
+        self.sampler = Sampler(disk_monitor=self.disk_monitor, network_monitor=self.network_monitor,
+                               disk_io_monitor=self.disk_io_monitor)
+        self.nic_store = RingBuffer(NIC_CAPACITY)
+        self.selected_interface = None
+        self.core_store = RingBuffer2D(NIC_CAPACITY, self.sampler.logical_cpus)
+        self.process_table = None
+        self.process_bridge = SampleBridge()
+        self.process_bridge.samples_ready.connect(self.on_process_table, Qt.ConnectionType.QueuedConnection)
+        self.process_thread = SamplerThread(ProcessScanner(), self.process_bridge.push, interval=2.0,
+                                            name='ProcessScanner')
+        self.sample_bridge = SampleBridge()
+        self.sample_bridge.samples_ready.connect(self.on_samples, Qt.ConnectionType.QueuedConnection)
+        self.sampler_thread = SamplerThread(
+            self.sampler, self.publish_sample if metrics_server else self.sample_bridge.push, interval=1.0)
+        self.history_bridge = SampleBridge()
+        self.history_bridge.samples_ready.connect(self.on_history_loaded, Qt.ConnectionType.QueuedConnection)
+
+        # Progress bar stylesheets are built once per theme and state, and
+        # only applied to a bar when its state actually changes.
+        self.progress_styles = {
+            name: {
+                'normal': self.progress_stylesheet(theme['progress']),
+                'warning': self.progress_stylesheet(theme['warning'])
+            }
+            for name, theme in self.themes.items()
+        }
+        self.progress_states = {}
+        self.startup.phase('window state')
+
         self.init_ui()
+        self.startup.phase('widgets')
         self.apply_theme(self.current_theme)
         self.update_texts()
+        self.startup.phase('theme and texts')
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_monitor)
-        self.timer.start(1000)
+        self.process_thread.start()
+        if metrics_server is not None:
+            metrics_server.start()
+        if fleet_client is not None:
+            fleet_client.start()
+            # Remote samples are collected once a second, however many
+            # hosts sent something in between.
+            self.fleet_timer = QTimer(self)
+            self.fleet_timer.timeout.connect(self.drain_fleet)
+            self.fleet_timer.start(1000)
+        if attach:
+            self.follow_timer = QTimer(self)
+            self.follow_timer.timeout.connect(self.follow_history)
+            self.follow_timer.start(1000)
+        else:
+            # Before the writer starts, so its rollups are primed with the
+            # imported records and nothing else writes the file meanwhile.
+            if not len(self.history_store):
+                self.import_legacy_history()
+            self.history_writer.start()
+            self.sampler_thread.start()
+        # The history file is read once the event loop runs, on a thread,
+        # so a long history does not hold back the first paint.
+        QTimer.singleShot(0, self.start_history_load)
+        self.startup.phase('threads')
 
     def init_ui(self):
         self.central_widget = QWidget()
@@ -327,7 +1094,8 @@ class SystemMonitorApp(QMainWindow):
                 border-radius: 6px;
             }
         """)
-        self.cpu_graph = GraphWidget()
+        self.cpu_graph = create_graph(self.graph_backend, self.store, 'cpu')
+        self.cpu_heatmap = HeatmapWidget(self.core_store)
         self.cpu_details = QTextEdit()
         self.cpu_details.setReadOnly(True)
         self.cpu_details.setFixedHeight(100)
@@ -358,7 +1126,7 @@ class SystemMonitorApp(QMainWindow):
                 border-radius: 6px;
             }
         """)
-        self.ram_graph = GraphWidget()
+        self.ram_graph = create_graph(self.graph_backend, self.store, 'ram')
         self.ram_details = QTextEdit()
         self.ram_details.setReadOnly(True)
         self.ram_details.setFixedHeight(100)
@@ -389,7 +1157,7 @@ class SystemMonitorApp(QMainWindow):
                 border-radius: 6px;
             }
         """)
-        self.disk_graph = GraphWidget()
+        self.disk_graph = create_graph(self.graph_backend, self.store, 'disk')
         self.disk_details = QTextEdit()
         self.disk_details.setReadOnly(True)
         self.disk_details.setFixedHeight(100)
@@ -416,9 +1184,12 @@ class SystemMonitorApp(QMainWindow):
             }
         """)
 
+        self.progress_bars = [self.cpu_progress, self.ram_progress, self.disk_progress]
+
         self.monitor_layout.addWidget(self.cpu_label)
         self.monitor_layout.addWidget(self.cpu_progress)
         self.monitor_layout.addWidget(self.cpu_graph)
+        self.monitor_layout.addWidget(self.cpu_heatmap)
         self.monitor_layout.addWidget(self.cpu_details)
         self.monitor_layout.addWidget(self.ram_label)
         self.monitor_layout.addWidget(self.ram_progress)
@@ -430,69 +1201,475 @@ class SystemMonitorApp(QMainWindow):
         self.monitor_layout.addWidget(self.disk_details)
         self.monitor_layout.addWidget(self.status_text)
 
+        # History and Settings are filled in when first opened.
         self.history_tab = QWidget()
         self.history_layout = QVBoxLayout(self.history_tab)
-        self.history_scroll = QScrollArea()
-        self.history_scroll.setWidgetResizable(True)
-        self.history_content = QWidget()
-        self.history_grid = QGridLayout(self.history_content)
-        self.history_grid.setSpacing(10)
-        self.history_scroll.setWidget(self.history_content)
-        self.history_scroll.setStyleSheet("""
-            QScrollArea {
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                border-radius: 8px;
-                background: rgba(255, 255, 255, 0.95);
-            }
-        """)
-        self.clear_history_btn = QPushButton()
-        self.clear_history_btn.setFixedHeight(40)
-        self.clear_history_btn.setFont(QFont("Segoe UI", 12))
-        self.clear_history_btn.setStyleSheet("""
-            QPushButton {
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                background: rgba(200, 0, 0, 0.8);
-                color: white;
-            }
-            QPushButton:hover {
-                background: rgba(200, 0, 0, 1.0);
-            }
-        """)
-        self.clear_history_btn.clicked.connect(self.clear_history)
-        self.save_history_btn = QPushButton()
-        self.save_history_btn.setFixedHeight(40)
-        self.save_history_btn.setFont(QFont("Segoe UI", 12))
-        self.save_history_btn.setStyleSheet("""
-            QPushButton {
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                background: rgba(0, 90, 158, 0.8);
-                color: white;
-            }
-            QPushButton:hover {
-                background: rgba(0, 90, 158, 1.0);
-            }
-        """)
-        self.save_history_btn.clicked.connect(self.save_history_to_file)
-        self.history_layout.addWidget(self.history_scroll)
-        self.history_layout.addWidget(self.clear_history_btn)
-        self.history_layout.addWidget(self.save_history_btn)
+        self.history_built = False
+        self.range_store = None
+        self.range_tier = None
+        self.range_bounds = (None, None)
+        self.export = None
+
+        self.disks_tab = QWidget()
+        self.disks_layout = QVBoxLayout(self.disks_tab)
+        self.mounts_table = self.create_table(7)
+        self.disk_io_label = QLabel()
+        self.disk_io_label.setFont(QFont("Segoe UI", 12))
+        self.disk_busy_graph = create_graph(self.graph_backend, self.store, 'disk_busy')
+        self.disk_io_table = self.create_table(7)
+        self.disks_layout.addWidget(self.mounts_table)
+        self.disks_layout.addWidget(self.disk_io_label)
+        self.disks_layout.addWidget(self.disk_busy_graph)
+        self.disks_layout.addWidget(self.disk_io_table)
+
+        self.network_tab = QWidget()
+        self.network_layout = QVBoxLayout(self.network_tab)
+        self.net_sent_graph = create_graph(self.graph_backend, self.store, 'net_sent', y_max=None)
+        self.net_recv_graph = create_graph(self.graph_backend, self.store, 'net_recv', y_max=None)
+        self.network_table = self.create_table(6)
+        self.network_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.network_table.itemSelectionChanged.connect(self.select_interface)
+        self.network_layout.addWidget(self.net_sent_graph)
+        self.network_layout.addWidget(self.net_recv_graph)
+        self.network_layout.addWidget(self.network_table)
+
+        self.processes_tab = QWidget()
+        self.processes_layout = QVBoxLayout(self.processes_tab)
+        self.processes_header = QHBoxLayout()
+        self.sort_label = QLabel()
+        self.sort_label.setFont(QFont("Segoe UI", 12))
+        self.sort_combo = self.create_combo(['', '', ''])
+        self.sort_combo.currentIndexChanged.connect(self.update_processes_ui)
+        self.process_summary_label = QLabel()
+        self.process_summary_label.setStyleSheet("font-size: 12px; color: gray;")
+        self.processes_header.addWidget(self.sort_label)
+        self.processes_header.addWidget(self.sort_combo)
+        self.processes_header.addStretch()
+        self.processes_header.addWidget(self.process_summary_label)
+        self.processes_table = self.create_table(5)
+        self.processes_layout.addLayout(self.processes_header)
+        self.processes_layout.addWidget(self.processes_table)
+
+        self.pressure_tab = QWidget()
+        self.pressure_layout = QVBoxLayout(self.pressure_tab)
+        self.pressure_summary_label = QLabel()
+        self.pressure_summary_label.setStyleSheet("font-size: 12px; color: gray;")
+        self.pressure_cpu_graph = create_graph(self.graph_backend, self.store, 'psi_cpu_some', y_max=None)
+        self.pressure_memory_graph = create_graph(self.graph_backend, self.store, 'psi_memory_some', y_max=None)
+        self.pressure_io_graph = create_graph(self.graph_backend, self.store, 'psi_io_some', y_max=None)
+        self.pressure_table = self.create_table(6)
+        self.pressure_layout.addWidget(self.pressure_summary_label)
+        self.pressure_layout.addWidget(self.pressure_cpu_graph)
+        self.pressure_layout.addWidget(self.pressure_memory_graph)
+        self.pressure_layout.addWidget(self.pressure_io_graph)
+        self.pressure_layout.addWidget(self.pressure_table)
+
+        self.cgroups_tab = QWidget()
+        self.cgroups_layout = QVBoxLayout(self.cgroups_tab)
+        self.cgroups_summary_label = QLabel()
+        self.cgroups_summary_label.setStyleSheet("font-size: 12px; color: gray;")
+        self.cgroups_table = self.create_table(8)
+        self.cgroups_layout.addWidget(self.cgroups_summary_label)
+        self.cgroups_layout.addWidget(self.cgroups_table)
+
+        if self.fleet_client is not None:
+            self.build_fleet_tab()
+
+        self.alerts_tab = QWidget()
+        self.alerts_layout = QVBoxLayout(self.alerts_tab)
+        self.alerts_summary_label = QLabel()
+        self.alerts_summary_label.setStyleSheet("font-size: 12px; color: gray;")
+        self.alerts_table = self.create_table(4)
+        self.alerts_layout.addWidget(self.alerts_summary_label)
+        self.alerts_layout.addWidget(self.alerts_table)
+        self.rendered_transitions = -1
 
         self.settings_tab = QWidget()
         self.settings_layout = QVBoxLayout(self.settings_tab)
         self.settings_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         self.settings_layout.setSpacing(10)
+        self.settings_built = False
 
-        self.language_label = QLabel()
-        self.language_label.setFont(QFont("Segoe UI", 12))
-        self.language_combo = QComboBox()
-        self.language_combo.addItems(['English', 'فارسی', '中文', 'Русский'])
-        self.language_combo.setFixedHeight(40)
-        self.language_combo.setStyleSheet("""
-            QComboBox {
+        self.tabs.addTab(self.monitor_tab, self.texts['en']['monitor_tab'])
+        self.tabs.addTab(self.disks_tab, self.texts['en']['disks_tab'])
+        self.tabs.addTab(self.network_tab, self.texts['en']['network_tab'])
+        self.tabs.addTab(self.processes_tab, self.texts['en']['processes_tab'])
+        self.tabs.addTab(self.pressure_tab, self.texts['en']['pressure_tab'])
+        self.tabs.addTab(self.cgroups_tab, self.texts['en']['cgroups_tab'])
+        if self.fleet_client is not None:
+            self.tabs.addTab(self.fleet_tab, self.texts['en']['fleet_tab'])
+        self.tabs.addTab(self.alerts_tab, self.texts['en']['alerts_tab'])
+        self.tabs.addTab(self.history_tab, self.texts['en']['history_tab'])
+        self.tabs.addTab(self.settings_tab, self.texts['en']['settings_tab'])
+
+        self.panel_renderers = {
+            self.monitor_tab: self.render_monitor_tab,
+            self.disks_tab: self.render_disks_tab,
+            self.network_tab: self.render_network_tab,
+            self.processes_tab: self.update_processes_ui,
+            self.pressure_tab: self.render_pressure_tab,
+            self.cgroups_tab: self.render_cgroups_tab,
+            self.alerts_tab: self.render_alerts_tab,
+            self.history_tab: self.render_history_tab,
+            self.settings_tab: self.update_persistence_stats,
+        }
+        self.tab_builders = {
+            self.history_tab: self.build_history_tab,
+            self.settings_tab: self.build_settings_tab,
+        }
+        if self.fleet_client is not None:
+            self.panel_renderers[self.fleet_tab] = self.render_fleet_tab
+        self.stale_panels = set(self.panel_renderers)
+        self.tabs.currentChanged.connect(self.render_panels)
+
+    def build_fleet_tab(self):
+        from fleet import FLEET_COLUMNS
+
+        self.fleet_tab = QWidget()
+        self.fleet_layout = QVBoxLayout(self.fleet_tab)
+        self.fleet_summary_label = QLabel()
+        self.fleet_summary_label.setStyleSheet("font-size: 12px; color: gray;")
+        self.fleet_grid = FleetGrid(FLEET_COLUMNS)
+        self.fleet_stores = {host: RingBuffer(FLEET_CAPACITY, FLEET_COLUMNS) for host in self.fleet_client.hosts}
+        self.fleet_grid.set_entries([(host, self.fleet_stores[host]) for host in self.fleet_client.hosts])
+        self.fleet_scroll = QScrollArea()
+        self.fleet_scroll.setWidgetResizable(True)
+        self.fleet_scroll.setWidget(self.fleet_grid)
+        self.fleet_layout.addWidget(self.fleet_summary_label)
+        self.fleet_layout.addWidget(self.fleet_scroll)
+
+    def build_history_tab(self):
+        with self.startup.section('build History tab'):
+            self.history_header = QHBoxLayout()
+            self.range_label = QLabel()
+            self.range_label.setFont(QFont("Segoe UI", 12))
+            self.range_combo = self.create_combo([''] * len(HISTORY_RANGES))
+            self.range_combo.currentIndexChanged.connect(self.change_history_range)
+            self.history_metric_combo = self.create_combo([''] * len(PERCENT_COLUMNS))
+            self.history_metric_combo.currentIndexChanged.connect(self.change_history_metric)
+            self.range_summary_label = QLabel()
+            self.range_summary_label.setStyleSheet("font-size: 12px; color: gray;")
+            now = QDateTime.currentDateTime()
+            self.range_start_edit = self.create_datetime_edit(now.addSecs(-3600))
+            self.range_end_edit = self.create_datetime_edit(now)
+            self.range_show_btn = QPushButton()
+            self.range_show_btn.setFixedHeight(40)
+            self.range_show_btn.setFont(QFont("Segoe UI", 12))
+            self.range_show_btn.setStyleSheet("""
+                QPushButton {
+                    border-radius: 8px;
+                    font-size: 14px;
+                    padding: 0 16px;
+                    border: 1px solid rgba(0, 0, 0, 0.1);
+                    background: rgba(0, 90, 158, 0.8);
+                    color: white;
+                }
+                QPushButton:hover {
+                    background: rgba(0, 90, 158, 1.0);
+                }
+            """)
+            self.range_show_btn.clicked.connect(self.show_custom_range)
+            self.history_header.addWidget(self.range_label)
+            self.history_header.addWidget(self.range_combo)
+            self.history_header.addWidget(self.range_start_edit)
+            self.history_header.addWidget(self.range_end_edit)
+            self.history_header.addWidget(self.range_show_btn)
+            self.history_header.addWidget(self.history_metric_combo)
+            self.history_header.addStretch()
+            self.history_header.addWidget(self.range_summary_label)
+            self.history_graph = create_graph(self.graph_backend, self.store, 'cpu', span=LIVE_GRAPH_SPAN)
+            self.history_graph.max_points = LIVE_GRAPH_POINTS
+            self.history_model = HistoryTableModel(self.store, PERCENT_COLUMNS)
+            self.history_view = QTableView()
+            self.history_view.setModel(self.history_model)
+            self.history_view.setItemDelegate(HistoryDelegate(self))
+            self.history_view.setShowGrid(False)
+            self.history_view.setWordWrap(False)
+            self.history_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+            self.history_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            self.history_view.verticalHeader().setVisible(False)
+            # Fixed row heights let the view map scroll positions to rows without
+            # measuring every row.
+            self.history_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+            self.history_view.verticalHeader().setDefaultSectionSize(28)
+            self.history_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+            self.history_view.setStyleSheet("""
+                QTableView {
+                    border: 1px solid rgba(0, 0, 0, 0.1);
+                    border-radius: 8px;
+                    background: rgba(255, 255, 255, 0.95);
+                }
+            """)
+            self.clear_history_btn = QPushButton()
+            self.clear_history_btn.setFixedHeight(40)
+            self.clear_history_btn.setFont(QFont("Segoe UI", 12))
+            self.clear_history_btn.setStyleSheet("""
+                QPushButton {
+                    border-radius: 8px;
+                    font-size: 14px;
+                    border: 1px solid rgba(0, 0, 0, 0.1);
+                    background: rgba(200, 0, 0, 0.8);
+                    color: white;
+                }
+                QPushButton:hover {
+                    background: rgba(200, 0, 0, 1.0);
+                }
+            """)
+            self.clear_history_btn.clicked.connect(self.clear_history)
+            self.save_history_btn = QPushButton()
+            self.save_history_btn.setFixedHeight(40)
+            self.save_history_btn.setFont(QFont("Segoe UI", 12))
+            self.save_history_btn.setStyleSheet("""
+                QPushButton {
+                    border-radius: 8px;
+                    font-size: 14px;
+                    border: 1px solid rgba(0, 0, 0, 0.1);
+                    background: rgba(0, 90, 158, 0.8);
+                    color: white;
+                }
+                QPushButton:hover {
+                    background: rgba(0, 90, 158, 1.0);
+                }
+            """)
+            self.save_history_btn.clicked.connect(self.save_history_to_file)
+            self.export_bridge = ExportBridge(self)
+            self.export_bridge.progress.connect(self.on_export_progress)
+            self.export_bridge.finished.connect(self.on_export_finished)
+            self.export_row = QHBoxLayout()
+            self.export_progress = QProgressBar()
+            self.export_progress.setFixedHeight(30)
+            self.export_progress.setFont(QFont("Segoe UI", 11))
+            self.export_cancel_btn = QPushButton()
+            self.export_cancel_btn.setFixedHeight(30)
+            self.export_cancel_btn.setFont(QFont("Segoe UI", 11))
+            self.export_cancel_btn.setStyleSheet("""
+                QPushButton {
+                    border-radius: 8px;
+                    font-size: 13px;
+                    border: 1px solid rgba(0, 0, 0, 0.1);
+                    background: rgba(200, 0, 0, 0.8);
+                    color: white;
+                    padding: 0 12px;
+                }
+                QPushButton:hover {
+                    background: rgba(200, 0, 0, 1.0);
+                }
+            """)
+            self.export_cancel_btn.clicked.connect(self.cancel_export)
+            self.export_row.addWidget(self.export_progress)
+            self.export_row.addWidget(self.export_cancel_btn)
+            self.export_progress.setVisible(False)
+            self.export_cancel_btn.setVisible(False)
+            self.history_layout.addLayout(self.history_header)
+            self.history_layout.addWidget(self.history_graph)
+            self.history_layout.addWidget(self.history_view)
+            self.history_layout.addWidget(self.clear_history_btn)
+            self.history_layout.addWidget(self.save_history_btn)
+            self.history_layout.addLayout(self.export_row)
+            if self.attach:
+                self.clear_history_btn.setEnabled(False)
+            self.progress_bars.append(self.export_progress)
+            self.set_progress_state(self.export_progress, 'normal')
+            self.history_built = True
+            self.update_history_texts()
+
+    def build_settings_tab(self):
+        with self.startup.section('build Settings tab'):
+            self.language_label = QLabel()
+            self.language_label.setFont(QFont("Segoe UI", 12))
+            self.language_combo = QComboBox()
+            self.language_combo.addItems(['English', 'فارسی', '中文', 'Русский'])
+            self.language_combo.setFixedHeight(40)
+            self.language_combo.setStyleSheet("""
+                QComboBox {
+                    border-radius: 8px;
+                    padding: 8px;
+                    font-size: 14px;
+                    border: 1px solid rgba(0, 0, 0, 0.2);
+                    background: rgba(255, 255, 255, 0.95);
+                    color: black;
+                }
+                QComboBox::drop-down {
+                    border: none;
+                }
+            """)
+            self.language_combo.currentIndexChanged.connect(self.change_language)
+
+            self.theme_label = QLabel()
+            self.theme_label.setFont(QFont("Segoe UI", 12))
+            self.theme_combo = QComboBox()
+            self.theme_combo.addItems(['Windows11', 'Dark', 'Light', 'Red', 'Blue'])
+            self.theme_combo.setFixedHeight(40)
+            self.theme_combo.setStyleSheet("""
+                QComboBox {
+                    border-radius: 8px;
+                    padding: 8px;
+                    font-size: 14px;
+                    border: 1px solid rgba(0, 0, 0, 0.2);
+                    background: rgba(255, 255, 255, 0.95);
+                    color: black;
+                }
+                QComboBox::drop-down {
+                    border: none;
+                }
+            """)
+            self.theme_combo.currentIndexChanged.connect(self.change_theme)
+
+            self.graph_backend_label = QLabel()
+            self.graph_backend_label.setFont(QFont("Segoe UI", 12))
+            self.graph_backend_combo = QComboBox()
+            self.graph_backend_combo.addItems(list(GRAPH_BACKENDS))
+            self.graph_backend_combo.setFixedHeight(40)
+            self.graph_backend_combo.setStyleSheet("""
+                QComboBox {
+                    border-radius: 8px;
+                    padding: 8px;
+                    font-size: 14px;
+                    border: 1px solid rgba(0, 0, 0, 0.2);
+                    background: rgba(255, 255, 255, 0.95);
+                    color: black;
+                }
+                QComboBox::drop-down {
+                    border: none;
+                }
+            """)
+            self.graph_backend_combo.currentIndexChanged.connect(self.change_graph_backend)
+
+            self.resource_view_label = self.create_settings_label()
+            self.resource_view_combo = self.create_combo(['', ''])
+
+            self.refresh_label = QLabel()
+            self.refresh_label.setFont(QFont("Segoe UI", 12))
+            self.refresh_input = QLineEdit("1000")
+            self.refresh_input.setFixedHeight(40)
+            self.refresh_input.setStyleSheet("""
+                QLineEdit {
+                    border-radius: 8px;
+                    padding: 8px;
+                    font-size: 14px;
+                    border: 1px solid rgba(0, 0, 0, 0.2);
+                    background: rgba(255, 255, 255, 0.95);
+                    color: black;
+                }
+            """)
+
+            self.sampling_label = self.create_settings_label()
+            self.sampling_combo = self.create_combo(['', ''])
+            self.sampling_min_label = self.create_settings_label()
+            self.sampling_min_input = self.create_settings_input("100")
+            self.sampling_max_label = self.create_settings_label()
+            self.sampling_max_input = self.create_settings_input("5000")
+
+            self.warning_label = QLabel()
+            self.warning_label.setFont(QFont("Segoe UI", 12))
+            self.warning_input = QLineEdit(str(self.warning_threshold))
+            self.warning_input.setFixedHeight(40)
+            self.warning_input.setStyleSheet("""
+                QLineEdit {
+                    border-radius: 8px;
+                    padding: 8px;
+                    font-size: 14px;
+                    border: 1px solid rgba(0, 0, 0, 0.2);
+                    background: rgba(255, 255, 255, 0.95);
+                    color: black;
+                }
+            """)
+
+            self.alert_duration_label = self.create_settings_label()
+            self.alert_duration_input = self.create_settings_input("5")
+            self.alert_hysteresis_label = self.create_settings_label()
+            self.alert_hysteresis_input = self.create_settings_input("5")
+            self.alert_notify_label = self.create_settings_label()
+            self.alert_notify_input = self.create_settings_input("60")
+            self.pressure_threshold_label = self.create_settings_label()
+            self.pressure_threshold_input = self.create_settings_input("20")
+
+            self.flush_count_label = self.create_settings_label()
+            self.flush_count_input = self.create_settings_input("60")
+            self.flush_interval_label = self.create_settings_label()
+            self.flush_interval_input = self.create_settings_input("10.0")
+            self.persistence_stats_label = QLabel()
+            self.persistence_stats_label.setStyleSheet("font-size: 12px; color: gray;")
+            self.disk_include_label = self.create_settings_label()
+            self.disk_include_input = self.create_settings_input(', '.join(self.disk_monitor.include))
+            self.disk_exclude_label = self.create_settings_label()
+            self.disk_exclude_input = self.create_settings_input(', '.join(self.disk_monitor.exclude))
+            self.net_include_label = self.create_settings_label()
+            self.net_include_input = self.create_settings_input(', '.join(self.network_monitor.include))
+            self.net_exclude_label = self.create_settings_label()
+            self.net_exclude_input = self.create_settings_input(', '.join(self.network_monitor.exclude))
+
+            self.apply_btn = QPushButton()
+            self.apply_btn.setFixedHeight(40)
+            self.apply_btn.setFont(QFont("Segoe UI", 12))
+            self.apply_btn.setStyleSheet("""
+                QPushButton {
+                    border-radius: 8px;
+                    font-size: 14px;
+                    border: 1px solid rgba(0, 0, 0, 0.1);
+                    background: rgba(0, 90, 158, 0.8);
+                    color: white;
+                }
+                QPushButton:hover {
+                    background: rgba(0, 90, 158, 1.0);
+                }
+            """)
+            self.apply_btn.clicked.connect(self.apply_settings)
+
+            self.settings_layout.addWidget(self.language_label)
+            self.settings_layout.addWidget(self.language_combo)
+            self.settings_layout.addWidget(self.theme_label)
+            self.settings_layout.addWidget(self.theme_combo)
+            self.settings_layout.addWidget(self.graph_backend_label)
+            self.settings_layout.addWidget(self.graph_backend_combo)
+            self.settings_layout.addWidget(self.resource_view_label)
+            self.settings_layout.addWidget(self.resource_view_combo)
+            self.settings_layout.addWidget(self.refresh_label)
+            self.settings_layout.addWidget(self.refresh_input)
+            self.settings_layout.addWidget(self.sampling_label)
+            self.settings_layout.addWidget(self.sampling_combo)
+            self.settings_layout.addWidget(self.sampling_min_label)
+            self.settings_layout.addWidget(self.sampling_min_input)
+            self.settings_layout.addWidget(self.sampling_max_label)
+            self.settings_layout.addWidget(self.sampling_max_input)
+            self.settings_layout.addWidget(self.warning_label)
+            self.settings_layout.addWidget(self.warning_input)
+            self.settings_layout.addWidget(self.alert_duration_label)
+            self.settings_layout.addWidget(self.alert_duration_input)
+            self.settings_layout.addWidget(self.alert_hysteresis_label)
+            self.settings_layout.addWidget(self.alert_hysteresis_input)
+            self.settings_layout.addWidget(self.alert_notify_label)
+            self.settings_layout.addWidget(self.alert_notify_input)
+            self.settings_layout.addWidget(self.pressure_threshold_label)
+            self.settings_layout.addWidget(self.pressure_threshold_input)
+            self.settings_layout.addWidget(self.flush_count_label)
+            self.settings_layout.addWidget(self.flush_count_input)
+            self.settings_layout.addWidget(self.flush_interval_label)
+            self.settings_layout.addWidget(self.flush_interval_input)
+            self.settings_layout.addWidget(self.persistence_stats_label)
+            self.settings_layout.addWidget(self.disk_include_label)
+            self.settings_layout.addWidget(self.disk_include_input)
+            self.settings_layout.addWidget(self.disk_exclude_label)
+            self.settings_layout.addWidget(self.disk_exclude_input)
+            self.settings_layout.addWidget(self.net_include_label)
+            self.settings_layout.addWidget(self.net_include_input)
+            self.settings_layout.addWidget(self.net_exclude_label)
+            self.settings_layout.addWidget(self.net_exclude_input)
+            self.settings_layout.addWidget(self.apply_btn)
+            self.settings_layout.addStretch()
+            self.settings_built = True
+            self.update_settings_texts()
+
+    def create_settings_label(self):
+        label = QLabel()
+        label.setFont(QFont("Segoe UI", 12))
+        return label
+
+    def create_settings_input(self, text):
+        line_edit = QLineEdit(text)
+        line_edit.setFixedHeight(40)
+        line_edit.setStyleSheet("""
+            QLineEdit {
                 border-radius: 8px;
                 padding: 8px;
                 font-size: 14px;
@@ -500,18 +1677,14 @@ class SystemMonitorApp(QMainWindow):
                 background: rgba(255, 255, 255, 0.95);
                 color: black;
             }
-            QComboBox::drop-down {
-                border: none;
-            }
         """)
-        self.language_combo.currentIndexChanged.connect(self.change_language)
-
-        self.theme_label = QLabel()
-        self.theme_label.setFont(QFont("Segoe UI", 12))
-        self.theme_combo = QComboBox()
-        self.theme_combo.addItems(['Windows11', 'Dark', 'Light', 'Red', 'Blue'])
-        self.theme_combo.setFixedHeight(40)
-        self.theme_combo.setStyleSheet("""
+        return line_edit
+
+    def create_combo(self, items):
+        combo = QComboBox()
+        combo.addItems(items)
+        combo.setFixedHeight(40)
+        combo.setStyleSheet("""
             QComboBox {
                 border-radius: 8px;
                 padding: 8px;
@@ -524,14 +1697,15 @@ class SystemMonitorApp(QMainWindow):
                 border: none;
             }
         """)
-        self.theme_combo.currentIndexChanged.connect(self.change_theme)
+        return combo
 
-        self.refresh_label = QLabel()
-        self.refresh_label.setFont(QFont("Segoe UI", 12))
-        self.refresh_input = QLineEdit("1000")
-        self.refresh_input.setFixedHeight(40)
-        self.refresh_input.setStyleSheet("""
-            QLineEdit {
+    def create_datetime_edit(self, value):
+        edit = QDateTimeEdit(value)
+        edit.setCalendarPopup(True)
+        edit.setDisplayFormat("yyyy-MM-dd HH:mm")
+        edit.setFixedHeight(40)
+        edit.setStyleSheet("""
+            QDateTimeEdit {
                 border-radius: 8px;
                 padding: 8px;
                 font-size: 14px;
@@ -540,56 +1714,67 @@ class SystemMonitorApp(QMainWindow):
                 color: black;
             }
         """)
+        return edit
 
-        self.warning_label = QLabel()
-        self.warning_label.setFont(QFont("Segoe UI", 12))
-        self.warning_input = QLineEdit(str(self.warning_threshold))
-        self.warning_input.setFixedHeight(40)
-        self.warning_input.setStyleSheet("""
-            QLineEdit {
+    def progress_stylesheet(self, color):
+        return f"""
+            QProgressBar {{
                 border-radius: 8px;
-                padding: 8px;
                 font-size: 14px;
                 border: 1px solid rgba(0, 0, 0, 0.2);
                 background: rgba(255, 255, 255, 0.95);
                 color: black;
-            }
-        """)
+            }}
+            QProgressBar::chunk {{
+                background-color: {color.name()};
+                border-radius: 6px;
+            }}
+        """
 
-        self.apply_btn = QPushButton()
-        self.apply_btn.setFixedHeight(40)
-        self.apply_btn.setFont(QFont("Segoe UI", 12))
-        self.apply_btn.setStyleSheet("""
-            QPushButton {
-                border-radius: 8px;
-                font-size: 14px;
+    def set_progress_state(self, bar, state):
+        if self.progress_states.get(bar) == state:
+            return
+        self.progress_states[bar] = state
+        bar.setStyleSheet(self.progress_styles[self.current_theme][state])
+        self.profiler.style_applications += 1
+
+    def create_table(self, columns):
+        table = QTableWidget(0, columns)
+        table.setShowGrid(False)
+        table.setWordWrap(False)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.verticalHeader().setVisible(False)
+        table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        table.verticalHeader().setDefaultSectionSize(28)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.setStyleSheet("""
+            QTableWidget {
                 border: 1px solid rgba(0, 0, 0, 0.1);
-                background: rgba(0, 90, 158, 0.8);
-                color: white;
-            }
-            QPushButton:hover {
-                background: rgba(0, 90, 158, 1.0);
+                border-radius: 8px;
+                background: rgba(255, 255, 255, 0.95);
             }
         """)
-        self.apply_btn.clicked.connect(self.apply_settings)
-
-        self.settings_layout.addWidget(self.language_label)
-        self.settings_layout.addWidget(self.language_combo)
-        self.settings_layout.addWidget(self.theme_label)
-        self.settings_layout.addWidget(self.theme_combo)
-        self.settings_layout.addWidget(self.refresh_label)
-        self.settings_layout.addWidget(self.refresh_input)
-        self.settings_layout.addWidget(self.warning_label)
-        self.settings_layout.addWidget(self.warning_input)
-        self.settings_layout.addWidget(self.apply_btn)
-        self.settings_layout.addStretch()
-
-        self.tabs.addTab(self.monitor_tab, self.texts['en']['monitor_tab'])
-        self.tabs.addTab(self.history_tab, self.texts['en']['history_tab'])
-        self.tabs.addTab(self.settings_tab, self.texts['en']['settings_tab'])
+        return table
 
-        self.update_monitor()
-        self.update_history_ui()
+    def set_table_rows(self, table, rows, warning_rows=()):
+        # Items are reused across ticks; only their text changes, and the
+        # warning background only when a row crosses the threshold.
+        if table.rowCount() != len(rows):
+            table.setRowCount(len(rows))
+        warning = QBrush(self.themes[self.current_theme]['warning'])
+        for row, values in enumerate(rows):
+            flagged = row in warning_rows
+            for column, text in enumerate(values):
+                item = table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem(text)
+                    table.setItem(row, column, item)
+                elif item.text() != text:
+                    item.setText(text)
+                if item.data(Qt.ItemDataRole.UserRole) != flagged:
+                    item.setData(Qt.ItemDataRole.UserRole, flagged)
+                    item.setBackground(warning if flagged else QBrush())
 
     def apply_theme(self, theme_name):
         palette = QPalette()
@@ -604,45 +1789,8 @@ class SystemMonitorApp(QMainWindow):
         palette.setColor(QPalette.ColorRole.Text, theme['text'])
         self.setPalette(palette)
         self.setStyle(QStyleFactory.create('WindowsVista' if theme_name == 'Windows11' else 'Fusion'))
-        self.cpu_progress.setStyleSheet(f"""
-            QProgressBar {{
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-                background: rgba(255, 255, 255, 0.95);
-                color: black;
-            }}
-            QProgressBar::chunk {{
-                background-color: {theme['progress'].name()};
-                border-radius: 6px;
-            }}
-        """)
-        self.ram_progress.setStyleSheet(f"""
-            QProgressBar {{
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-                background: rgba(255, 255, 255, 0.95);
-                color: black;
-            }}
-            QProgressBar::chunk {{
-                background-color: {theme['progress'].name()};
-                border-radius: 6px;
-            }}
-        """)
-        self.disk_progress.setStyleSheet(f"""
-            QProgressBar {{
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-                background: rgba(255, 255, 255, 0.95);
-                color: black;
-            }}
-            QProgressBar::chunk {{
-                background-color: {theme['progress'].name()};
-                border-radius: 6px;
-            }}
-        """)
+        for bar in self.progress_bars:
+            self.set_progress_state(bar, self.progress_states.pop(bar, 'normal'))
         self.cpu_details.setStyleSheet(f"""
             QTextEdit {{
                 border-radius: 8px;
@@ -682,41 +1830,155 @@ class SystemMonitorApp(QMainWindow):
 
     def update_texts(self):
         lang = self.current_lang
-        self.setWindowTitle(self.texts[lang]['title'])
+        if self.attach:
+            self.setWindowTitle(self.texts[lang]['read_only_title'].format(
+                title=self.texts[lang]['title'], path=self.attach))
+        else:
+            self.setWindowTitle(self.texts[lang]['title'])
         self.cpu_label.setText(self.texts[lang]['cpu_label'])
         self.ram_label.setText(self.texts[lang]['ram_label'])
         self.disk_label.setText(self.texts[lang]['disk_label'])
-        self.refresh_label.setText(self.texts[lang]['refresh_label'])
-        self.theme_label.setText(self.texts[lang]['theme_label'])
-        self.language_label.setText(self.texts[lang]['language_label'])
-        self.clear_history_btn.setText(self.texts[lang]['clear_history'])
-        self.save_history_btn.setText(self.texts[lang]['save_history'])
-        self.apply_btn.setText(self.texts[lang]['apply'])
         self.status_text.setText(self.texts[lang]['status_idle'])
-        self.warning_label.setText(self.texts[lang]['warning_threshold'])
+        self.disk_io_label.setText(self.texts[lang]['disk_io_label'])
+        self.disk_io_table.setHorizontalHeaderLabels([
+            self.texts[lang]['device'], self.texts[lang]['column_read'], self.texts[lang]['column_write'],
+            self.texts[lang]['column_read_iops'], self.texts[lang]['column_write_iops'],
+            self.texts[lang]['column_await'], self.texts[lang]['column_busy']
+        ])
+        self.network_table.setHorizontalHeaderLabels([
+            self.texts[lang]['interface'], self.texts[lang]['column_sent'], self.texts[lang]['column_recv'],
+            self.texts[lang]['column_packets_sent'], self.texts[lang]['column_packets_recv'],
+            self.texts[lang]['column_errors']
+        ])
+        self.sort_label.setText(self.texts[lang]['sort_by'])
+        for index, key in enumerate(['sort_cpu', 'sort_memory', 'sort_io']):
+            self.sort_combo.setItemText(index, self.texts[lang][key])
+        self.processes_table.setHorizontalHeaderLabels([
+            self.texts[lang]['pid'], self.texts[lang]['process_name'], self.texts[lang]['column_cpu'],
+            self.texts[lang]['column_memory'], self.texts[lang]['column_io']
+        ])
+        self.pressure_table.setHorizontalHeaderLabels([
+            self.texts[lang]['pressure_resource'], self.texts[lang]['pressure_kind'],
+            self.texts[lang]['column_avg10'], self.texts[lang]['column_avg60'], self.texts[lang]['column_avg300'],
+            self.texts[lang]['column_stall']
+        ])
+        self.cgroups_table.setHorizontalHeaderLabels([
+            self.texts[lang]['cgroup_name'], self.texts[lang]['column_cpu_of_limit'],
+            self.texts[lang]['column_cpu_limit'], self.texts[lang]['column_memory'],
+            self.texts[lang]['column_memory_limit'], self.texts[lang]['column_memory_of_limit'],
+            self.texts[lang]['column_read'], self.texts[lang]['column_write']
+        ])
+        self.alerts_table.setHorizontalHeaderLabels([
+            self.texts[lang]['alert_time'], self.texts[lang]['alert_rule'], self.texts[lang]['alert_state'],
+            self.texts[lang]['alert_value']
+        ])
+        # State names in the alert log are translated when it is drawn.
+        self.rendered_transitions = -1
+        self.mounts_table.setHorizontalHeaderLabels([
+            self.texts[lang]['mount_point'], self.texts[lang]['device'], self.texts[lang]['fstype'],
+            self.texts[lang]['column_total'], self.texts[lang]['column_used'], self.texts[lang]['column_free'],
+            self.texts[lang]['column_percent']
+        ])
         self.file_menu.setTitle(self.texts[lang]['file_menu'])
         self.exit_action.setText(self.texts[lang]['exit_action'])
         self.about_action.setText(self.texts[lang]['about'])
 
-        self.tabs.setTabText(0, self.texts[lang]['monitor_tab'])
-        self.tabs.setTabText(1, self.texts[lang]['history_tab'])
-        self.tabs.setTabText(2, self.texts[lang]['settings_tab'])
+        self.tabs.setTabText(self.tabs.indexOf(self.monitor_tab), self.texts[lang]['monitor_tab'])
+        self.tabs.setTabText(self.tabs.indexOf(self.disks_tab), self.texts[lang]['disks_tab'])
+        self.tabs.setTabText(self.tabs.indexOf(self.network_tab), self.texts[lang]['network_tab'])
+        self.tabs.setTabText(self.tabs.indexOf(self.processes_tab), self.texts[lang]['processes_tab'])
+        self.tabs.setTabText(self.tabs.indexOf(self.pressure_tab), self.texts[lang]['pressure_tab'])
+        self.tabs.setTabText(self.tabs.indexOf(self.cgroups_tab), self.texts[lang]['cgroups_tab'])
+        self.tabs.setTabText(self.tabs.indexOf(self.alerts_tab), self.texts[lang]['alerts_tab'])
+        if self.fleet_client is not None:
+            self.tabs.setTabText(self.tabs.indexOf(self.fleet_tab), self.texts[lang]['fleet_tab'])
+            self.fleet_grid.labels = {'cpu': self.texts[lang]['fleet_cpu'], 'ram': self.texts[lang]['fleet_ram'],
+                                      'disk': self.texts[lang]['fleet_disk']}
+            self.fleet_grid.offline_text = self.texts[lang]['fleet_offline']
+            self.fleet_grid.update()
+        self.tabs.setTabText(self.tabs.indexOf(self.history_tab), self.texts[lang]['history_tab'])
+        self.tabs.setTabText(self.tabs.indexOf(self.settings_tab), self.texts[lang]['settings_tab'])
 
         alignment = Qt.AlignmentFlag.AlignRight if lang == 'fa' else Qt.AlignmentFlag.AlignLeft
         self.cpu_label.setAlignment(alignment)
         self.ram_label.setAlignment(alignment)
         self.disk_label.setAlignment(alignment)
-        self.refresh_label.setAlignment(alignment)
-        self.theme_label.setAlignment(alignment)
-        self.language_label.setAlignment(alignment)
-        self.warning_label.setAlignment(alignment)
+        self.disk_io_label.setAlignment(alignment)
+        self.pressure_summary_label.setAlignment(alignment)
+        self.cgroups_summary_label.setAlignment(alignment)
         self.cpu_details.setAlignment(alignment)
         self.ram_details.setAlignment(alignment)
         self.disk_details.setAlignment(alignment)
         self.status_text.setAlignment(alignment)
 
-        self.update_monitor()
-        self.update_history_ui()
+        if self.history_built:
+            self.update_history_texts()
+        if self.settings_built:
+            self.update_settings_texts()
+        self.refresh_panels()
+
+    def update_history_texts(self):
+        lang = self.current_lang
+        self.range_label.setText(self.texts[lang]['range_label'])
+        self.range_show_btn.setText(self.texts[lang]['range_show'])
+        for index, key in enumerate(['range_live', 'range_hour', 'range_day', 'range_week', 'range_month',
+                                     'range_custom']):
+            self.range_combo.setItemText(index, self.texts[lang][key])
+        for index, key in enumerate(['history_cpu', 'history_ram', 'history_disk', 'history_disk_busy']):
+            self.history_metric_combo.setItemText(index, self.texts[lang][key])
+        self.clear_history_btn.setText(self.texts[lang]['clear_history'])
+        self.save_history_btn.setText(self.texts[lang]['save_history'])
+        self.export_cancel_btn.setText(self.texts[lang]['export_cancel'])
+        self.export_progress.setFormat(self.texts[lang]['export_progress'])
+
+    def update_settings_texts(self):
+        lang = self.current_lang
+        self.refresh_label.setText(self.texts[lang]['refresh_label'])
+        self.theme_label.setText(self.texts[lang]['theme_label'])
+        self.language_label.setText(self.texts[lang]['language_label'])
+        self.graph_backend_label.setText(self.texts[lang]['graph_backend'])
+        self.resource_view_label.setText(self.texts[lang]['resource_view'])
+        for index, key in enumerate(['view_host', 'view_cgroup']):
+            self.resource_view_combo.setItemText(index, self.texts[lang][key])
+        self.sampling_label.setText(self.texts[lang]['sampling_label'])
+        self.sampling_min_label.setText(self.texts[lang]['sampling_min'])
+        self.sampling_max_label.setText(self.texts[lang]['sampling_max'])
+        for index, key in enumerate(['sampling_fixed', 'sampling_adaptive']):
+            self.sampling_combo.setItemText(index, self.texts[lang][key])
+        self.warning_label.setText(self.texts[lang]['warning_threshold'])
+        self.alert_duration_label.setText(self.texts[lang]['alert_duration'])
+        self.alert_hysteresis_label.setText(self.texts[lang]['alert_hysteresis'])
+        self.alert_notify_label.setText(self.texts[lang]['alert_notify'])
+        self.pressure_threshold_label.setText(self.texts[lang]['pressure_threshold'])
+        self.flush_count_label.setText(self.texts[lang]['flush_count'])
+        self.flush_interval_label.setText(self.texts[lang]['flush_interval'])
+        self.disk_include_label.setText(self.texts[lang]['disk_include'])
+        self.disk_exclude_label.setText(self.texts[lang]['disk_exclude'])
+        self.net_include_label.setText(self.texts[lang]['net_include'])
+        self.net_exclude_label.setText(self.texts[lang]['net_exclude'])
+        self.apply_btn.setText(self.texts[lang]['apply'])
+
+        alignment = Qt.AlignmentFlag.AlignRight if lang == 'fa' else Qt.AlignmentFlag.AlignLeft
+        self.refresh_label.setAlignment(alignment)
+        self.sampling_label.setAlignment(alignment)
+        self.sampling_min_label.setAlignment(alignment)
+        self.sampling_max_label.setAlignment(alignment)
+        self.theme_label.setAlignment(alignment)
+        self.language_label.setAlignment(alignment)
+        self.graph_backend_label.setAlignment(alignment)
+        self.resource_view_label.setAlignment(alignment)
+        self.warning_label.setAlignment(alignment)
+        self.alert_duration_label.setAlignment(alignment)
+        self.alert_hysteresis_label.setAlignment(alignment)
+        self.alert_notify_label.setAlignment(alignment)
+        self.pressure_threshold_label.setAlignment(alignment)
+        self.flush_count_label.setAlignment(alignment)
+        self.flush_interval_label.setAlignment(alignment)
+        self.persistence_stats_label.setAlignment(alignment)
+        self.disk_include_label.setAlignment(alignment)
+        self.disk_exclude_label.setAlignment(alignment)
+        self.net_include_label.setAlignment(alignment)
+        self.net_exclude_label.setAlignment(alignment)
 
     def change_language(self, index):
         langs = ['en', 'fa', 'zh', 'ru']
@@ -728,44 +1990,375 @@ class SystemMonitorApp(QMainWindow):
         self.current_theme = themes[index]
         self.apply_theme(self.current_theme)
 
+    def change_graph_backend(self, index):
+        backend = self.graph_backend_combo.itemText(index)
+        if backend == self.graph_backend:
+            return
+        self.graph_backend = backend
+        graphs = [('cpu_graph', self.monitor_layout), ('ram_graph', self.monitor_layout),
+                  ('disk_graph', self.monitor_layout), ('disk_busy_graph', self.disks_layout),
+                  ('net_sent_graph', self.network_layout), ('net_recv_graph', self.network_layout),
+                  ('pressure_cpu_graph', self.pressure_layout), ('pressure_memory_graph', self.pressure_layout),
+                  ('pressure_io_graph', self.pressure_layout)]
+        if self.history_built:
+            graphs.append(('history_graph', self.history_layout))
+        for name, layout in graphs:
+            old_graph = getattr(self, name)
+            new_graph = create_graph(backend, old_graph.store, old_graph.column, y_max=old_graph.y_max,
+                                     span=old_graph.span)
+            new_graph.max_points = old_graph.max_points
+            layout.replaceWidget(old_graph, new_graph)
+            old_graph.deleteLater()
+            setattr(self, name, new_graph)
+        self.refresh_panels()
+
+    def create_alert_engine(self):
+        # Rules come from ALERT_RULES_FILE when there is one; otherwise one
+        # rule per gauge follows the warning threshold set in Settings.
+        if os.path.exists(ALERT_RULES_FILE):
+            try:
+                return AlertEngine(load_rules(ALERT_RULES_FILE), METRIC_COLUMNS), True
+            except (OSError, ValueError) as error:
+                print(f"alerts: {error}; using the default rules", file=sys.stderr)
+        return AlertEngine(self.default_alert_rules(), METRIC_COLUMNS), False
+
+    def default_alert_rules(self):
+        rules = default_rules(self.warning_threshold, self.alert_duration, self.alert_hysteresis,
+                              self.pressure_threshold)
+        return [rule._replace(metric=self.view_columns.get(rule.metric, rule.metric)) for rule in rules]
+
     def apply_settings(self):
         try:
-            refresh_rate = int(self.refresh_input.text())
-            self.timer.setInterval(max(100, refresh_rate))
+            refresh_rate = max(100, int(self.refresh_input.text()))
         except ValueError:
+            refresh_rate = 1000
             self.refresh_input.setText("1000")
-            self.timer.setInterval(1000)
         try:
             self.warning_threshold = int(self.warning_input.text())
         except ValueError:
             self.warning_threshold = 80
             self.warning_input.setText("80")
+        try:
+            self.alert_duration = max(0.0, float(self.alert_duration_input.text()))
+            self.alert_hysteresis = max(0.0, float(self.alert_hysteresis_input.text()))
+            self.alerts.notify_interval = max(0.0, float(self.alert_notify_input.text()))
+        except ValueError:
+            self.alert_duration, self.alert_hysteresis, self.alerts.notify_interval = 5.0, 5.0, 60.0
+            self.alert_duration_input.setText("5")
+            self.alert_hysteresis_input.setText("5")
+            self.alert_notify_input.setText("60")
+        try:
+            self.pressure_threshold = max(0.0, float(self.pressure_threshold_input.text()))
+        except ValueError:
+            self.pressure_threshold = 20.0
+            self.pressure_threshold_input.setText("20")
+        view = CGROUP_VIEW if self.resource_view_combo.currentIndex() == 1 else HOST_VIEW
+        if view != self.view_columns:
+            self.view_columns = dict(view)
+            self.cpu_graph.bind(self.store, view['cpu'])
+            self.ram_graph.bind(self.store, view['ram'])
+        if not self.custom_alert_rules:
+            self.alerts.set_rules(self.default_alert_rules())
+        schedule = None
+        if self.sampling_combo.currentIndex() == 1:
+            try:
+                min_interval = max(100, int(self.sampling_min_input.text()))
+                max_interval = max(min_interval, int(self.sampling_max_input.text()))
+            except ValueError:
+                min_interval, max_interval = 100, 5000
+                self.sampling_min_input.setText("100")
+                self.sampling_max_input.setText("5000")
+            # Fast while metrics move or sit near the warning threshold,
+            # backing off to max_interval while the system is steady.
+            schedule = AdaptiveInterval(min_interval / 1000, max_interval / 1000, self.warning_threshold)
+        if self.attach:
+            self.follow_timer.setInterval(refresh_rate)
+        elif schedule is not None:
+            self.sampler_thread.set_interval(schedule.min_interval, schedule)
+        else:
+            self.sampler_thread.set_interval(refresh_rate / 1000)
+        try:
+            flush_count = max(1, int(self.flush_count_input.text()))
+            flush_interval = max(0.1, float(self.flush_interval_input.text()))
+        except ValueError:
+            flush_count, flush_interval = 60, 10.0
+            self.flush_count_input.setText("60")
+            self.flush_interval_input.setText("10.0")
+        if self.history_writer is not None:
+            self.history_writer.set_policy(flush_count, flush_interval)
+        self.disk_monitor.set_filters(parse_patterns(self.disk_include_input.text()),
+                                      parse_patterns(self.disk_exclude_input.text()))
+        self.network_monitor.set_filters(parse_patterns(self.net_include_input.text()),
+                                         parse_patterns(self.net_exclude_input.text()))
         self.update_texts()
         self.apply_theme(self.current_theme)
-        self.update_monitor()
 
     def show_about(self):
         QMessageBox.information(self, self.texts[self.current_lang]['about'], 
                                self.texts[self.current_lang]['about_text'])
 
-    def update_monitor(self):
-        cpu_usage = psutil.cpu_percent(interval=1)
-        ram = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.render_panels()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.render_panels()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.render_panels()
+
+    def closeEvent(self, event):
+        if self.export is not None:
+            self.export.cancel()
+            self.export.join()
+        self.sampler_thread.stop()
+        self.process_thread.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if self.fleet_client is not None:
+            self.fleet_client.stop()
+        self.disk_monitor.close()
+        self.sampler.cgroup_monitor.close()
+        self.sampler.pressure_monitor.close()
+        if self.history_writer is not None:
+            self.history_writer.stop()
+        self.history_store.close()
+        if self.rollups is not None:
+            self.rollups.close()
+        super().closeEvent(event)
+
+    def publish_sample(self, snapshot):
+        # Called on the sampler thread, so the endpoint stays current even
+        # while the GUI is busy.
+        self.metrics_server.publish(snapshot)
+        self.sample_bridge.push(snapshot)
+
+    def on_samples(self):
+        snapshots = self.sample_bridge.drain()
+        if not snapshots:
+            return
+        with self.profiler.section('record'):
+            for snapshot in snapshots:
+                timestamp = int(snapshot.timestamp * 1000)
+                metrics = snapshot_metrics(snapshot)
+                self.store.append(timestamp, metrics)
+                self.core_store.append(timestamp, snapshot.per_cpu)
+                self.record_interfaces(timestamp, snapshot.net)
+                self.history_writer.append(timestamp, metrics)
+                self.check_alerts(timestamp, metrics)
+            self.last_snapshot = snapshots[-1]
+        self.refresh_panels()
+        self.profiler.end_tick()
+
+    def check_alerts(self, timestamp, metrics):
+        # Evaluated for every sample, whichever tab is on screen; the
+        # engine has already rate-limited what comes back.
+        if self.alerts.evaluate(timestamp, metrics):
+            QApplication.alert(self)
+
+    def visible_panel(self):
+        """The tab page on screen, or None while the window is minimized or hidden."""
+        if self.isMinimized() or not self.isVisible():
+            return None
+        return self.tabs.currentWidget()
+
+    def refresh_panels(self):
+        self.stale_panels.update(self.panel_renderers)
+        self.render_panels()
+
+    def render_panels(self):
+        # Samples are always recorded, but only the tab on screen is drawn.
+        # A tab that was hidden catches up from the stores in one redraw
+        # when it is shown again.
+        panel = self.visible_panel()
+        builder = self.tab_builders.pop(panel, None)
+        if builder is not None:
+            builder()
+            self.stale_panels.add(panel)
+        # Process scans only feed their own tab.
+        if panel is self.processes_tab:
+            self.process_thread.resume()
+        else:
+            self.process_thread.pause()
+        if panel in self.stale_panels:
+            self.stale_panels.discard(panel)
+            self.panel_renderers[panel]()
 
-        self.cpu_progress.setValue(int(cpu_usage))
-        self.ram_progress.setValue(int(ram.percent))
-        self.disk_progress.setValue(int(disk.percent))
+    def render_monitor_tab(self):
+        lang = self.current_lang
+        with self.profiler.section('graphs'):
+            self.cpu_graph.draw_graph(self.texts[lang]['cpu_label'])
+            self.ram_graph.draw_graph(self.texts[lang]['ram_label'])
+            self.disk_graph.draw_graph(self.texts[lang]['disk_label'])
+            self.cpu_heatmap.draw_graph(self.texts[lang]['per_core_title'])
+        self.update_monitor()
+
+    def render_disks_tab(self):
+        with self.profiler.section('disks'):
+            self.disk_busy_graph.draw_graph(self.texts[self.current_lang]['disk_busy_title'])
+            if self.last_snapshot is not None:
+                self.update_disks_ui()
+
+    def render_network_tab(self):
+        lang = self.current_lang
+        with self.profiler.section('network'):
+            suffix = f" - {self.selected_interface}" if self.selected_interface else ""
+            self.net_sent_graph.draw_graph(self.texts[lang]['net_sent_title'] + suffix)
+            self.net_recv_graph.draw_graph(self.texts[lang]['net_recv_title'] + suffix)
+            if self.last_snapshot is not None:
+                self.update_network_ui()
+
+    def render_history_tab(self):
+        with self.profiler.section('history'):
+            self.history_graph.draw_graph(self.history_metric_combo.currentText())
+            self.update_history_ui()
 
-        self.cpu_graph.update_graph(cpu_usage, self.texts[self.current_lang]['cpu_label'])
-        self.ram_graph.update_graph(ram.percent, self.texts[self.current_lang]['ram_label'])
-        self.disk_graph.update_graph(disk.percent, self.texts[self.current_lang]['disk_label'])
+    def drain_fleet(self):
+        for host, timestamps, columns in self.fleet_client.drain():
+            self.fleet_stores[host].extend(timestamps, columns)
+        # Connection states change without samples, so the tab is redrawn
+        # on every drain while it is on screen.
+        self.stale_panels.add(self.fleet_tab)
+        self.render_panels()
+
+    def render_fleet_tab(self):
+        hosts = self.fleet_client.hosts
+        self.fleet_summary_label.setText(self.texts[self.current_lang]['fleet_summary'].format(
+            connected=sum(host.connected for host in hosts), total=len(hosts),
+            samples=sum(host.samples for host in hosts)))
+        self.fleet_grid.warning_threshold = self.warning_threshold
+        self.fleet_grid.draw_graph()
+
+    def render_pressure_tab(self):
+        lang = self.current_lang
+        with self.profiler.section('pressure'):
+            self.pressure_cpu_graph.draw_graph(self.texts[lang]['pressure_cpu_title'])
+            self.pressure_memory_graph.draw_graph(self.texts[lang]['pressure_memory_title'])
+            self.pressure_io_graph.draw_graph(self.texts[lang]['pressure_io_title'])
+            if not self.sampler.pressure_monitor.available:
+                self.pressure_summary_label.setText(self.texts[lang]['pressure_unavailable'])
+                return
+            if self.last_snapshot is None:
+                return
+            rows = []
+            stalled_rows = set()
+            for row, stall in enumerate(self.last_snapshot.pressure):
+                rows.append([self.texts[lang]['pressure_' + stall.resource], self.texts[lang]['pressure_' + stall.kind],
+                             f"{stall.avg10:.2f}", f"{stall.avg60:.2f}", f"{stall.avg300:.2f}",
+                             '-' if stall.stall is None else f"{stall.stall:.2f}"])
+                if stall.stall is not None and stall.stall > self.pressure_threshold:
+                    stalled_rows.add(row)
+            self.set_table_rows(self.pressure_table, rows, stalled_rows)
+
+    def render_cgroups_tab(self):
+        lang = self.current_lang
+        monitor = self.sampler.cgroup_monitor
+        if not monitor.available:
+            self.cgroups_summary_label.setText(self.texts[lang]['cgroups_unavailable'])
+            return
+        self.cgroups_summary_label.setText(self.texts[lang]['cgroups_summary'].format(path=monitor.own.name))
+        snapshot = self.last_snapshot
+        if snapshot is None:
+            return
+        rows = []
+        warning_rows = set()
+        for row, usage in enumerate((snapshot.cgroup,) + snapshot.cgroups):
+            rows.append([
+                usage.name, '-' if usage.cpu_percent is None else f"{usage.cpu_percent:.1f}",
+                f"{usage.cpu_limit:.2f}",
+                '-' if usage.memory_used is None else f"{usage.memory_used / (1024**2):.1f}",
+                f"{usage.memory_limit / (1024**2):.0f}",
+                '-' if usage.memory_percent is None else f"{usage.memory_percent:.1f}",
+                '-' if usage.io_read is None else f"{usage.io_read:.2f}",
+                '-' if usage.io_write is None else f"{usage.io_write:.2f}",
+            ])
+            if max(usage.cpu_percent or 0, usage.memory_percent or 0) > self.warning_threshold:
+                warning_rows.add(row)
+        self.set_table_rows(self.cgroups_table, rows, warning_rows)
+
+    def render_alerts_tab(self):
+        alerts = self.alerts
+        # The log and its counters only change when an alert fires or resolves.
+        if alerts.transitions == self.rendered_transitions:
+            return
+        self.rendered_transitions = alerts.transitions
+        lang = self.current_lang
+        self.alerts_summary_label.setText(self.texts[lang]['alerts_summary'].format(
+            active=len(alerts.active()), notified=alerts.notifications, suppressed=alerts.suppressed))
+        rows = []
+        firing_rows = set()
+        for row, event in enumerate(reversed(alerts.log)):
+            rows.append([datetime.fromtimestamp(event.timestamp / 1000).strftime("%Y-%m-%d %H:%M:%S"),
+                         event.rule.name, self.texts[lang]['alert_' + event.state], f"{event.value:.1f}"])
+            if event.state == FIRING:
+                firing_rows.add(row)
+        self.set_table_rows(self.alerts_table, rows, firing_rows)
+
+    def record_interfaces(self, timestamp, rates):
+        values = {}
+        for nic in rates:
+            values['sent:' + nic.name] = nic.sent
+            values['recv:' + nic.name] = nic.recv
+        for name in values.keys() - self.nic_store.columns.keys():
+            self.nic_store.add_column(name)
+        self.nic_store.append(timestamp, values)
+        # Columns of interfaces that went away (or were filtered out) are
+        # dropped once they have scrolled out of the graphs.
+        window = self.net_sent_graph.max_points
+        for name in [name for name in self.nic_store.columns if name not in values]:
+            if np.isnan(self.nic_store.view(name, window)).all():
+                self.nic_store.remove_column(name)
+                if name == 'sent:' + str(self.selected_interface):
+                    self.bind_interface_graphs(None)
+
+    def bind_interface_graphs(self, name):
+        self.selected_interface = name
+        if name is None:
+            self.net_sent_graph.bind(self.store, 'net_sent')
+            self.net_recv_graph.bind(self.store, 'net_recv')
+        else:
+            self.net_sent_graph.bind(self.nic_store, 'sent:' + name)
+            self.net_recv_graph.bind(self.nic_store, 'recv:' + name)
+        self.stale_panels.add(self.network_tab)
+        self.render_panels()
+
+    def select_interface(self):
+        rows = self.network_table.selectionModel().selectedRows()
+        name = None
+        if rows:
+            item = self.network_table.item(rows[0].row(), 0)
+            if item is not None and 'sent:' + item.text() in self.nic_store:
+                name = item.text()
+        if name != self.selected_interface:
+            self.bind_interface_graphs(name)
+
+    def update_network_ui(self):
+        rows = [
+            [nic.name, f"{nic.sent:.1f}", f"{nic.recv:.1f}", f"{nic.packets_sent:.0f}",
+             f"{nic.packets_recv:.0f}", f"{nic.errors:.0f}"]
+            for nic in sorted(self.last_snapshot.net)
+        ]
+        self.set_table_rows(self.network_table, rows)
+
+    def update_monitor(self):
+        snapshot = self.last_snapshot
+        if snapshot is not None:
+            self.update_details(snapshot)
+        self.update_levels()
+
+    def update_details(self, snapshot):
+        cpu_usage = snapshot.cpu_percent
+        ram = snapshot.ram
+        disk = snapshot.disk
 
         cpu_details = (
             f"{self.texts[self.current_lang]['cpu_details']}\n"
             f"{self.texts[self.current_lang]['percent']} {cpu_usage:.1f}%\n"
-            f"Logical CPUs: {psutil.cpu_count(logical=True)}\n"
-            f"Physical CPUs: {psutil.cpu_count(logical=False)}"
+            f"Logical CPUs: {self.sampler.logical_cpus}\n"
+            f"Physical CPUs: {self.sampler.physical_cpus}"
         )
         ram_details = (
             f"{self.texts[self.current_lang]['ram_details']}\n"
@@ -781,176 +2374,387 @@ class SystemMonitorApp(QMainWindow):
             f"{self.texts[self.current_lang]['free']} {disk.free / (1024**3):.2f} GB\n"
             f"{self.texts[self.current_lang]['percent']} {disk.percent:.1f}%"
         )
+        cgroup = snapshot.cgroup
+        if self.view_columns == CGROUP_VIEW and cgroup is not None:
+            lang = self.current_lang
+            cpu_details += (
+                f"\n{self.texts[lang]['cgroup_label']} {cgroup.name}\n"
+                f"{self.texts[lang]['limit']} {cgroup.cpu_limit:.2f} {self.texts[lang]['cores']}"
+            )
+            if cgroup.cpu_percent is not None:
+                cpu_details += f" ({cgroup.cpu_percent:.1f}%)"
+            ram_details += (
+                f"\n{self.texts[lang]['cgroup_label']} {cgroup.name}\n"
+                f"{self.texts[lang]['limit']} {cgroup.memory_limit / (1024**3):.2f} GB"
+            )
+            if cgroup.memory_used is not None:
+                ram_details += f" ({cgroup.memory_used / (1024**3):.2f} GB, {cgroup.memory_percent:.1f}%)"
 
-        self.cpu_details.setText(cpu_details)
-        self.ram_details.setText(ram_details)
-        self.disk_details.setText(disk_details)
+        with self.profiler.section('details'):
+            self.cpu_details.setText(cpu_details)
+            self.ram_details.setText(ram_details)
+            self.disk_details.setText(disk_details)
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.status_text.setText(self.texts[self.current_lang]['status_updated'].format(time=timestamp))
+    def update_persistence_stats(self):
+        writer = self.history_writer
+        if writer is None:
+            return
+        self.persistence_stats_label.setText(self.texts[self.current_lang]['persistence_stats'].format(
+            kb=writer.bytes_written / 1024, flushes=writer.flushes, last=writer.last_flush_ms,
+            max=writer.max_flush_ms, pending=writer.pending()))
 
-        if cpu_usage > self.warning_threshold:
-            self.status_text.setText(self.texts[self.current_lang]['status_warning'].format(
-                resource='CPU', value=cpu_usage, time=timestamp))
-            self.cpu_progress.setStyleSheet(f"""
-                QProgressBar {{
-                    border-radius: 8px;
-                    font-size: 14px;
-                    border: 1px solid rgba(0, 0, 0, 0.2);
-                    background: rgba(255, 255, 255, 0.95);
-                    color: black;
-                }}
-                QProgressBar::chunk {{
-                    background-color: {self.themes[self.current_theme]['warning'].name()};
-                    border-radius: 6px;
-                }}
-            """)
-        else:
-            self.cpu_progress.setStyleSheet(f"""
-                QProgressBar {{
-                    border-radius: 8px;
-                    font-size: 14px;
-                    border: 1px solid rgba(0, 0, 0, 0.2);
-                    background: rgba(255, 255, 255, 0.95);
-                    color: black;
-                }}
-                QProgressBar::chunk {{
-                    background-color: {self.themes[self.current_theme]['progress'].name()};
-                    border-radius: 6px;
-                }}
-            """)
+    def update_levels(self):
+        # Everything here comes from the store, so it works the same for
+        # local samples and for a followed collector file.
+        last_timestamp = self.store.last_timestamp()
+        if last_timestamp is None:
+            return
+        cpu_value = self.store.last(self.view_columns['cpu'])
+        ram_value = self.store.last(self.view_columns['ram'])
+        disk_value = self.store.last('disk')
 
-        if ram.percent > self.warning_threshold:
-            self.status_text.setText(self.texts[self.current_lang]['status_warning'].format(
-                resource='RAM', value=ram.percent, time=timestamp))
-            self.ram_progress.setStyleSheet(f"""
-                QProgressBar {{
-                    border-radius: 8px;
-                    font-size: 14px;
-                    border: 1px solid rgba(0, 0, 0, 0.2);
-                    background: rgba(255, 255, 255, 0.95);
-                    color: black;
-                }}
-                QProgressBar::chunk {{
-                    background-color: {self.themes[self.current_theme]['warning'].name()};
-                    border-radius: 6px;
-                }}
-            """)
-        else:
-            self.ram_progress.setStyleSheet(f"""
-                QProgressBar {{
-                    border-radius: 8px;
-                    font-size: 14px;
-                    border: 1px solid rgba(0, 0, 0, 0.2);
-                    background: rgba(255, 255, 255, 0.95);
-                    color: black;
-                }}
-                QProgressBar::chunk {{
-                    background-color: {self.themes[self.current_theme]['progress'].name()};
-                    border-radius: 6px;
-                }}
-            """)
+        with self.profiler.section('progress'):
+            # Cgroup readings are NaN where the kernel does not expose them.
+            self.cpu_progress.setValue(0 if np.isnan(cpu_value) else int(cpu_value))
+            self.ram_progress.setValue(0 if np.isnan(ram_value) else int(ram_value))
+            self.disk_progress.setValue(int(disk_value))
 
-        if disk.percent > self.warning_threshold:
-            self.status_text.setText(self.texts[self.current_lang]['status_warning'].format(
-                resource='Disk', value=disk.percent, time=timestamp))
-            self.disk_progress.setStyleSheet(f"""
-                QProgressBar {{
-                    border-radius: 8px;
-                    font-size: 14px;
-                    border: 1px solid rgba(0, 0, 0, 0.2);
-                    background: rgba(255, 255, 255, 0.95);
-                    color: black;
-                }}
-                QProgressBar::chunk {{
-                    background-color: {self.themes[self.current_theme]['warning'].name()};
-                    border-radius: 6px;
-                }}
-            """)
-        else:
-            self.disk_progress.setStyleSheet(f"""
-                QProgressBar {{
-                    border-radius: 8px;
-                    font-size: 14px;
-                    border: 1px solid rgba(0, 0, 0, 0.2);
-                    background: rgba(255, 255, 255, 0.95);
-                    color: black;
-                }}
-                QProgressBar::chunk {{
-                    background-color: {self.themes[self.current_theme]['progress'].name()};
-                    border-radius: 6px;
-                }}
-            """)
+        lang = self.current_lang
+        timestamp = datetime.fromtimestamp(last_timestamp / 1000).strftime("%Y-%m-%d %H:%M:%S")
+        lines = [self.texts[lang]['status_updated'].format(time=timestamp)]
+        # One line per firing alert, so no alert hides another.
+        for rule, value, fired_at in self.alerts.active():
+            percent = rule.metric in PERCENT_COLUMNS or rule.metric in CGROUP_COLUMNS
+            key = 'status_warning' if percent and not rule.below else 'status_alert'
+            lines.append(self.texts[lang][key].format(
+                resource=rule.name, value=f"{value:.1f}",
+                time=datetime.fromtimestamp(fired_at / 1000).strftime("%Y-%m-%d %H:%M:%S")))
+        self.status_text.setText('\n'.join(lines))
 
-        self.history.append({
-            'time': timestamp,
-            'cpu': cpu_usage,
-            'ram': ram.percent,
-            'disk': disk.percent
-        })
-        if len(self.history) > 1000:
-            self.history.pop(0)
-        self.save_history()
-        self.update_history_ui()
+        with self.profiler.section('styles'):
+            self.set_progress_state(self.cpu_progress, 'warning' if cpu_value > self.warning_threshold else 'normal')
+            self.set_progress_state(self.ram_progress, 'warning' if ram_value > self.warning_threshold else 'normal')
+            self.set_progress_state(self.disk_progress, 'warning' if disk_value > self.warning_threshold else 'normal')
+
+    def start_history_load(self):
+        # Only the records already in the file are read; newer ones reach
+        # the store as live samples or through follow_history meanwhile.
+        self.followed_records = len(self.history_store)
+        threading.Thread(target=self.read_history, args=(self.history_store, self.followed_records),
+                         name='HistoryLoader', daemon=True).start()
 
-    def save_history(self):
-        with open('system_monitor_history.json', 'w', encoding='utf-8') as f:
-            json.dump(self.history, f, ensure_ascii=False, indent=4)
+    def read_history(self, history_store, count):
+        # Runs on the loader thread; the records are copied so the memory
+        # map is released before they are handed to the GUI.
+        start = time.perf_counter()
+        try:
+            records = np.array(history_store.read(max(0, count - HISTORY_CAPACITY), count))
+        except (OSError, ValueError):
+            records = np.empty(0, dtype=history_store.dtype)
+        self.history_bridge.push((records, time.perf_counter() - start))
+
+    def on_history_loaded(self):
+        for records, seconds in self.history_bridge.drain():
+            # Samples recorded while the file was read are newer than
+            # anything in it, so they go back in after the loaded records.
+            timestamps = np.array(self.store.timestamp_view())
+            live = {column: np.array(self.store.view(column)) for column in self.store.columns}
+            self.store.clear()
+            self.store.extend(records['timestamp'], {column: records[column] for column in records.dtype.names[1:]})
+            self.store.extend(timestamps, live)
+            self.startup.note(f"history load ({len(records)} records, read on a thread)", seconds)
+        self.refresh_panels()
 
     def load_history(self):
+        records = self.history_store.tail(HISTORY_CAPACITY)
+        self.store.clear()
+        self.store.extend(records['timestamp'], {column: records[column] for column in self.history_store.columns})
+        self.followed_records = len(self.history_store)
+
+    def follow_history(self):
         try:
-            with open('system_monitor_history.json', 'r', encoding='utf-8') as f:
-                self.history = json.load(f)
-        except FileNotFoundError:
-            self.history = []
+            count = len(self.history_store)
+            if count < self.followed_records:
+                # The collector compacted, cleared or migrated its file:
+                # reopen it and start over.
+                self.history_store = HistoryStore(self.attach, METRIC_COLUMNS, readonly=True)
+                self.load_history()
+            elif count > self.followed_records:
+                records = self.history_store.read(self.followed_records, count)
+                self.store.extend(records['timestamp'],
+                                  {column: records[column] for column in self.history_store.columns})
+                self.followed_records = count
+                for record in records:
+                    self.check_alerts(int(record['timestamp']),
+                                      {column: record[column] for column in self.history_store.columns})
+            else:
+                return
+        except (OSError, ValueError):
+            return
+        self.refresh_panels()
+
+    def import_legacy_history(self):
+        # One-time conversion of the JSON file written by earlier versions.
+        try:
+            with open(LEGACY_HISTORY_FILE, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        rows = [(int(datetime.strptime(record['time'], "%Y-%m-%d %H:%M:%S").timestamp() * 1000), record)
+                for record in records]
+        # Packed and written at once rather than a write and flush per record.
+        self.history_store.write(self.history_store.pack(rows))
 
     def save_history_to_file(self):
-        file_path, _ = QFileDialog.getSaveFileName(self, self.texts[self.current_lang]['save_history'], "", "JSON Files (*.json)")
-        if file_path:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.history, f, ensure_ascii=False, indent=4)
-            self.status_text.setText(self.texts[self.current_lang]['status_updated'].format(time="History saved to file"))
+        # Only needed once something is exported.
+        from exporter import HistoryExport, pyarrow_available
 
-    def update_history_ui(self):
-        for i in reversed(range(self.history_grid.count())):
-            self.history_grid.itemAt(i).widget().setParent(None)
+        if self.export is not None:
+            return
+        lang = self.current_lang
+        filters = ["CSV Files (*.csv)", "JSON Files (*.json)"]
+        if pyarrow_available():
+            filters += ["Parquet Files (*.parquet)", "Arrow Files (*.arrow)"]
+        file_path, _ = QFileDialog.getSaveFileName(self, self.texts[lang]['save_history'], "", ";;".join(filters))
+        if not file_path:
+            return
+        if self.history_writer is not None:
+            # Flushed on the writer thread; records it cannot write in
+            # time are left out rather than freezing the window.
+            self.history_writer.request_flush()
+        # The selected range (all of it when live, up to now), from the
+        # finest tier that still reaches back to its start.
+        start_ms, end_ms = self.range_bounds
+        if end_ms is None:
+            end_ms = self.history_store.last_timestamp()
+        rollups = self.rollups or Rollups(self.attach, METRIC_COLUMNS, readonly=True)
+        sources = [('raw', 0, self.history_store)]
+        sources += [(tier.name, tier.bucket_ms, tier.store) for tier in rollups.tiers]
+        _, store = pick_tier(sources, start_ms, end_ms, None)
+        if rollups is not self.rollups:
+            # Read-only stores map the file for every read, so they outlive close().
+            rollups.close()
+        self.export = HistoryExport(store, start_ms, end_ms, file_path, self.export_bridge.report_progress,
+                                    self.export_bridge.report_finished)
+        # Clearing rewrites the file the export is reading.
+        self.save_history_btn.setEnabled(False)
+        self.clear_history_btn.setEnabled(False)
+        self.export_progress.setRange(0, 0)
+        self.export_progress.setVisible(True)
+        self.export_cancel_btn.setVisible(True)
+        self.export.start()
+
+    def cancel_export(self):
+        if self.export is not None:
+            self.export.cancel()
+
+    def on_export_progress(self, done, total):
+        self.export_progress.setRange(0, max(1, total))
+        self.export_progress.setValue(done)
+
+    def on_export_finished(self, error):
+        self.export.join()
+        self.export = None
+        self.save_history_btn.setEnabled(True)
+        self.clear_history_btn.setEnabled(not self.attach)
+        self.export_progress.setVisible(False)
+        self.export_cancel_btn.setVisible(False)
+        lang = self.current_lang
+        if error == 'cancelled':
+            self.status_text.setText(self.texts[lang]['export_cancelled'])
+        elif error:
+            QMessageBox.warning(self, self.texts[lang]['save_history'],
+                                self.texts[lang]['export_failed'].format(error=error))
+        else:
+            self.status_text.setText(self.texts[lang]['status_updated'].format(time="History saved to file"))
+
+    def on_process_table(self):
+        tables = self.process_bridge.drain()
+        if tables:
+            self.process_table = tables[-1]
+            self.stale_panels.add(self.processes_tab)
+            self.render_panels()
+
+    def update_processes_ui(self):
+        table = self.process_table
+        if table is None:
+            return
+        rows = [
+            [str(info.pid), info.name, f"{info.cpu_percent:.1f}", f"{info.rss / (1024**2):.1f}",
+             f"{info.io_rate / 1024:.1f}"]
+            for info in table.top[SORT_KEYS[self.sort_combo.currentIndex()]]
+        ]
+        self.set_table_rows(self.processes_table, rows)
+        self.process_summary_label.setText(self.texts[self.current_lang]['process_summary'].format(
+            count=table.count, ms=table.scan_ms))
+
+    def update_disks_ui(self):
+        rows = []
+        for mount in self.last_snapshot.mounts:
+            usage = mount.usage
+            if usage is None:
+                sizes = ['-', '-', '-', self.texts[self.current_lang]['stale']]
+            else:
+                sizes = [f"{usage.total / (1024**3):.2f}", f"{usage.used / (1024**3):.2f}",
+                         f"{usage.free / (1024**3):.2f}", f"{usage.percent:.1f}%"]
+                if mount.stale:
+                    sizes[3] += f" ({self.texts[self.current_lang]['stale']})"
+            rows.append([mount.mountpoint, mount.device, mount.fstype] + sizes)
+        self.set_table_rows(self.mounts_table, rows)
+
+        rows = []
+        busy_rows = set()
+        for row, rate in enumerate(sorted(self.last_snapshot.disk_io)):
+            rows.append([rate.name, f"{rate.read:.2f}", f"{rate.write:.2f}", f"{rate.read_iops:.0f}",
+                         f"{rate.write_iops:.0f}", '-' if rate.await_ms is None else f"{rate.await_ms:.2f}",
+                         '-' if rate.busy is None else f"{rate.busy:.1f}%"])
+            if rate.busy is not None and rate.busy > self.warning_threshold:
+                busy_rows.add(row)
+        self.set_table_rows(self.disk_io_table, rows, busy_rows)
 
+    def update_history_ui(self):
+        lang = self.current_lang
         headers = [
-            self.texts[self.current_lang]['history_time'],
-            self.texts[self.current_lang]['history_cpu'],
-            self.texts[self.current_lang]['history_ram'],
-            self.texts[self.current_lang]['history_disk']
+            self.texts[lang]['history_time'],
+            self.texts[lang]['history_cpu'],
+            self.texts[lang]['history_ram'],
+            self.texts[lang]['history_disk'],
+            self.texts[lang]['history_disk_busy']
         ]
-        for col, header in enumerate(headers):
-            label = QLabel(header)
-            label.setStyleSheet("font-weight: bold; font-size: 14px; padding: 5px; color: black;")
-            label.setAlignment(Qt.AlignmentFlag.AlignRight if self.current_lang == 'fa' else Qt.AlignmentFlag.AlignLeft)
-            self.history_grid.addWidget(label, 0, col)
-
-        for row, item in enumerate(self.history[-50:], 1):
-            time_label = QLabel(item['time'])
-            cpu_label = QLabel(f"{item['cpu']:.1f}%")
-            ram_label = QLabel(f"{item['ram']:.1f}%")
-            disk_label = QLabel(f"{item['disk']:.1f}%")
-            
-            for label in [time_label, cpu_label, ram_label, disk_label]:
-                label.setStyleSheet("font-size: 12px; padding: 5px; border-bottom: 1px solid rgba(0, 0, 0, 0.1); color: black;")
-                label.setWordWrap(True)
-                label.setAlignment(Qt.AlignmentFlag.AlignRight if self.current_lang == 'fa' else Qt.AlignmentFlag.AlignLeft)
-            
-            self.history_grid.addWidget(time_label, row, 0)
-            self.history_grid.addWidget(cpu_label, row, 1)
-            self.history_grid.addWidget(ram_label, row, 2)
-            self.history_grid.addWidget(disk_label, row, 3)
+        if headers != self.history_model.headers:
+            self.history_model.set_headers(headers)
+        if self.range_store is None:
+            self.range_summary_label.setText('')
+        else:
+            self.range_summary_label.setText(self.texts[lang]['range_summary'].format(
+                points=len(self.range_store), tier=self.range_tier))
+        scrollbar = self.history_view.verticalScrollBar()
+        follow = scrollbar.value() == scrollbar.maximum()
+        self.history_model.sync()
+        if follow:
+            self.history_view.scrollToBottom()
 
-    def clear_history(self):
-        self.history = []
-        self.save_history()
+    def query_history(self, start_ms, end_ms, max_points=MAX_POINTS):
+        if self.history_writer is not None:
+            self.history_writer.request_flush()
+        # A viewer opens the collector's tiers for each query, so tiers
+        # created after it attached are picked up too.
+        rollups = self.rollups or Rollups(self.attach, METRIC_COLUMNS, readonly=True)
+        try:
+            return HistoryQuery(self.history_store, rollups).query(start_ms, end_ms, METRIC_COLUMNS,
+                                                                   max_points=max_points)
+        finally:
+            if rollups is not self.rollups:
+                rollups.close()
+
+    def change_history_range(self):
+        span = HISTORY_RANGES[self.range_combo.currentIndex()]
+        if span is None:
+            self.range_store = None
+            self.range_tier = None
+            self.range_bounds = (None, None)
+            self.history_model.set_store(self.store)
+            self.history_graph.max_points = LIVE_GRAPH_POINTS
+            self.history_graph.span = LIVE_GRAPH_SPAN
+            self.change_history_metric()
+            self.update_history_ui()
+            return
+        if span == 'custom':
+            start_ms = self.range_start_edit.dateTime().toMSecsSinceEpoch()
+            end_ms = self.range_end_edit.dateTime().toMSecsSinceEpoch()
+        else:
+            end_ms = int(time.time() * 1000)
+            start_ms = end_ms - span * 1000
+            self.range_start_edit.setDateTime(QDateTime.fromMSecsSinceEpoch(start_ms))
+            self.range_end_edit.setDateTime(QDateTime.fromMSecsSinceEpoch(end_ms))
+        self.show_history_range(start_ms, end_ms)
+
+    def show_custom_range(self):
+        custom = HISTORY_RANGES.index('custom')
+        if self.range_combo.currentIndex() != custom:
+            self.range_combo.setCurrentIndex(custom)
+        else:
+            self.change_history_range()
+
+    def show_history_range(self, start_ms, end_ms):
+        result = self.query_history(start_ms, end_ms)
+        self.range_bounds = (start_ms, end_ms)
+        self.range_tier = result.tier
+        self.range_store = RingBuffer(max(1, len(result.timestamps)), METRIC_COLUMNS)
+        self.range_store.extend(result.timestamps, result.values)
+        self.history_model.set_store(self.range_store)
+        self.history_graph.max_points = max(2, len(self.range_store))
+        self.history_graph.span = None
+        self.change_history_metric()
         self.update_history_ui()
 
+    def change_history_metric(self):
+        store = self.store if self.range_store is None else self.range_store
+        self.history_graph.bind(store, PERCENT_COLUMNS[self.history_metric_combo.currentIndex()])
+        self.history_graph.draw_graph(self.history_metric_combo.currentText())
+
+    def clear_history(self):
+        if self.export is not None:
+            return
+        self.store.clear()
+        self.history_writer.discard()
+        self.history_store.clear()
+        self.rollups.clear()
+        self.change_history_range()
+
+
+IMPORT_MARKS.append(('class definitions', time.perf_counter()))
+
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description='System Monitor')
+    parser.add_argument('--profile', action='store_true',
+                        help='print a per-tick timing breakdown of the GUI update to stderr')
+    parser.add_argument('--headless', action='store_true',
+                        help='run the collector without a GUI (see collector.py --help)')
+    parser.add_argument('--attach', nargs='?', const=HISTORY_FILE, metavar='HISTORY',
+                        help='view the history file of a running collector, read-only')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='serve Prometheus metrics on this port (default: disabled)')
+    parser.add_argument('--metrics-host', default='127.0.0.1',
+                        help='address for the metrics endpoint (default: 127.0.0.1)')
+    parser.add_argument('--startup-profile', action='store_true',
+                        help='print import and window construction timings to stderr')
+    parser.add_argument('--fleet', nargs='+', metavar='ADDRESS',
+                        help='follow remote collectors started with --fleet-port: host[:port], host:first-last '
+                             '(IPv6 in brackets, [::1]:port) or @file with one address per line')
+    args, qt_args = parser.parse_known_args()
+    startup = StartupProfile(args.startup_profile)
+    if args.attach and not os.path.exists(args.attach):
+        parser.error(f'history file not found: {args.attach}')
+    if args.attach and args.metrics_port is not None:
+        # An attached viewer takes no samples of its own to serve.
+        parser.error('--metrics-port cannot be used with --attach; pass it to the collector instead')
+    metrics_server = None
+    if args.metrics_port is not None:
+        from metrics_server import MetricsServer
+        try:
+            metrics_server = MetricsServer(args.metrics_host, args.metrics_port)
+        except OSError as error:
+            parser.error(f'cannot serve metrics on {args.metrics_host}:{args.metrics_port}: {error}')
+    fleet_client = None
+    if args.fleet:
+        from fleet import FleetClient, parse_addresses
+        try:
+            fleet_client = FleetClient(parse_addresses(args.fleet))
+        except (OSError, ValueError) as error:
+            parser.error(f'--fleet: {error}')
+    startup.phase('arguments')
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setStyle('Windows')
-    window = SystemMonitorApp()
+    startup.phase('QApplication')
+    window = SystemMonitorApp(profile=args.profile, attach=args.attach, metrics_server=metrics_server,
+                              startup=startup, fleet_client=fleet_client)
     window.show()
+    startup.phase('show')
+
+    def first_frame():
+        startup.phase('first paint')
+        startup.report()
+
+    QTimer.singleShot(0, first_frame)
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,138 @@
+import numpy as np
+
+
+class RingBuffer:
+    """Preallocated, column-oriented ring of timestamped samples.
+
+    Timestamps are int64 epoch milliseconds and every metric is a float32
+    column. Each row is written twice, at i and i + capacity, so the most
+    recent n rows are always one contiguous slice and reading them never
+    copies.
+    """
+
+    def __init__(self, capacity, columns=()):
+        self.capacity = capacity
+        self.timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self.columns = {}
+        self.head = 0
+        self.size = 0
+        self.total = 0
+        for name in columns:
+            self.add_column(name)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def add_column(self, name):
+        if name not in self.columns:
+            # Rows recorded before the column existed read back as NaN.
+            self.columns[name] = np.full(2 * self.capacity, np.nan, dtype=np.float32)
+        return self.columns[name]
+
+    def remove_column(self, name):
+        self.columns.pop(name, None)
+
+    def append(self, timestamp, values):
+        i = self.head
+        j = i + self.capacity
+        self.timestamps[i] = self.timestamps[j] = timestamp
+        for name, column in self.columns.items():
+            column[i] = column[j] = values.get(name, np.nan)
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.total += 1
+
+    def extend(self, timestamps, columns):
+        """Bulk-append rows given as a timestamp array and per-column arrays."""
+        count = len(timestamps)
+        skip = max(0, count - self.capacity)
+        written = count - skip
+        index = (self.head + np.arange(written)) % self.capacity
+        mirror = index + self.capacity
+        self.timestamps[index] = self.timestamps[mirror] = timestamps[skip:]
+        for name, column in self.columns.items():
+            values = columns[name][skip:] if name in columns else np.nan
+            column[index] = column[mirror] = values
+        self.head = (self.head + written) % self.capacity
+        self.size = min(self.size + written, self.capacity)
+        self.total += count
+
+    def clear(self):
+        self.head = 0
+        self.size = 0
+        for column in self.columns.values():
+            column.fill(np.nan)
+
+    def _window(self, count):
+        count = self.size if count is None else min(count, self.size)
+        end = (self.head - self.size) % self.capacity + self.size
+        return end - count, end
+
+    def _readonly(self, array):
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    def view(self, name, count=None):
+        """Return the most recent count values of a column, oldest first."""
+        start, end = self._window(count)
+        return self._readonly(self.columns[name][start:end])
+
+    def timestamp_view(self, count=None):
+        start, end = self._window(count)
+        return self._readonly(self.timestamps[start:end])
+
+    def last(self, name, default=np.nan):
+        if not self.size or name not in self.columns:
+            return default
+        return float(self.columns[name][(self.head - 1) % self.capacity])
+
+    def last_timestamp(self):
+        if not self.size:
+            return None
+        return int(self.timestamps[(self.head - 1) % self.capacity])
+
+
+class RingBuffer2D:
+    """Ring of fixed-width rows, such as one value per CPU core per sample.
+
+    Uses the same mirrored layout as RingBuffer, so the latest rows are
+    always one contiguous (count, width) block.
+    """
+
+    def __init__(self, capacity, width, dtype=np.float32):
+        self.capacity = capacity
+        self.width = width
+        self.data = np.zeros((2 * capacity, width), dtype=dtype)
+        self.timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, timestamp, row):
+        i = self.head
+        j = i + self.capacity
+        count = min(len(row), self.width)
+        self.timestamps[i] = self.timestamps[j] = timestamp
+        self.data[i, :count] = self.data[j, :count] = row[:count]
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def view(self, count=None):
+        count = self.size if count is None else min(count, self.size)
+        end = (self.head - self.size) % self.capacity + self.size
+        view = self.data[end - count:end]
+        view.flags.writeable = False
+        return view
+
+    def timestamp_view(self, count=None):
+        count = self.size if count is None else min(count, self.size)
+        end = (self.head - self.size) % self.capacity + self.size
+        view = self.timestamps[end - count:end]
+        view.flags.writeable = False
+        return view